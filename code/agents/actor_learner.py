@@ -0,0 +1,207 @@
+import time
+from typing import Callable, List
+
+import gymnasium as gym
+import torch
+from torch import multiprocessing as mp
+
+from .q_agent import DQNActor
+from .q_network import DQN
+from .shared_buffer import SharedMemory
+
+
+def run_collector(
+    worker_id: int,
+    env_fn: Callable[[], gym.Env],
+    agent_kwargs: dict,
+    shared_net: DQN,
+    weights_lock,
+    weights_version: torch.Tensor,
+    memory: SharedMemory,
+    env_steps: torch.Tensor,
+    stop_event,
+    sync_period: int,
+    queue_depth: int,
+):
+    """Steps an environment with a periodically synced copy of the policy net and feeds the shared memory."""
+    torch.set_num_threads(1)
+    env = env_fn()
+    agent = DQNActor(memory_size=1, seed=worker_id, **agent_kwargs)
+    agent.eval()
+    version = -1
+    steps = 0
+
+    staged = []
+    state, _ = env.reset(seed=worker_id)
+    state = torch.tensor(state, dtype=torch.float32).unsqueeze(0)
+    while not stop_event.is_set():
+        # Pull the latest weights
+        if steps % sync_period == 0 and int(weights_version) != version:
+            with weights_lock:
+                agent.policy_net.load_state_dict(shared_net.state_dict())
+                version = int(weights_version)
+
+        # Epsilon follows the experience collected by all workers
+        agent.experience_count = int(env_steps.sum())
+        action = agent.epsilon_greedy(state)
+        next_state, reward, terminated, truncated, _ = env.step(action)
+        next_state = torch.tensor(next_state, dtype=torch.float32).unsqueeze(0)
+        staged.append((state, torch.tensor([[action]]), next_state, torch.tensor([reward], dtype=torch.float32)))
+        steps += 1
+
+        if len(staged) == queue_depth:
+            memory.push_batch(*(torch.cat(field) for field in zip(*staged)))
+            env_steps[worker_id] += len(staged)
+            staged.clear()
+
+        if terminated or truncated:
+            state, _ = env.reset()
+            state = torch.tensor(state, dtype=torch.float32).unsqueeze(0)
+        else:
+            state = next_state
+
+
+class ActorLearner(object):
+    """Runs environment interaction and learning of a `DQNActor` concurrently.
+
+    Collector processes step their own environment instance (created by `env_fn`, which must be picklable) and push
+    transitions into a shared memory. The calling process acts as learner, running `optimize_model` back to back.
+
+    Args:
+        agent: The agent to train. Its memory is replaced by a `SharedMemory` of `memory_size` transitions.
+        env_fn: Creates the environment of a collector.
+        num_collectors: Number of collector processes.
+        broadcast_period: Number of learning steps between publishing the policy weights to the collectors.
+        sync_period: Number of environment steps between collectors checking for new policy weights.
+        queue_depth: Number of transitions a collector stages before pushing them into the memory in one batch.
+        memory_size: Capacity of the shared replay memory.
+        agent_kwargs: Keyword arguments for the collectors' copy of the agent (e.g. the epsilon schedule).
+    """
+
+    def __init__(
+        self,
+        agent: DQNActor,
+        env_fn: Callable[[], gym.Env],
+        num_collectors: int = 1,
+        broadcast_period: int = 10,
+        sync_period: int = 100,
+        queue_depth: int = 32,
+        memory_size: int = 60_000,
+        agent_kwargs: dict = None,
+    ):
+        self.agent = agent
+        self.env_fn = env_fn
+        self.num_collectors = num_collectors
+        self.broadcast_period = broadcast_period
+        self.sync_period = sync_period
+        self.queue_depth = queue_depth
+        self.agent_kwargs = dict(
+            num_states=agent.num_states,
+            num_actions=agent.num_actions,
+            width=agent.width,
+            epsilon_start=agent.epsilon_start,
+            epsilon_end=agent.epsilon_end,
+            epsilon_decay=agent.epsilon_decay,
+        )
+        self.agent_kwargs.update(agent_kwargs if agent_kwargs else {})
+
+        self._ctx = mp.get_context("spawn")
+        self.memory = SharedMemory(memory_size, agent.num_states, lock=self._ctx.Lock())
+        self.agent.memory = self.memory
+
+        self._shared_net = DQN(agent.num_states, agent.num_actions, agent.width)
+        self._shared_net.load_state_dict(agent.policy_net.state_dict())
+        self._shared_net.share_memory()
+        self._weights_lock = self._ctx.Lock()
+        self._weights_version = torch.zeros((), dtype=torch.int64).share_memory_()
+
+        self._env_steps = torch.zeros((num_collectors,), dtype=torch.int64).share_memory_()
+        self._learn_steps = 0
+        self._stop_event = self._ctx.Event()
+        self._collectors: List[mp.Process] = []
+        self._start_time = None
+
+    @property
+    def env_steps(self) -> int:
+        """Total number of transitions pushed by all collectors."""
+        return int(self._env_steps.sum())
+
+    @property
+    def learn_steps(self) -> int:
+        return self._learn_steps
+
+    @property
+    def throughput(self) -> dict:
+        """Environment and learning steps per second since `start` was called."""
+        elapsed = max(time.perf_counter() - self._start_time, 1.0e-9) if self._start_time else float("inf")
+        return dict(
+            env_steps_per_sec=self.env_steps / elapsed,
+            learn_steps_per_sec=self.learn_steps / elapsed,
+            collector_steps_per_sec=[int(steps) / elapsed for steps in self._env_steps],
+        )
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        self._start_time = time.perf_counter()
+        for worker_id in range(self.num_collectors):
+            collector = self._ctx.Process(
+                target=run_collector,
+                args=(
+                    worker_id,
+                    self.env_fn,
+                    self.agent_kwargs,
+                    self._shared_net,
+                    self._weights_lock,
+                    self._weights_version,
+                    self.memory,
+                    self._env_steps,
+                    self._stop_event,
+                    self.sync_period,
+                    self.queue_depth,
+                ),
+                daemon=True,
+            )
+            collector.start()
+            self._collectors.append(collector)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        for collector in self._collectors:
+            collector.join()
+        self._collectors.clear()
+
+    def broadcast(self) -> None:
+        """Publishes the current policy weights to the collectors."""
+        with self._weights_lock:
+            self._shared_net.load_state_dict(self.agent.policy_net.state_dict())
+            self._weights_version += 1
+
+    def run(self, num_learn_steps: int) -> List[dict]:
+        """Runs `num_learn_steps` learning updates, while the collectors keep filling the memory."""
+        results = []
+        target = self._learn_steps + num_learn_steps
+        while self._learn_steps < target:
+            self._check_collectors()
+            self.agent.experience_count = self.env_steps
+            result = self.agent.optimize_model()
+            if not result:
+                # Memory does not hold a full batch yet
+                time.sleep(1.0e-3)
+                continue
+            self._learn_steps += 1
+            if self._learn_steps % self.broadcast_period == 0:
+                self.broadcast()
+            results.append(result)
+        return results
+
+    def _check_collectors(self) -> None:
+        for collector in self._collectors:
+            if not collector.is_alive():
+                raise RuntimeError(f"Collector process {collector.pid} exited with code {collector.exitcode}.")
+
+    def __enter__(self) -> "ActorLearner":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
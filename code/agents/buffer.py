@@ -1,24 +1,149 @@
 import random
 from collections import deque, namedtuple
+from itertools import islice
 
 import numpy as np
-import torch
 
+from .sparse import SparseState, densify, to_sparse
+
+# torch is only imported when batches are collated, such that workers that merely collect transitions do not pay for
+# importing it.
 Sample = namedtuple("Sample", ("s", "a", "s_prime", "r"))
 
 
 class Memory(object):
     def __init__(self, capacity: int):
         self._memory = deque([], capacity)
+        self.push_count = 0  # Total number of pushed transitions, including the ones that were dropped
 
     def push(self, *args):
         self._memory.append(Sample(*args))
+        self.push_count += 1
+
+    def push_batch(self, s, a, s_prime, r):
+        """Pushes (N, ...) batches of transitions; the stored transitions are views into the batch."""
+        for i in range(s.shape[0]):
+            self.push(s[i : i + 1], a[i : i + 1], s_prime[i : i + 1], r[i : i + 1])
 
     def sample(self, batch_size):
         return random.sample(self._memory, batch_size)
 
+    def sample_batch(self, batch_size) -> Sample:
+        """Samples a batch and collates it into one tensor per field."""
+        import torch
+
+        batch = Sample(*zip(*self.sample(batch_size)))
+        return Sample(*(torch.cat(field) for field in batch))
+
+    def latest(self, n) -> Sample:
+        """Collates the n most recently pushed transitions, oldest first."""
+        import torch
+
+        batch = Sample(*zip(*islice(self._memory, len(self._memory) - n, None)))
+        return Sample(*(torch.cat(field) for field in batch))
+
+    @property
+    def capacity(self) -> int:
+        return self._memory.maxlen
+
     def __contains__(self, val) -> bool:
         return val in self._memory
 
     def __len__(self):
         return len(self._memory)
+
+
+def _equal(a: SparseState, b: SparseState) -> bool:
+    return a is b or (a.size == b.size and np.array_equal(a.indices, b.indices) and np.array_equal(a.values, b.values))
+
+
+class SparseMemory(object):
+    """Replay memory that only stores the nonzero features of states, for states that are mostly empty.
+
+    Transitions are pushed and sampled in the same way as with `Memory`; states can also be pushed as `SparseState`s.
+    A state that equals the next state of the previous transition, as when pushing consecutive transitions of an
+    episode, is stored once for both, as is a next state that equals the state. Sampled batches are densified into
+    float32 tensors.
+    """
+
+    def __init__(self, capacity: int, num_states: int):
+        self._memory = deque([], capacity)
+        self.num_states = num_states
+        self.push_count = 0  # Total number of pushed transitions, including the ones that were dropped
+        self._last_s_prime = None
+
+    def push(self, s, a, s_prime, r):
+        s = self._encode(s)
+        if self._last_s_prime is not None and _equal(s, self._last_s_prime):
+            s = self._last_s_prime
+        s_prime = self._encode(s_prime)
+        if _equal(s_prime, s):
+            s_prime = s
+        self._memory.append(Sample(s, int(a), s_prime, float(r)))
+        self._last_s_prime = s_prime
+        self.push_count += 1
+
+    def push_batch(self, s, a, s_prime, r):
+        """Pushes (N, ...) batches of transitions."""
+        for i in range(s.shape[0]):
+            self.push(s[i], a[i], s_prime[i], r[i])
+
+    def extend(self, samples) -> None:
+        """Appends transitions of `SparseState`s and Python scalars as they are, e.g. those of `latest_samples`.
+
+        Only the first state is compared with the last next state, such that consecutive calls share their states.
+        """
+        samples = list(samples)
+        if samples and self._last_s_prime is not None and _equal(samples[0].s, self._last_s_prime):
+            first, shared = samples[0], self._last_s_prime
+            samples[0] = first._replace(s=shared, s_prime=shared if first.s_prime is first.s else first.s_prime)
+        for sample in samples:
+            self._memory.append(sample)
+            self.push_count += 1
+            self._last_s_prime = sample.s_prime
+
+    def sample(self, batch_size):
+        return random.sample(self._memory, batch_size)
+
+    def sample_batch(self, batch_size) -> Sample:
+        """Samples a batch and densifies it into one tensor per field."""
+        return self._collate(self.sample(batch_size))
+
+    def latest(self, n) -> Sample:
+        """Collates the n most recently pushed transitions, oldest first."""
+        return self._collate(self.latest_samples(n))
+
+    def latest_samples(self, n):
+        """The n most recently pushed transitions as they are stored, oldest first."""
+        return list(islice(self._memory, len(self._memory) - n, None))
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of the stored state features; states that are stored once are counted once."""
+        states = {id(state): state for sample in self._memory for state in (sample.s, sample.s_prime)}
+        return sum(state.nbytes for state in states.values())
+
+    @property
+    def capacity(self) -> int:
+        return self._memory.maxlen
+
+    def __len__(self):
+        return len(self._memory)
+
+    def _encode(self, state) -> SparseState:
+        if isinstance(state, SparseState):
+            return state
+        if hasattr(state, "cpu"):
+            state = state.cpu()
+        return to_sparse(state)
+
+    def _collate(self, samples) -> Sample:
+        import torch
+
+        s, a, s_prime, r = zip(*samples)
+        return Sample(
+            torch.from_numpy(densify(s)),
+            torch.tensor(a, dtype=torch.int64).unsqueeze(1),
+            torch.from_numpy(densify(s_prime)),
+            torch.tensor(r, dtype=torch.float32),
+        )
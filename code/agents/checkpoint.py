@@ -0,0 +1,211 @@
+import json
+import os
+import pathlib
+import re
+
+import numpy as np
+import torch
+
+from .buffer import Sample, SparseMemory
+from .q_agent import DQNActor
+from .sparse import SparseState, index_dtype
+
+CHECKPOINT_FILE = "checkpoint.json"
+MEMORY_FIELDS = ("s", "a", "s_prime", "r")
+MEMORY_DTYPES = dict(s=np.float32, a=np.int64, s_prime=np.float32, r=np.float32)
+# Segments of sparse memories: the features of the distinct states, their offsets, and state rows for s and s_prime
+SPARSE_FIELDS = ("indices", "values", "offsets", "s", "a", "s_prime", "r")
+# Files written by a save, named by the generation of the save
+GENERATION_FILE = re.compile(r"^(agent|memory)-(\d+)\.")
+
+
+def atomic_write(path: pathlib.Path, write) -> None:
+    """Calls write(tmp_path) and moves the result to path, such that readers never see a partial file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+class Checkpoint(object):
+    """Full training state of a `DQNActor`, stored in a directory.
+
+    Every save writes new files, named by the generation of the save: the networks, the optimizer and the step
+    counters to `agent-<generation>.pt`, and the transitions that were pushed since the last save to one segment
+    `memory-<generation>.<field>.npy` per field. The save is committed by atomically replacing `checkpoint.json`, which
+    lists the agent file and the segments that hold the memory. Files are never modified once written, so an
+    interrupted save leaves the previous checkpoint intact; files that are no longer listed are removed after the
+    commit. Loading maps the segments into memory, so transitions are only read from disk once they are sampled.
+
+    A `SparseMemory` is stored sparsely: a segment holds the nonzero features of every distinct state once, and the
+    transitions refer to their states by row, such that states that are shared in memory are also shared on disk and
+    after loading. Sparse checkpoints can only be loaded into a `SparseMemory`.
+
+    A `Checkpoint` only appends to the segments that it saved or loaded itself; the first save of a new instance writes
+    the whole memory. Once there are more than `max_segments` segments, the memory is rewritten as a single segment.
+    """
+
+    def __init__(self, directory: pathlib.Path, max_segments: int = 32):
+        self.directory = pathlib.Path(directory)
+        self.max_segments = max_segments
+        self._segments = []  # Segments of the last save or load, with the checkpoint push indices they hold
+        self._saved_push_count = None  # Memory push count at the last save or load
+        self._push_offset = 0  # Offset between memory push indices and checkpoint push indices
+
+    def exists(self) -> bool:
+        return (self.directory / CHECKPOINT_FILE).exists()
+
+    def save(self, agent: DQNActor) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        generation = self._next_generation()
+        meta = dict(
+            agent=f"agent-{generation:06d}.pt",
+            layout="sparse" if isinstance(agent.memory, SparseMemory) else "dense",
+            capacity=agent.memory.capacity,
+            push_count=agent.memory.push_count + self._push_offset,
+            size=len(agent.memory),
+            segments=self._save_memory(agent.memory, generation),
+        )
+        torch.save(self._agent_state(agent), self.directory / meta["agent"])
+        atomic_write(self.directory / CHECKPOINT_FILE, lambda path: path.write_text(json.dumps(meta)))
+        self._segments = meta["segments"]
+        self._saved_push_count = agent.memory.push_count
+        self._remove_unlisted(meta)
+
+    def load(self, agent: DQNActor) -> None:
+        """Restores the state of the agent. The agent's memory must be empty and have the saved capacity."""
+        meta = json.loads((self.directory / CHECKPOINT_FILE).read_text())
+        if meta["capacity"] != agent.memory.capacity:
+            raise ValueError(
+                f"Checkpoint memory has capacity {meta['capacity']}, but memory has {agent.memory.capacity}."
+            )
+        if len(agent.memory) > 0:
+            raise ValueError("Cannot load a checkpoint into a non-empty memory.")
+        if meta["layout"] == "sparse" and not isinstance(agent.memory, SparseMemory):
+            raise ValueError("Cannot load a sparse checkpoint into a dense memory.")
+
+        state = torch.load(self.directory / meta["agent"], map_location=agent.device, weights_only=True)
+        agent.policy_net.load_state_dict(state["policy_net"])
+        agent.target_net.load_state_dict(state["target_net"])
+        agent.optimizer.load_state_dict(state["optimizer"])
+        agent.experience_count = state["experience_count"]
+        agent.learn_count = state["learn_count"]
+        self._load_memory(agent.memory, meta)
+
+    def _agent_state(self, agent: DQNActor) -> dict:
+        return dict(
+            policy_net=agent.policy_net.state_dict(),
+            target_net=agent.target_net.state_dict(),
+            optimizer=agent.optimizer.state_dict(),
+            experience_count=agent.experience_count,
+            learn_count=agent.learn_count,
+        )
+
+    def _save_memory(self, memory, generation: int) -> list:
+        """Writes the new transitions as a segment of the given generation; returns the segments of the memory."""
+        if self._saved_push_count is None:
+            # Nothing of this memory was saved yet
+            self._segments = []
+            self._push_offset = 0
+            self._saved_push_count = memory.push_count - len(memory)
+
+        push_count = memory.push_count + self._push_offset
+        first = push_count - len(memory)
+        segments = [segment for segment in self._segments if segment["stop"] > first]
+        num_new = min(memory.push_count - self._saved_push_count, len(memory))
+        if len(segments) >= self.max_segments:
+            segments, num_new = [], len(memory)
+        if num_new > 0:
+            if isinstance(memory, SparseMemory):
+                arrays = self._sparse_arrays(memory.latest_samples(num_new), memory.num_states)
+            else:
+                arrays = {
+                    field: values.cpu().numpy().astype(MEMORY_DTYPES[field], copy=False)
+                    for field, values in zip(MEMORY_FIELDS, memory.latest(num_new))
+                }
+            for field, array in arrays.items():
+                np.save(self.directory / self._segment_file(generation, field), array)
+            segments.append(dict(generation=generation, start=push_count - num_new, stop=push_count))
+        return segments
+
+    def _load_memory(self, memory, meta: dict) -> None:
+        first = meta["push_count"] - meta["size"]
+        segments = [segment for segment in meta["segments"] if segment["stop"] > first]
+        for segment in segments:
+            start = max(first, segment["start"]) - segment["start"]
+            if meta["layout"] == "sparse":
+                memory.extend(self._sparse_samples(segment["generation"], start, memory.num_states))
+            else:
+                # Copy-on-write maps: the arrays are writable, but changes never reach the checkpoint
+                arrays = [
+                    torch.from_numpy(
+                        np.load(self.directory / self._segment_file(segment["generation"], field), mmap_mode="c")
+                    )
+                    for field in MEMORY_FIELDS
+                ]
+                memory.push_batch(*(array[start:] for array in arrays))
+
+        self._segments = segments
+        self._push_offset = meta["push_count"] - memory.push_count
+        self._saved_push_count = memory.push_count
+
+    def _sparse_arrays(self, samples, num_states: int) -> dict:
+        rows = {}  # id of a state -> row
+        states = []
+        state_rows = dict(s=[], s_prime=[])
+        for sample in samples:
+            for field in state_rows:
+                state = getattr(sample, field)
+                if id(state) not in rows:
+                    rows[id(state)] = len(states)
+                    states.append(state)
+                state_rows[field].append(rows[id(state)])
+        offsets = np.zeros(len(states) + 1, dtype=np.int64)
+        np.cumsum([len(state.indices) for state in states], out=offsets[1:])
+        return dict(
+            indices=np.concatenate([state.indices for state in states]).astype(index_dtype(num_states)),
+            values=np.concatenate([state.values for state in states]).astype(np.float32),
+            offsets=offsets,
+            s=np.array(state_rows["s"], dtype=np.int64),
+            a=np.array([sample.a for sample in samples], dtype=np.int64),
+            s_prime=np.array(state_rows["s_prime"], dtype=np.int64),
+            r=np.array([sample.r for sample in samples], dtype=np.float32),
+        )
+
+    def _sparse_samples(self, generation: int, start: int, num_states: int) -> list:
+        """The transitions of a sparse segment from `start`, whose states are views of the mapped features."""
+        arrays = {
+            field: np.load(self.directory / self._segment_file(generation, field), mmap_mode="r")
+            for field in SPARSE_FIELDS
+        }
+        offsets = arrays["offsets"].tolist()
+        states = [
+            SparseState(arrays["indices"][begin:end], arrays["values"][begin:end], num_states)
+            for begin, end in zip(offsets[:-1], offsets[1:])
+        ]
+        fields = (arrays[field][start:].tolist() for field in MEMORY_FIELDS)
+        return [Sample(states[s], a, states[s_prime], r) for s, a, s_prime, r in zip(*fields)]
+
+    def _segment_file(self, generation: int, field: str) -> str:
+        return f"memory-{generation:06d}.{field}.npy"
+
+    def _next_generation(self) -> int:
+        """A generation above that of all files in the directory, including those of interrupted saves."""
+        generations = [
+            int(match.group(2)) for match in map(GENERATION_FILE.match, os.listdir(self.directory)) if match
+        ]
+        return max(generations, default=-1) + 1
+
+    def _remove_unlisted(self, meta: dict) -> None:
+        generations = {segment["generation"] for segment in meta["segments"]}
+        for name in os.listdir(self.directory):
+            match = GENERATION_FILE.match(name)
+            listed = name == meta["agent"] or (
+                match and match.group(1) == "memory" and int(match.group(2)) in generations
+            )
+            if match and not listed:
+                try:
+                    # Memories that were loaded from the file keep their mapping of it
+                    os.remove(self.directory / name)
+                except OSError:
+                    # E.g. mapped files on Windows; the next save tries again
+                    pass
@@ -0,0 +1,105 @@
+from typing import Tuple
+
+import numpy as np
+
+
+class MinMaxDownsampler(object):
+    """Incremental min/max decimation of one or more series that share their x values.
+
+    The series are split into at most `num_buckets` buckets of `bucket_size` consecutive points. Each bucket keeps the
+    minimum and the maximum and their x values, such that peaks survive the decimation. When all buckets are full,
+    neighbouring buckets are merged and `bucket_size` doubles. Memory and the cost of `points` are therefore constant,
+    however many points were added.
+    """
+
+    def __init__(self, num_columns: int, num_buckets: int = 1024):
+        if num_buckets % 2 != 0:
+            raise ValueError("num_buckets must be even.")
+        self._num_buckets = num_buckets
+        self._shape = (num_columns, num_buckets + 1)  # The last bucket may be partially filled
+        self.clear()
+
+    @property
+    def bucket_size(self) -> int:
+        return self._bucket_size
+
+    def clear(self) -> None:
+        self._min = np.full(self._shape, np.inf)
+        self._max = np.full(self._shape, -np.inf)
+        self._x_min = np.zeros(self._shape)
+        self._x_max = np.zeros(self._shape)
+        self._bucket_size = 1
+        self._num_full = 0  # Number of full buckets
+        self._partial_count = 0  # Points in the bucket after the full buckets
+
+    def extend(self, x: np.ndarray, values: np.ndarray) -> None:
+        """Adds (n,) x values and the (num_columns, n) values at these x."""
+        x = np.asarray(x, dtype=float)
+        values = np.asarray(values, dtype=float).reshape((self._shape[0], len(x)))
+        while len(x) > 0:
+            # Fill the partial bucket
+            num = min(self._bucket_size - self._partial_count, len(x))
+            self._combine(self._num_full, x[:num], values[:, :num])
+            self._partial_count += num
+            x, values = x[num:], values[:, num:]
+            if self._partial_count == self._bucket_size:
+                self._num_full += 1
+                self._partial_count = 0
+                if self._num_full == self._num_buckets:
+                    self._merge()
+
+            # Whole buckets at once
+            num_buckets = min(len(x) // self._bucket_size, self._num_buckets - self._num_full)
+            if num_buckets > 0 and self._partial_count == 0:
+                num = num_buckets * self._bucket_size
+                block_x = x[:num].reshape((num_buckets, self._bucket_size))
+                block = values[:, :num].reshape((-1, num_buckets, self._bucket_size))
+                buckets = slice(self._num_full, self._num_full + num_buckets)
+                rows = np.arange(num_buckets)
+                arg_min = block.argmin(axis=2)
+                arg_max = block.argmax(axis=2)
+                self._min[:, buckets] = np.take_along_axis(block, arg_min[..., None], axis=2)[..., 0]
+                self._max[:, buckets] = np.take_along_axis(block, arg_max[..., None], axis=2)[..., 0]
+                self._x_min[:, buckets] = block_x[rows, arg_min]
+                self._x_max[:, buckets] = block_x[rows, arg_max]
+                self._num_full += num_buckets
+                x, values = x[num:], values[:, num:]
+                if self._num_full == self._num_buckets:
+                    self._merge()
+
+    def points(self, column: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """x and y values of the decimated series: the minimum and maximum of each bucket, in the order of x."""
+        num = self._num_full + (self._partial_count > 0)
+        x_min, x_max = self._x_min[column, :num], self._x_max[column, :num]
+        y_min, y_max = self._min[column, :num], self._max[column, :num]
+        min_first = x_min <= x_max
+        x = np.stack([np.where(min_first, x_min, x_max), np.where(min_first, x_max, x_min)], axis=1).ravel()
+        y = np.stack([np.where(min_first, y_min, y_max), np.where(min_first, y_max, y_min)], axis=1).ravel()
+        return x, y
+
+    def _combine(self, bucket: int, x: np.ndarray, values: np.ndarray) -> None:
+        if len(x) == 0:
+            return
+        arg_min = values.argmin(axis=1)
+        arg_max = values.argmax(axis=1)
+        columns = np.arange(values.shape[0])
+        new_min = values[columns, arg_min] < self._min[:, bucket]
+        new_max = values[columns, arg_max] > self._max[:, bucket]
+        self._min[new_min, bucket] = values[columns, arg_min][new_min]
+        self._x_min[new_min, bucket] = x[arg_min][new_min]
+        self._max[new_max, bucket] = values[columns, arg_max][new_max]
+        self._x_max[new_max, bucket] = x[arg_max][new_max]
+
+    def _merge(self) -> None:
+        """Merges pairs of full buckets, such that half of the buckets are free again."""
+        half = self._num_buckets // 2
+        for extreme, x_extreme, better in ((self._min, self._x_min, np.less), (self._max, self._x_max, np.greater)):
+            first, second = extreme[:, 0 : 2 * half : 2], extreme[:, 1 : 2 * half : 2]
+            take_second = better(second, first)
+            x_extreme[:, :half] = np.where(take_second, x_extreme[:, 1 : 2 * half : 2], x_extreme[:, 0 : 2 * half : 2])
+            extreme[:, :half] = np.where(take_second, second, first)
+        # Merges happen when the last bucket was completed, so there is no partial bucket to keep
+        for array, empty in ((self._min, np.inf), (self._max, -np.inf), (self._x_min, 0.0), (self._x_max, 0.0)):
+            array[:, half:] = empty
+        self._num_full = half
+        self._bucket_size *= 2
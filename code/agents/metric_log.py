@@ -0,0 +1,114 @@
+import pathlib
+import tempfile
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .downsample import MinMaxDownsampler
+
+
+def _append_npy(path: pathlib.Path, values: np.ndarray, length: int) -> None:
+    """Appends values to a 1-D `.npy` file that holds `length` elements, and updates its header in place."""
+    with open(path, "r+b") as file:
+        file.seek(0, 2)
+        file.write(values.tobytes())
+        file.seek(0)
+        np.lib.format.read_magic(file)
+        np.lib.format.read_array_header_1_0(file)
+        header_end = file.tell()
+        file.seek(0)
+        # numpy pads the header such that the length of the first axis can grow without moving the data
+        header = dict(
+            descr=np.lib.format.dtype_to_descr(values.dtype), fortran_order=False, shape=(length + len(values),)
+        )
+        np.lib.format.write_array_header_1_0(file, header)
+        if file.tell() != header_end:
+            raise RuntimeError(f"Header of {path} cannot grow in place.")
+
+
+class MetricLog(object):
+    """Append-only table of float columns, with bounded memory.
+
+    Rows are written into a preallocated (num_columns, chunk_size) chunk. Full chunks are appended to one `.npy` file
+    per column in `directory` (a temporary directory, if not given), so memory use does not grow with the number of
+    rows. `column` maps a file into memory, such that plots and analyses read all rows without copying them.
+
+    Written rows are also fed into a MinMaxDownsampler with `num_buckets` buckets. `downsampled` returns at most
+    2 * (num_buckets + 1) points per column, which keeps plots of long runs fast.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        directory: pathlib.Path = None,
+        chunk_size: int = 4096,
+        dtype=np.float64,
+        num_buckets: int = 1024,
+    ):
+        self.columns = tuple(columns)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._tmp_dir = None
+        if directory is None:
+            self._tmp_dir = tempfile.TemporaryDirectory(prefix="metric_log_")
+            directory = self._tmp_dir.name
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._chunk = np.zeros((len(self.columns), chunk_size), dtype=dtype)
+        self._downsampler = MinMaxDownsampler(len(self.columns), num_buckets)
+        self.clear()
+
+    def clear(self) -> None:
+        for name in self.columns:
+            path = self._path(name)
+            # Unlink first, such that views on the old file stay valid
+            path.unlink(missing_ok=True)
+            np.save(path, np.empty(0, dtype=self._chunk.dtype))
+        self._downsampler.clear()
+        self._last = np.full(len(self.columns), np.nan, dtype=self._chunk.dtype)
+        self._num_on_disk = 0  # Rows in the files
+        self._fill = 0  # Rows in the chunk
+        self._flushed = 0  # Rows of the chunk that are already in the files
+
+    def append(self, *values: float) -> None:
+        """Appends a row with one value per column, in column order."""
+        self._chunk[:, self._fill] = values
+        self._fill += 1
+        if self._fill == self._chunk.shape[1]:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes all rows that are only in memory to the files."""
+        if self._fill > self._flushed:
+            block = self._chunk[:, self._flushed : self._fill]
+            for name, values in zip(self.columns, block):
+                _append_npy(self._path(name), values, self._num_on_disk)
+            self._downsampler.extend(np.arange(self._num_on_disk, self._num_on_disk + block.shape[1]), block)
+            self._num_on_disk += self._fill - self._flushed
+            self._flushed = self._fill
+        if self._fill == self._chunk.shape[1]:
+            self._last = self._chunk[:, -1].copy()
+            self._fill = self._flushed = 0
+
+    def last(self, name: str) -> float:
+        """The latest value of a column (nan if the log is empty)."""
+        if self._fill > 0:
+            return self._chunk[self._index[name], self._fill - 1]
+        return self._last[self._index[name]]
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only, memory-mapped view on all values of a column. It is not extended by later appends."""
+        self.flush()
+        return np.load(self._path(name), mmap_mode="r")
+
+    def downsampled(self, name: str, x: str = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Min/max decimated (x, y) points of a column. x are the values of column `x` or the row indices."""
+        self.flush()
+        rows, y = self._downsampler.points(self._index[name])
+        rows = rows.astype(int)
+        return (rows if x is None else np.asarray(self.column(x)[rows])), y
+
+    def __len__(self) -> int:
+        return self._num_on_disk + self._fill - self._flushed
+
+    def _path(self, name: str) -> pathlib.Path:
+        return self.directory / f"{name}.npy"
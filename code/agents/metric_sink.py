@@ -0,0 +1,178 @@
+import csv
+import pathlib
+from collections import defaultdict, deque
+from threading import Condition, Event, Thread
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Scalar record: (tag, value, step)
+Record = Tuple[str, float, int]
+
+
+class TensorBoardBackend(object):
+    def __init__(self, writer):
+        self._writer = writer
+
+    def write(self, records: List[Record]) -> None:
+        for tag, value, step in records:
+            self._writer.add_scalar(tag, value, step)
+        self._writer.flush()
+
+    def close(self) -> None:
+        self._writer.flush()
+
+
+class CSVBackend(object):
+    """Appends records as `tag,value,step` rows to a CSV file."""
+
+    def __init__(self, path: pathlib.Path):
+        self._file = open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(("tag", "value", "step"))
+
+    def write(self, records: List[Record]) -> None:
+        self._writer.writerows(records)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class NpzBackend(object):
+    """Collects the records per tag and saves them as `<tag>/value` and `<tag>/step` arrays when closed."""
+
+    def __init__(self, path: pathlib.Path):
+        self._path = path
+        self._values: Dict[str, List[float]] = defaultdict(list)
+        self._steps: Dict[str, List[int]] = defaultdict(list)
+
+    def write(self, records: List[Record]) -> None:
+        for tag, value, step in records:
+            self._values[tag].append(value)
+            self._steps[tag].append(step)
+
+    def close(self) -> None:
+        arrays = {}
+        for tag in self._values:
+            arrays[f"{tag}/value"] = np.array(self._values[tag])
+            arrays[f"{tag}/step"] = np.array(self._steps[tag])
+        np.savez(self._path, **arrays)
+
+
+class MetricSink(object):
+    """Writes scalar metrics from a background thread, such that the training loop never waits for the backends.
+
+    `add_scalars` and `add_scalar` only append to a queue; a background thread writes the queued records to all
+    backends in batches, at least every `flush_interval` seconds. When `capacity` entries are queued, new entries are
+    counted in `num_dropped` and discarded, or, if `block` is set, the caller waits for the writer (backpressure).
+
+    Args:
+        backends: Objects with `write(records)` and `close()`, e.g. TensorBoardBackend, CSVBackend or NpzBackend.
+        capacity: Maximum number of queued entries.
+        batch_size: Number of queued entries after which the writer is woken up early.
+        flush_interval: Maximum time in seconds that entries stay in the queue.
+        block: Wait for space instead of dropping entries when the queue is full.
+    """
+
+    def __init__(
+        self,
+        backends: Sequence,
+        capacity: int = 65536,
+        batch_size: int = 1024,
+        flush_interval: float = 1.0,
+        block: bool = False,
+    ):
+        self._backends = list(backends)
+        self._capacity = capacity
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._block = block
+        # deque.append and deque.popleft are atomic, so producer and writer do not need a lock
+        self._queue = deque()
+        self._wake = Event()
+        self._space = Condition()
+        self._stop = False
+        self._error = None
+        self._num_queued = 0  # Entries queued by the producer
+        self._num_done = 0  # Entries written by the writer thread
+        self.num_dropped = 0
+        self.num_written = 0
+        self._thread = Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    @property
+    def num_pending(self) -> int:
+        return len(self._queue)
+
+    def add_scalars(self, scalars: Dict[str, float], step: int) -> bool:
+        """Queues {tag: value} records of one step. Returns False if they were dropped. Call from one thread only."""
+        if self._error:
+            raise self._error
+        if len(self._queue) >= self._capacity:
+            if not self._block:
+                self.num_dropped += 1
+                return False
+            with self._space:
+                self._wake.set()
+                self._space.wait_for(lambda: len(self._queue) < self._capacity or self._error)
+        self._queue.append((scalars, step))
+        self._num_queued += 1
+        if len(self._queue) >= self._batch_size:
+            self._wake.set()
+        return True
+
+    def add_scalar(self, tag: str, value: float, step: int) -> bool:
+        return self.add_scalars({tag: value}, step)
+
+    def flush(self, timeout: float = None) -> None:
+        """Waits until all queued records are written."""
+        num_queued = self._num_queued
+        self._wake.set()
+        with self._space:
+            self._space.wait_for(lambda: self._num_done >= num_queued or self._error, timeout)
+        if self._error:
+            raise self._error
+
+    def close(self) -> None:
+        """Writes the remaining records and closes the backends."""
+        self._stop = True
+        self._wake.set()
+        self._thread.join()
+        if self._error:
+            raise self._error
+
+    def _write_loop(self) -> None:
+        try:
+            while not self._stop:
+                self._wake.wait(self._flush_interval)
+                self._wake.clear()
+                self._write_pending()
+            self._write_pending()
+        except Exception as e:
+            self._error = e
+            with self._space:
+                self._space.notify_all()
+        finally:
+            for backend in self._backends:
+                backend.close()
+
+    def _write_pending(self) -> None:
+        while self._queue:
+            num_entries = min(len(self._queue), self._batch_size)
+            records = []
+            for _ in range(num_entries):
+                scalars, step = self._queue.popleft()
+                records.extend((tag, value, step) for tag, value in scalars.items())
+            for backend in self._backends:
+                backend.write(records)
+            self.num_written += len(records)
+            with self._space:
+                self._num_done += num_entries
+                self._space.notify_all()
+
+    def __enter__(self) -> "MetricSink":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -1,31 +1,141 @@
 import numpy as np
 
 
-class MovingTotal:
-    def __init__(self, maxlen):
-        self.data = np.zeros((maxlen,))
-        self._total = 0
+class MovingWindow:
+    """The last `maxlen` values of one channel, or of `channels` channels that are pushed together.
+
+    Values are stored in a (channels, maxlen) ring. Without `channels`, values are scalars; otherwise `push` takes
+    (channels,) arrays and `value` returns (channels,) arrays.
+    """
+
+    def __init__(self, maxlen, channels=None):
+        self._channels = channels
+        self.data = np.zeros((1 if channels is None else channels, maxlen))
+        self._values = self.data[0]  # Single channel, for fast scalar pushes
+        self._maxlen = maxlen
         self._push = 0
         self._len = 0
 
-    def push(self, val):
-        if self._len == len(self.data):
-            self._total -= self.data[self._push]
-        self._total += val
+    @property
+    def maxlen(self) -> int:
+        return self._maxlen
+
+    def __len__(self) -> int:
+        return self._len
 
-        self.data[self._push] = val
-        self._len = min(self._len + 1, len(self.data))
+    def push(self, val):
+        if self._channels is None:
+            self._values[self._push] = val
+        else:
+            self.data[:, self._push] = val
+        if self._len < self._maxlen:
+            self._len += 1
         self._push = self._advance(self._push)
 
+    def push_many(self, values):
+        """Pushes (n,) values, or (n, channels) values for multiple channels, in order."""
+        values = np.asarray(values, dtype=float).reshape((-1, self.data.shape[0]))[-self.maxlen :]
+        slots = (self._push + np.arange(len(values))) % self.maxlen
+        self.data[:, slots] = values.T
+        self._len = min(self._len + len(values), self.maxlen)
+        self._push = (self._push + len(values)) % self.maxlen
+
+    def window(self) -> np.ndarray:
+        """(channels, len) values in the window, in storage order."""
+        return self.data[:, : self._len]
+
     def _advance(self, it):
-        return (it + 1) % len(self.data)
+        return (it + 1) % self._maxlen
+
+    def _output(self, values):
+        return values[0] if self._channels is None else values
+
+
+class MovingTotal(MovingWindow):
+    """Moving sum, updated incrementally.
+
+    To keep floating point errors from accumulating, the sum is recomputed from the window every `recompute_period`
+    pushed values (default: maxlen).
+    """
+
+    def __init__(self, maxlen, channels=None, recompute_period=None):
+        super().__init__(maxlen, channels)
+        self._total = np.zeros(self.data.shape[0])
+        self._recompute_period = recompute_period if recompute_period else maxlen
+        self._since_recompute = 0
+
+    def push(self, val):
+        # Empty slots are zero, so they can be subtracted as well
+        if self._channels is None:
+            self._total[0] += val - self._values[self._push]
+        else:
+            self._total += val - self.data[:, self._push]
+        super().push(val)
+        self._since_recompute += 1
+        if self._since_recompute >= self._recompute_period:
+            self._recompute()
+
+    def push_many(self, values):
+        values = np.asarray(values, dtype=float).reshape((-1, self.data.shape[0]))
+        if len(values) >= self.maxlen:
+            super().push_many(values)
+            self._recompute()
+            return
+        slots = (self._push + np.arange(len(values))) % self.maxlen
+        self._total -= self.data[:, slots].sum(axis=1)
+        self._total += values.sum(axis=0)
+        super().push_many(values)
+        self._since_recompute += len(values)
+        if self._since_recompute >= self._recompute_period:
+            self._recompute()
+
+    def _recompute(self):
+        self._total = self.window().sum(axis=1)
+        self._since_recompute = 0
 
     @property
     def value(self):
-        return self._total
+        return self._total[0] if self._channels is None else self._total.copy()
 
 
 class MovingAverage(MovingTotal):
     @property
     def value(self):
+        if self._channels is None:
+            return self._total[0] / max(self._len, 1)
         return self._total / max(self._len, 1)
+
+
+class MovingMin(MovingWindow):
+    """Minimum of the window. Computed when queried, which costs O(maxlen) per channel."""
+
+    @property
+    def value(self):
+        if self._len == 0:
+            return self._output(np.full(self.data.shape[0], np.nan))
+        return self._output(self.window().min(axis=1))
+
+
+class MovingMax(MovingWindow):
+    """Maximum of the window. Computed when queried, which costs O(maxlen) per channel."""
+
+    @property
+    def value(self):
+        if self._len == 0:
+            return self._output(np.full(self.data.shape[0], np.nan))
+        return self._output(self.window().max(axis=1))
+
+
+class MovingQuantile(MovingWindow):
+    """Quantile `q` (or quantiles, if `q` is a sequence) of the window. Computed when queried."""
+
+    def __init__(self, maxlen, q, channels=None):
+        super().__init__(maxlen, channels)
+        self.q = q
+
+    @property
+    def value(self):
+        if self._len == 0:
+            return self._output(np.full((self.data.shape[0],) + np.shape(self.q), np.nan))
+        quantiles = np.quantile(self.window(), self.q, axis=1)
+        return self._output(np.moveaxis(quantiles, -1, 0))
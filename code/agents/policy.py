@@ -0,0 +1,83 @@
+import json
+import pathlib
+import struct
+from typing import List, Tuple
+
+import numpy as np
+
+MAGIC = b"DQNW"
+ALIGNMENT = 64
+
+
+def save_weights(path: pathlib.Path, layers: List[Tuple[np.ndarray, np.ndarray]]) -> None:
+    """Writes (n_in, n_out) weight matrices and (n_out,) biases into a flat weight file.
+
+    File layout:
+        magic (4 bytes) | header length (uint32) | JSON header | padding | float32 weights
+
+    The header lists the (n_in, n_out) shapes of the layers. The weights are stored layer by layer, the weight matrix
+    followed by the bias, such that a forward pass is a chain of `x @ weight + bias`.
+    """
+    header = json.dumps(dict(layers=[list(weight.shape) for weight, _ in layers])).encode()
+    offset = len(MAGIC) + 4 + len(header)
+    padding = -offset % ALIGNMENT
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<I", len(header)))
+        file.write(header)
+        file.write(b"\0" * padding)
+        for weight, bias in layers:
+            file.write(np.ascontiguousarray(weight, dtype="<f4").tobytes())
+            file.write(np.ascontiguousarray(bias, dtype="<f4").tobytes())
+
+
+def load_weights(path: pathlib.Path) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Maps a flat weight file into memory and returns views on the weight matrices and biases."""
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a weight file.")
+        (header_length,) = struct.unpack("<I", file.read(4))
+        header = json.loads(file.read(header_length))
+    offset = len(MAGIC) + 4 + header_length
+    offset += -offset % ALIGNMENT
+
+    data = np.memmap(path, dtype="<f4", mode="r", offset=offset)
+    layers = []
+    position = 0
+    for n_in, n_out in header["layers"]:
+        weight = data[position : position + n_in * n_out].reshape((n_in, n_out))
+        position += n_in * n_out
+        bias = data[position : position + n_out]
+        position += n_out
+        layers.append((weight, bias))
+    return layers
+
+
+class Policy(object):
+    """Greedy policy of an exported Q-network (linear layers with ReLU activations in between)."""
+
+    def __init__(self, path: pathlib.Path):
+        self._layers = load_weights(path)
+
+    @property
+    def num_states(self) -> int:
+        return self._layers[0][0].shape[0]
+
+    @property
+    def num_actions(self) -> int:
+        return self._layers[-1][0].shape[1]
+
+    def q_values(self, states) -> np.ndarray:
+        """Evaluates a single (num_states,) state or a (N, num_states) batch of states."""
+        x = np.asarray(states, dtype=np.float32)
+        for weight, bias in self._layers[:-1]:
+            x = x @ weight
+            x += bias
+            np.maximum(x, 0.0, out=x)
+        weight, bias = self._layers[-1]
+        return x @ weight + bias
+
+    def __call__(self, states):
+        """Returns the greedy action (int) of a single state, or an array of actions for a batch of states."""
+        actions = self.q_values(states).argmax(axis=-1)
+        return int(actions) if actions.ndim == 0 else actions
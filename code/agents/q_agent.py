@@ -1,11 +1,12 @@
 import random
 from math import exp
 
+import numpy as np
 import torch
 from gymnasium.spaces import Space
 from torch import nn, optim
 
-from .buffer import Memory, Sample
+from .buffer import Memory, Sample, SparseMemory
 from .q_network import DQN
 
 
@@ -22,11 +23,16 @@ class DQNActor(object):
         tau=0.005,
         lr=1.0e-4,
         memory_size=60_000,
+        target_update_period=1,
+        width=64,
+        sparse_memory=False,
         device="cpu",
+        seed=None,
         **kwargs,
     ):
         self.num_states = num_states
         self.num_actions = num_actions
+        self.width = width
         self.batch_size = batch_size
         self.gamma = gamma
 
@@ -36,19 +42,34 @@ class DQNActor(object):
 
         self.tau = tau
         self.lr = lr
+        self.target_update_period = target_update_period
+        self.device = device
 
-        self.policy_net = DQN(num_states, self.num_actions).to(device)
-        self.target_net = DQN(num_states, self.num_actions).to(device)
+        # Random source for the batched action selection; unseeded generators would all start from one default seed
+        self.generator = torch.Generator(device=device)
+        if seed is not None:
+            self.generator.manual_seed(seed)
+        else:
+            self.generator.seed()
+
+        self.policy_net = DQN(num_states, self.num_actions, width).to(device)
+        self.target_net = DQN(num_states, self.num_actions, width).to(device)
         self.target_net.load_state_dict(self.policy_net.state_dict())
 
+        # Parameters are updated in-place by the optimizer, so the lists stay valid for the lifetime of the nets.
+        self._policy_params = list(self.policy_net.parameters())
+        self._target_params = list(self.target_net.parameters())
+
         self.optimizer = optim.AdamW(self.policy_net.parameters(), lr=self.lr, amsgrad=True)
-        self.memory = Memory(memory_size)
+        # A sparse memory stores only the nonzero state features, for states that are mostly empty buffers
+        self.memory = SparseMemory(memory_size, num_states) if sparse_memory else Memory(memory_size)
         self.experience_count = 0  # Total experience collected
         self.learn_count = 0  # Number of learning updates
 
     def load_weights(self, path: str):
-        self.policy_net.load_state_dict(torch.load(path))
-        self.target_net.load_state_dict(torch.load(path))
+        state_dict = torch.load(path, map_location=self.device)
+        self.policy_net.load_state_dict(state_dict)
+        self.target_net.load_state_dict(state_dict)
 
     def eval(self):
         self.policy_net.eval()
@@ -70,22 +91,62 @@ class DQNActor(object):
             # randint includes upper interval bound; need to subtract 1
             return random.randint(0, self.num_actions - 1)
 
+    def greedy_batch(self, states) -> np.ndarray:
+        """Selects the greedy action for each row of a (N, num_states) array or tensor with a single forward pass."""
+        states = torch.as_tensor(states, dtype=torch.float32, device=self.device)
+        with torch.inference_mode():
+            return self.policy_net(states).argmax(dim=1).cpu().numpy()
+
+    def epsilon_greedy_batch(self, states) -> np.ndarray:
+        """Epsilon-greedy counterpart of greedy_batch; exploration is decided independently for every row."""
+        states = torch.as_tensor(states, dtype=torch.float32, device=self.device)
+        with torch.inference_mode():
+            greedy_actions = self.policy_net(states).argmax(dim=1)
+            num_states = greedy_actions.shape[0]
+            explore = torch.rand(num_states, generator=self.generator, device=self.device) < self.get_epsilon()
+            random_actions = torch.randint(
+                0, self.num_actions, (num_states,), generator=self.generator, device=self.device
+            )
+            return torch.where(explore, random_actions, greedy_actions).cpu().numpy()
+
     def push_memory(self, state, action, next_state, reward):
         self.experience_count += 1
         self.memory.push(state, action, next_state, reward)
 
-    def optimize_model(self) -> dict:
-        if len(self.memory) < self.batch_size:
-            return {}
+    @property
+    def target_update_rate(self) -> float:
+        """Blend factor of a single target update.
+
+        When the target is only updated every k learning steps, tau is compounded over the k steps, such that the
+        target net tracks the policy net with the same time constant as when updating every step.
+        """
+        return 1.0 - (1.0 - self.tau) ** self.target_update_period
+
+    def update_target_net(self) -> None:
+        """Polyak-averages the policy net into the target net, in-place."""
+        rate = self.target_update_rate
+        with torch.no_grad():
+            torch._foreach_lerp_(self._target_params, self._policy_params, rate)
+            for target_buffer, policy_buffer in zip(self.target_net.buffers(), self.policy_net.buffers()):
+                if target_buffer.is_floating_point():
+                    target_buffer.lerp_(policy_buffer, rate)
+                else:
+                    # Integer buffers (e.g. counters) cannot be interpolated
+                    target_buffer.copy_(policy_buffer)
+
+    def optimize_model(self, batch: Sample = None) -> dict:
+        """Runs one learning update on `batch`, or on a batch sampled from memory if none is given."""
+        if batch is None:
+            if len(self.memory) < self.batch_size:
+                return {}
+            # Get samples from memory, prepare for learning
+            batch = self.memory.sample_batch(self.batch_size)
         self.learn_count += 1
 
-        # Get samples from memory, prepare for learning
-        transitions = self.memory.sample(self.batch_size)
-        batch = Sample(*zip(*transitions))
-        state_batch = torch.cat(batch.s)
-        action_batch = torch.cat(batch.a)
-        reward_batch = torch.cat(batch.r)
-        next_state_batch = torch.cat(batch.s_prime)
+        state_batch = batch.s
+        action_batch = batch.a
+        reward_batch = batch.r
+        next_state_batch = batch.s_prime
 
         # Evaluate value function
         q_curr = self.policy_net(state_batch).gather(1, action_batch)
@@ -102,12 +163,7 @@ class DQNActor(object):
         self.optimizer.step()
 
         # Update target model
-        target_net_state_dict = self.target_net.state_dict()
-        policy_net_state_dict = self.policy_net.state_dict()
-        for key in policy_net_state_dict:
-            target_net_state_dict[key] = (1.0 - self.tau) * target_net_state_dict[
-                key
-            ] + self.tau * policy_net_state_dict[key]
-        self.target_net.load_state_dict(target_net_state_dict)
+        if self.learn_count % self.target_update_period == 0:
+            self.update_target_net()
 
         return {"loss": loss.cpu().item(), "epsilon": self.get_epsilon()}
@@ -1,6 +1,10 @@
+import pathlib
+
 from torch import nn
 from torch.nn import functional
 
+from .policy import save_weights
+
 
 class DQN(nn.Module):
     def __init__(self, n_states, n_actions, width=64):
@@ -13,5 +17,24 @@ class DQN(nn.Module):
             nn.Linear(width, n_actions),
         )
 
+    @classmethod
+    def from_state_dict(cls, state_dict: dict) -> "DQN":
+        """Creates a network with the dimensions of a saved state dict (e.g. a trained `.mdl`) and loads it."""
+        n_states = state_dict["model.0.weight"].shape[1]
+        width = state_dict["model.0.weight"].shape[0]
+        n_actions = state_dict["model.4.weight"].shape[0]
+        net = cls(n_states, n_actions, width)
+        net.load_state_dict(state_dict)
+        return net
+
     def forward(self, x):
         return self.model(x)
+
+    def export(self, path: pathlib.Path) -> None:
+        """Exports the weights into a flat file, which can be evaluated by `agents.policy.Policy` without torch."""
+        layers = [
+            (layer.weight.detach().cpu().numpy().T, layer.bias.detach().cpu().numpy())
+            for layer in self.model
+            if isinstance(layer, nn.Linear)
+        ]
+        save_weights(path, layers)
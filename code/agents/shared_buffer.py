@@ -0,0 +1,62 @@
+import torch
+from torch import multiprocessing as mp
+
+from .buffer import Sample
+
+
+class SharedMemory(object):
+    """Replay memory backed by preallocated tensors in shared memory.
+
+    The memory can be handed to worker processes, which push transitions concurrently with the learner sampling from
+    it. All index bookkeeping is guarded by a lock. Batches are sampled with replacement.
+    """
+
+    def __init__(self, capacity: int, num_states: int, lock=None):
+        self._capacity = capacity
+        self.s = torch.zeros((capacity, num_states)).share_memory_()
+        self.a = torch.zeros((capacity, 1), dtype=torch.int64).share_memory_()
+        self.s_prime = torch.zeros((capacity, num_states)).share_memory_()
+        self.r = torch.zeros((capacity,)).share_memory_()
+        # [next push position, number of stored transitions, total number of pushed transitions]
+        self._counters = torch.zeros((3,), dtype=torch.int64).share_memory_()
+        self._lock = lock if lock else mp.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def push_count(self) -> int:
+        """Total number of pushed transitions, including the ones that were overwritten."""
+        return int(self._counters[2])
+
+    def push(self, s, a, s_prime, r):
+        self.push_batch(s, a, s_prime, r)
+
+    def push_batch(self, s, a, s_prime, r):
+        """Pushes (N, ...) batches of transitions, as used by `DQNActor.push_memory`."""
+        num_transitions = s.shape[0]
+        with self._lock:
+            position = int(self._counters[0])
+            idx = torch.arange(position, position + num_transitions) % self._capacity
+            self.s[idx] = s
+            self.a[idx] = a.reshape((-1, 1))
+            self.s_prime[idx] = s_prime
+            self.r[idx] = r.reshape((-1,))
+            self._counters[0] = (position + num_transitions) % self._capacity
+            self._counters[1] = min(int(self._counters[1]) + num_transitions, self._capacity)
+            self._counters[2] += num_transitions
+
+    def sample_batch(self, batch_size) -> Sample:
+        with self._lock:
+            idx = torch.randint(0, int(self._counters[1]), (batch_size,))
+            return Sample(self.s[idx], self.a[idx], self.s_prime[idx], self.r[idx])
+
+    def latest(self, n) -> Sample:
+        """Returns the n most recently pushed transitions, oldest first."""
+        with self._lock:
+            idx = torch.arange(int(self._counters[0]) - n, int(self._counters[0])) % self._capacity
+            return Sample(self.s[idx], self.a[idx], self.s_prime[idx], self.r[idx])
+
+    def __len__(self):
+        return int(self._counters[1])
@@ -0,0 +1,47 @@
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+
+class SparseState(NamedTuple):
+    """Nonzero features of a state: their indices and values, and the length of the dense state."""
+
+    indices: np.ndarray
+    values: np.ndarray
+    size: int
+
+    @property
+    def nbytes(self) -> int:
+        return self.indices.nbytes + self.values.nbytes
+
+
+def index_dtype(size: int) -> np.dtype:
+    """Smallest unsigned dtype that holds the indices of a state of length `size`."""
+    return np.dtype(np.uint16 if size <= 2**16 else np.uint32)
+
+
+def to_sparse(state, dtype=np.float32) -> SparseState:
+    """Encodes a dense state (array, tensor or list; flattened) into its nonzero features."""
+    state = np.asarray(state).reshape(-1)
+    indices = np.flatnonzero(state)
+    return SparseState(indices.astype(index_dtype(state.size)), state[indices].astype(dtype), state.size)
+
+
+def densify(states: Sequence[SparseState], out: np.ndarray = None, dtype=np.float32) -> np.ndarray:
+    """Decodes sparse states of equal size into a (len(states), size) array, with a single scatter.
+
+    With `out`, the states are written into that (contiguous) array instead of a new one.
+    """
+    size = states[0].size if states else 0
+    if out is None:
+        out = np.zeros((len(states), size), dtype=dtype)
+    else:
+        out.fill(0)
+    if states:
+        counts = [len(state.indices) for state in states]
+        rows = np.repeat(np.arange(len(states), dtype=np.int64) * size, counts)
+        flat = out.reshape(-1)
+        flat[rows + np.concatenate([state.indices for state in states])] = np.concatenate(
+            [state.values for state in states]
+        )
+    return out
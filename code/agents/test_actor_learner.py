@@ -0,0 +1,29 @@
+from environments.tests.hierarchical.conftest import build_env as make_env
+
+from .actor_learner import ActorLearner
+from .q_agent import DQNActor
+
+
+def test_actor_learner():
+    env = make_env()
+    agent = DQNActor(env.observation_space.shape[0], env.action_space.n, batch_size=8)
+    actor_learner = ActorLearner(agent, make_env, num_collectors=2, broadcast_period=2, sync_period=4, queue_depth=4)
+    with actor_learner:
+        results = actor_learner.run(10)
+
+    assert len(results) == 10
+    assert actor_learner.learn_steps == 10
+    assert actor_learner.env_steps >= 8
+    assert len(agent.memory) == actor_learner.env_steps
+    assert actor_learner.throughput["learn_steps_per_sec"] > 0.0
+    assert len(actor_learner.throughput["collector_steps_per_sec"]) == 2
+
+
+def test_actor_learner_width():
+    env = make_env()
+    agent = DQNActor(env.observation_space.shape[0], env.action_space.n, batch_size=4, width=32)
+    actor_learner = ActorLearner(agent, make_env, num_collectors=1, broadcast_period=1, queue_depth=2)
+    assert actor_learner.agent_kwargs["width"] == 32
+    with actor_learner:
+        results = actor_learner.run(2)
+    assert len(results) == 2
@@ -1,6 +1,9 @@
+import numpy as np
 import pytest
+import torch
 
-from .buffer import Memory, Sample
+from .buffer import Memory, Sample, SparseMemory
+from .sparse import to_sparse
 
 
 @pytest.fixture
@@ -37,3 +40,49 @@ def test_sample(setup):
     assert len(result) == 2
     assert result[0] in setup
     assert result[1] in setup
+
+
+def test_sparse_memory():
+    rng = np.random.default_rng(0)
+    states = torch.from_numpy((rng.random((11, 1, 40)) < 0.1).astype(np.float32) * 3.0)
+    memory, sparse_memory = Memory(8), SparseMemory(8, 40)
+    for i in range(10):
+        transition = (states[i], torch.tensor([[i % 3]]), states[i + 1], torch.tensor([float(i)]))
+        memory.push(*transition)
+        sparse_memory.push(*transition)
+    assert len(sparse_memory) == 8 and sparse_memory.push_count == 10
+
+    for field, expected in zip(sparse_memory.latest(8), memory.latest(8)):
+        assert field.dtype == expected.dtype
+        torch.testing.assert_close(field, expected)
+    batch = sparse_memory.sample_batch(4)
+    assert batch.s.shape == (4, 40) and batch.a.shape == (4, 1) and batch.r.shape == (4,)
+
+
+def test_sparse_memory_shared_states():
+    sparse_memory = SparseMemory(4, 100)
+    states = [to_sparse(np.eye(100)[i]) for i in range(5)]
+    for i in range(4):
+        sparse_memory.push(states[i], i, states[i + 1], 0.0)
+    # Every state is stored once: one index and one value each
+    assert sparse_memory.nbytes == 5 * (2 + 4)
+    torch.testing.assert_close(sparse_memory.latest(4).s_prime, torch.eye(100)[1:5])
+
+
+def test_sparse_memory_consecutive_states():
+    agent_states = torch.zeros((6, 1, 100))
+    agent_states[torch.arange(6), 0, torch.arange(6)] = 1.0
+    sparse_memory = SparseMemory(8, 100)
+    # Dense states, as pushed by DQNActor; the next state of a transition is the state of the following one
+    for i in range(5):
+        sparse_memory.push(agent_states[i], torch.tensor([[0]]), agent_states[i + 1], torch.tensor([0.0]))
+    assert sparse_memory.nbytes == 6 * (2 + 4)
+    torch.testing.assert_close(sparse_memory.latest(5).s, agent_states[:5, 0])
+
+    # Equal contents are shared, also if the state is written into the same tensor
+    state = agent_states[5].clone()
+    sparse_memory.push(state, 0, state, 0.0)
+    state[0, 7] = 2.0
+    sparse_memory.push(state, 0, state, 0.0)
+    assert sparse_memory.nbytes == 6 * (2 + 4) + 2 * (2 + 4)
+    torch.testing.assert_close(sparse_memory.latest(1).s[0, 5:8], torch.tensor([1.0, 0.0, 2.0]))
@@ -0,0 +1,131 @@
+import pytest
+import torch
+
+from .checkpoint import Checkpoint
+from .q_agent import DQNActor
+from .shared_buffer import SharedMemory
+
+
+def push(agent: DQNActor, values):
+    for value in values:
+        state = torch.full((1, agent.num_states), float(value))
+        agent.push_memory(state, torch.tensor([[value % agent.num_actions]]), state + 1, torch.tensor([float(value)]))
+
+
+def rewards(agent: DQNActor):
+    return agent.memory.latest(len(agent.memory)).r.tolist()
+
+
+@pytest.fixture
+def trained_agent():
+    agent = DQNActor(3, 2, batch_size=4, memory_size=5)
+    push(agent, range(4))
+    agent.optimize_model()
+    return agent
+
+
+def test_save_load_sparse_memory(tmp_path):
+    agent = DQNActor(100, 2, batch_size=4, memory_size=5, sparse_memory=True)
+    states = torch.eye(100)[:7].unsqueeze(1)
+    for i in range(6):
+        agent.push_memory(states[i], torch.tensor([[i % 2]]), states[i + 1], torch.tensor([float(i)]))
+    checkpoint = Checkpoint(tmp_path)
+    checkpoint.save(agent)
+    agent.push_memory(states[6], torch.tensor([[0]]), states[0], torch.tensor([6.0]))
+    checkpoint.save(agent)
+
+    # One index and one value for each of the states on disk, instead of dense rows
+    assert sum(path.stat().st_size for path in tmp_path.glob("memory-*.npy")) < 5 * 2 * 100 * 4
+
+    loaded = DQNActor(100, 2, batch_size=4, memory_size=5, sparse_memory=True)
+    Checkpoint(tmp_path).load(loaded)
+    for field, expected in zip(loaded.memory.latest(5), agent.memory.latest(5)):
+        torch.testing.assert_close(field, expected)
+    assert rewards(loaded) == [2.0, 3.0, 4.0, 5.0, 6.0]
+    # Consecutive transitions still share their states
+    assert loaded.memory.nbytes == agent.memory.nbytes == 6 * (2 + 4)
+
+    with pytest.raises(ValueError):
+        Checkpoint(tmp_path).load(DQNActor(100, 2, memory_size=5))
+
+
+def test_save_load(tmp_path, trained_agent):
+    Checkpoint(tmp_path).save(trained_agent)
+    assert Checkpoint(tmp_path).exists()
+
+    agent = DQNActor(3, 2, batch_size=4, memory_size=5)
+    Checkpoint(tmp_path).load(agent)
+    assert agent.experience_count == 4
+    assert agent.learn_count == 1
+    for key, val in trained_agent.policy_net.state_dict().items():
+        torch.testing.assert_close(agent.policy_net.state_dict()[key], val)
+    for key, val in trained_agent.target_net.state_dict().items():
+        torch.testing.assert_close(agent.target_net.state_dict()[key], val)
+    assert agent.optimizer.state_dict()["state"].keys() == trained_agent.optimizer.state_dict()["state"].keys()
+    assert rewards(agent) == [0.0, 1.0, 2.0, 3.0]
+
+    batch = agent.memory.latest(4)
+    torch.testing.assert_close(batch.s_prime, batch.s + 1)
+    assert batch.a.flatten().tolist() == [0, 1, 0, 1]
+
+
+def test_incremental_save(tmp_path, trained_agent):
+    checkpoint = Checkpoint(tmp_path)
+    checkpoint.save(trained_agent)
+    push(trained_agent, range(4, 7))
+    checkpoint.save(trained_agent)
+
+    agent = DQNActor(3, 2, memory_size=5)
+    Checkpoint(tmp_path).load(agent)
+    assert rewards(agent) == [2.0, 3.0, 4.0, 5.0, 6.0]
+
+
+def test_resume(tmp_path, trained_agent):
+    Checkpoint(tmp_path).save(trained_agent)
+
+    # Resume into a shared memory, continue collecting and save again
+    agent = DQNActor(3, 2, memory_size=5)
+    agent.memory = SharedMemory(5, 3)
+    checkpoint = Checkpoint(tmp_path)
+    checkpoint.load(agent)
+    push(agent, range(4, 6))
+    checkpoint.save(agent)
+
+    resumed = DQNActor(3, 2, memory_size=5)
+    Checkpoint(tmp_path).load(resumed)
+    assert rewards(resumed) == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+def test_save_after_load(tmp_path, trained_agent):
+    Checkpoint(tmp_path).save(trained_agent)
+    agent = DQNActor(3, 2, memory_size=5)
+    Checkpoint(tmp_path).load(agent)
+
+    # A new checkpoint of the same directory must not overwrite the files that the loaded memory maps
+    Checkpoint(tmp_path).save(agent)
+    assert rewards(agent) == [0.0, 1.0, 2.0, 3.0]
+
+    resumed = DQNActor(3, 2, memory_size=5)
+    Checkpoint(tmp_path).load(resumed)
+    assert rewards(resumed) == [0.0, 1.0, 2.0, 3.0]
+
+
+def test_merge_segments(tmp_path, trained_agent):
+    checkpoint = Checkpoint(tmp_path, max_segments=2)
+    for value in range(4, 9):
+        checkpoint.save(trained_agent)
+        push(trained_agent, [value])
+    checkpoint.save(trained_agent)
+
+    # Only the files of the last save remain
+    assert len(list(tmp_path.glob("agent-*.pt"))) == 1
+    assert len(list(tmp_path.glob("memory-*.r.npy"))) <= 2
+    agent = DQNActor(3, 2, memory_size=5)
+    Checkpoint(tmp_path).load(agent)
+    assert rewards(agent) == [4.0, 5.0, 6.0, 7.0, 8.0]
+
+
+def test_load_capacity_mismatch(tmp_path, trained_agent):
+    Checkpoint(tmp_path).save(trained_agent)
+    with pytest.raises(ValueError):
+        Checkpoint(tmp_path).load(DQNActor(3, 2, memory_size=10))
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from .downsample import MinMaxDownsampler
+
+
+def reference_points(x, y, bucket_size):
+    """Min/max decimation of a complete series with fixed buckets."""
+    points = []
+    for start in range(0, len(x), bucket_size):
+        bucket_x, bucket_y = x[start : start + bucket_size], y[start : start + bucket_size]
+        i, j = sorted((bucket_y.argmin(), bucket_y.argmax()))
+        points.extend([(bucket_x[i], bucket_y[i]), (bucket_x[j], bucket_y[j])])
+    return np.array(points).T
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 50, 1000])
+def test_min_max_downsampler(block_size):
+    rng = np.random.default_rng(0)
+    num_points = 1000
+    x = np.arange(num_points) * 10.0
+    values = np.stack([rng.normal(size=num_points), rng.normal(size=num_points)])
+
+    downsampler = MinMaxDownsampler(num_columns=2, num_buckets=16)
+    for start in range(0, num_points, block_size):
+        downsampler.extend(x[start : start + block_size], values[:, start : start + block_size])
+
+    # 1000 points need buckets of 64 points
+    assert downsampler.bucket_size == 64
+    for column in range(2):
+        points_x, points_y = downsampler.points(column)
+        expected_x, expected_y = reference_points(x, values[column], 64)
+        np.testing.assert_array_equal(points_x, expected_x)
+        np.testing.assert_array_equal(points_y, expected_y)
+        # The extremes of the series are always kept
+        assert points_y.min() == values[column].min()
+        assert points_y.max() == values[column].max()
+
+
+def test_min_max_downsampler_empty():
+    downsampler = MinMaxDownsampler(num_columns=1, num_buckets=4)
+    x, y = downsampler.points()
+    assert len(x) == 0 and len(y) == 0
+    downsampler.extend([0.0], [[1.0]])
+    x, y = downsampler.points()
+    np.testing.assert_array_equal(x, [0.0, 0.0])
+    np.testing.assert_array_equal(y, [1.0, 1.0])
@@ -0,0 +1,53 @@
+import numpy as np
+
+from .metric_log import MetricLog
+
+
+def test_metric_log(tmp_path):
+    log = MetricLog(("time", "value"), tmp_path, chunk_size=4)
+    assert len(log) == 0
+    assert len(log.column("time")) == 0
+    assert np.isnan(log.last("time"))
+
+    for i in range(10):
+        log.append(i, 2.0 * i)
+        assert log.last("value") == 2.0 * i
+    assert len(log) == 10
+    # Two full chunks are on disk, the remaining rows are in memory
+    assert len(np.load(tmp_path / "time.npy")) == 8
+
+    values = log.column("value")
+    assert isinstance(values, np.memmap)
+    np.testing.assert_array_equal(values, 2.0 * np.arange(10))
+    np.testing.assert_array_equal(np.load(tmp_path / "time.npy"), np.arange(10))
+
+    # Rows are appended after a flush of a partial chunk
+    for i in range(10, 13):
+        log.append(i, 2.0 * i)
+    np.testing.assert_array_equal(log.column("time"), np.arange(13))
+    # Views are not affected by later appends
+    np.testing.assert_array_equal(values, 2.0 * np.arange(10))
+
+
+def test_metric_log_clear():
+    log = MetricLog(("x",), chunk_size=2)
+    for i in range(5):
+        log.append(i)
+    values = log.column("x")
+    log.clear()
+    assert len(log) == 0
+    assert len(log.column("x")) == 0
+    np.testing.assert_array_equal(values, np.arange(5))
+
+
+def test_metric_log_downsampled():
+    log = MetricLog(("time", "value"), chunk_size=16, num_buckets=8)
+    values = np.sin(np.arange(1000) / 50.0)
+    for i, value in enumerate(values):
+        log.append(10.0 * i, value)
+
+    x, y = log.downsampled("value", x="time")
+    assert len(x) == len(y) <= 2 * 9
+    assert np.all(np.diff(x) >= 0.0)
+    np.testing.assert_array_equal(y, values[(x / 10.0).astype(int)])
+    assert y.min() == values.min() and y.max() == values.max()
@@ -0,0 +1,77 @@
+import csv
+import time
+from threading import Event
+
+import numpy as np
+
+from .metric_sink import CSVBackend, MetricSink, NpzBackend
+
+
+class ListBackend(object):
+    def __init__(self, release: Event = None):
+        self.batches = []
+        self.closed = False
+        self._release = release
+
+    def write(self, records):
+        if self._release is not None:
+            self._release.wait()
+        self.batches.append(records)
+
+    def close(self):
+        self.closed = True
+
+
+def test_metric_sink_writes_batches():
+    backend = ListBackend()
+    with MetricSink([backend], batch_size=4, flush_interval=10.0) as sink:
+        for step in range(10):
+            assert sink.add_scalars({"a": step, "b": -step}, step)
+        sink.flush()
+        assert sink.num_pending == 0
+        assert sink.num_written == 20
+    assert backend.closed
+    records = [record for batch in backend.batches for record in batch]
+    assert records[:4] == [("a", 0, 0), ("b", 0, 0), ("a", 1, 1), ("b", -1, 1)]
+    assert all(len(batch) <= 8 for batch in backend.batches)
+
+
+def test_metric_sink_drops_when_full():
+    release = Event()
+    backend = ListBackend(release)
+    sink = MetricSink([backend], capacity=2, batch_size=1, flush_interval=0.01)
+    sink.add_scalar("a", 0.0, 0)
+    # Wait until the writer blocks in the backend
+    while sink.num_pending > 0:
+        time.sleep(0.001)
+    results = [sink.add_scalar("a", float(i), i) for i in range(1, 5)]
+    assert results == [True, True, False, False]
+    assert sink.num_dropped == 2
+
+    release.set()
+    sink.close()
+    assert [batch[0][2] for batch in backend.batches] == [0, 1, 2]
+
+
+def test_metric_sink_blocks_when_full():
+    backend = ListBackend()
+    with MetricSink([backend], capacity=1, batch_size=1, flush_interval=10.0, block=True) as sink:
+        for step in range(100):
+            sink.add_scalar("a", step, step)
+    assert sink.num_dropped == 0
+    assert sink.num_written == 100
+
+
+def test_file_backends(tmp_path):
+    with MetricSink([CSVBackend(tmp_path / "metrics.csv"), NpzBackend(tmp_path / "metrics.npz")]) as sink:
+        for step in range(3):
+            sink.add_scalars({"train/loss": 0.5 * step, "train/epsilon": 1.0}, step)
+
+    with open(tmp_path / "metrics.csv", newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ["tag", "value", "step"]
+    assert rows[1:3] == [["train/loss", "0.0", "0"], ["train/epsilon", "1.0", "0"]]
+
+    arrays = np.load(tmp_path / "metrics.npz")
+    np.testing.assert_array_equal(arrays["train/loss/value"], [0.0, 0.5, 1.0])
+    np.testing.assert_array_equal(arrays["train/loss/step"], [0, 1, 2])
@@ -1,6 +1,7 @@
+import numpy as np
 import pytest
 
-from .metrics import MovingAverage, MovingTotal
+from .metrics import MovingAverage, MovingMax, MovingMin, MovingQuantile, MovingTotal
 
 
 @pytest.fixture
@@ -45,3 +46,60 @@ def test_running_avg(setup_running_avg):
 
     rt.push(-1)
     assert pytest.approx(rt.value, 1.0e-6) == 4.5
+
+
+def test_multi_channel_moving_average():
+    ma = MovingAverage(3, channels=2)
+    np.testing.assert_array_equal(ma.value, [0.0, 0.0])
+
+    ma.push(np.array([1.0, 10.0]))
+    ma.push_many([[2.0, 20.0], [3.0, 30.0], [4.0, 40.0]])
+    np.testing.assert_allclose(ma.value, [3.0, 30.0])
+    assert len(ma) == 3
+
+    # Pushing more values than fit into the window only keeps the latest ones
+    ma.push_many(np.arange(20.0).reshape((10, 2)))
+    np.testing.assert_allclose(ma.value, [16.0, 17.0])
+
+
+def test_push_many_matches_push():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(50, 3))
+    single = MovingTotal(7, channels=3, recompute_period=1000)
+    batched = MovingTotal(7, channels=3, recompute_period=1000)
+    for value in values:
+        single.push(value)
+    for start in range(0, 50, 4):
+        batched.push_many(values[start : start + 4])
+    np.testing.assert_allclose(single.value, values[-7:].sum(axis=0))
+    np.testing.assert_allclose(batched.value, values[-7:].sum(axis=0))
+
+
+def test_moving_total_recompute():
+    drifting = MovingTotal(2, recompute_period=1000)
+    mt = MovingTotal(2, recompute_period=5)
+    for value in [1.0e16, 1.0, -1.0e16, 1.0, 1.0]:
+        drifting.push(value)
+        mt.push(value)
+    # The incremental total lost the small values, the exact recomputation restores them
+    assert drifting.value == 0.0
+    assert mt.value == 2.0
+
+
+def test_moving_extrema_and_quantiles():
+    values = np.array([[3.0, -1.0], [1.0, 5.0], [2.0, 0.0], [4.0, 2.0]])
+    mn, mx = MovingMin(3, channels=2), MovingMax(3, channels=2)
+    mq = MovingQuantile(3, q=[0.0, 0.5], channels=2)
+    assert np.all(np.isnan(mn.value))
+    for window in (mn, mx, mq):
+        window.push_many(values)
+    np.testing.assert_array_equal(mn.value, [1.0, 0.0])
+    np.testing.assert_array_equal(mx.value, [4.0, 5.0])
+    np.testing.assert_array_equal(mq.value, [[1.0, 2.0], [0.0, 2.0]])
+
+    scalar = MovingMax(2)
+    scalar.push(1.0)
+    scalar.push(-1.0)
+    assert scalar.value == 1.0
+    scalar.push(-2.0)
+    assert scalar.value == -1.0
@@ -0,0 +1,61 @@
+import pathlib
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+import torch
+
+from .policy import Policy, load_weights
+from .q_network import DQN
+
+
+@pytest.fixture
+def exported(tmp_path):
+    net = DQN(5, 3, width=16)
+    path = tmp_path / "policy.bin"
+    net.export(path)
+    return net, path
+
+
+def test_load_weights(exported):
+    net, path = exported
+    layers = load_weights(path)
+    assert [weight.shape for weight, _ in layers] == [(5, 16), (16, 16), (16, 3)]
+    np.testing.assert_array_equal(layers[0][0], net.model[0].weight.detach().numpy().T)
+    np.testing.assert_array_equal(layers[2][1], net.model[4].bias.detach().numpy())
+
+
+def test_load_weights_bad_file(tmp_path):
+    path = tmp_path / "policy.bin"
+    path.write_bytes(b"not a weight file")
+    with pytest.raises(ValueError):
+        load_weights(path)
+
+
+def test_policy(exported):
+    net, path = exported
+    policy = Policy(path)
+    assert policy.num_states == 5
+    assert policy.num_actions == 3
+
+    states = np.random.default_rng(0).normal(size=(10, 5)).astype(np.float32)
+    with torch.no_grad():
+        expected = net(torch.from_numpy(states)).numpy()
+    np.testing.assert_allclose(policy.q_values(states), expected, rtol=1.0e-5, atol=1.0e-6)
+    np.testing.assert_array_equal(policy(states), expected.argmax(axis=1))
+    assert policy(states[0]) == expected[0].argmax()
+    assert isinstance(policy(states[0]), int)
+
+
+def test_from_state_dict():
+    net = DQN(5, 3, width=16)
+    loaded = DQN.from_state_dict(net.state_dict())
+    x = torch.rand((2, 5))
+    torch.testing.assert_close(loaded(x), net(x))
+
+
+def test_policy_without_torch(exported):
+    _, path = exported
+    script = f"import sys; from agents.policy import Policy; Policy({str(path)!r}); assert 'torch' not in sys.modules"
+    subprocess.run([sys.executable, "-c", script], check=True, cwd=pathlib.Path(__file__).parents[1])
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+import torch
+
+from .q_agent import DQNActor
+
+
+def perturb_policy(agent: DQNActor):
+    with torch.no_grad():
+        for param in agent.policy_net.parameters():
+            param.add_(1.0)
+
+
+def fill_memory(agent: DQNActor, n: int):
+    for i in range(n):
+        state = torch.rand((1, agent.num_states))
+        action = torch.tensor([[i % agent.num_actions]])
+        next_state = torch.rand((1, agent.num_states))
+        reward = torch.tensor([float(i)])
+        agent.push_memory(state, action, next_state, reward)
+
+
+def test_update_target_net():
+    agent = DQNActor(3, 2, tau=0.1)
+    perturb_policy(agent)
+    expected = {
+        key: 0.9 * agent.target_net.state_dict()[key] + 0.1 * val for key, val in agent.policy_net.state_dict().items()
+    }
+    target_params = [param.data_ptr() for param in agent.target_net.parameters()]
+
+    agent.update_target_net()
+
+    for key, val in agent.target_net.state_dict().items():
+        torch.testing.assert_close(val, expected[key])
+    # Update happens in-place
+    assert target_params == [param.data_ptr() for param in agent.target_net.parameters()]
+
+
+def test_target_update_rate():
+    assert pytest.approx(DQNActor(3, 2, tau=0.1).target_update_rate) == 0.1
+    assert pytest.approx(DQNActor(3, 2, tau=0.1, target_update_period=2).target_update_rate) == 0.19
+
+
+def test_target_update_period():
+    agent = DQNActor(3, 2, batch_size=4, target_update_period=2)
+    fill_memory(agent, 8)
+    initial = [param.clone() for param in agent.target_net.parameters()]
+
+    agent.optimize_model()
+    for param, init in zip(agent.target_net.parameters(), initial):
+        torch.testing.assert_close(param, init)
+
+    agent.optimize_model()
+    assert any(not torch.equal(param, init) for param, init in zip(agent.target_net.parameters(), initial))
+
+
+def test_optimize_model_batch():
+    agent = DQNActor(3, 2, batch_size=4, width=8)
+    assert agent.policy_net.model[0].out_features == 8
+    # Nothing to learn from an empty memory, unless a batch is given
+    assert agent.optimize_model() == {}
+    other = DQNActor(3, 2, batch_size=4)
+    fill_memory(other, 4)
+    assert "loss" in agent.optimize_model(other.memory.sample_batch(4))
+    assert agent.learn_count == 1
+
+
+def test_greedy_batch():
+    agent = DQNActor(3, 4)
+    states = torch.rand((5, 3))
+    actions = agent.greedy_batch(states.numpy())
+    assert actions.shape == (5,)
+    for state, action in zip(states, actions):
+        assert agent.greedy(state) == action
+
+
+def test_epsilon_greedy_batch_greedy():
+    agent = DQNActor(3, 4, epsilon_start=0.0, epsilon_end=0.0)
+    states = torch.rand((5, 3))
+    np.testing.assert_array_equal(agent.epsilon_greedy_batch(states), agent.greedy_batch(states))
+
+
+def test_epsilon_greedy_batch_random():
+    agent = DQNActor(3, 4, epsilon_start=1.0, epsilon_end=1.0, seed=0)
+    actions = agent.epsilon_greedy_batch(torch.rand((1000, 3)))
+    assert actions.shape == (1000,)
+    assert set(actions) == {0, 1, 2, 3}
+
+    # Seeded generators reproduce the same actions
+    other = DQNActor(3, 4, epsilon_start=1.0, epsilon_end=1.0, seed=0)
+    np.testing.assert_array_equal(other.epsilon_greedy_batch(torch.rand((1000, 3))), actions)
+
+
+def test_epsilon_greedy_batch_unseeded():
+    # Unseeded agents, e.g. in different processes, explore independently
+    masks = []
+    for _ in range(2):
+        agent = DQNActor(3, 4, epsilon_start=0.5, epsilon_end=0.5)
+        masks.append(torch.rand(1000, generator=agent.generator) < agent.get_epsilon())
+    assert not torch.equal(masks[0], masks[1])
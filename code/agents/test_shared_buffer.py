@@ -0,0 +1,37 @@
+import torch
+
+from .shared_buffer import SharedMemory
+
+
+def push(memory: SharedMemory, values):
+    values = torch.tensor(values, dtype=torch.float32)
+    n = len(values)
+    memory.push_batch(values.reshape((n, 1)), values.long().reshape((n, 1)), values.reshape((n, 1)) + 1, values)
+
+
+def test_push_non_circular():
+    memory = SharedMemory(5, 1)
+    push(memory, [1, 2])
+    assert len(memory) == 2
+    assert memory.capacity == 5
+    torch.testing.assert_close(memory.r[:2], torch.tensor([1.0, 2.0]))
+
+
+def test_push_circular():
+    memory = SharedMemory(5, 1)
+    push(memory, [1, 2, 3, 4])
+    push(memory, [5, 6, 7])
+    assert len(memory) == 5
+    torch.testing.assert_close(memory.r, torch.tensor([6.0, 7.0, 3.0, 4.0, 5.0]))
+
+
+def test_sample_batch():
+    memory = SharedMemory(5, 1)
+    push(memory, [1, 2, 3])
+    batch = memory.sample_batch(10)
+    assert batch.s.shape == (10, 1)
+    assert batch.a.shape == (10, 1)
+    assert batch.s_prime.shape == (10, 1)
+    assert batch.r.shape == (10,)
+    assert set(batch.r.tolist()) <= {1.0, 2.0, 3.0}
+    torch.testing.assert_close(batch.s_prime, batch.s + 1)
@@ -0,0 +1,31 @@
+import numpy as np
+
+from .sparse import densify, to_sparse
+
+
+def test_to_sparse():
+    state = np.array([0.0, 1.5, 0.0, 0.0, -2.0])
+    sparse = to_sparse(state)
+    np.testing.assert_array_equal(sparse.indices, [1, 4])
+    np.testing.assert_array_equal(sparse.values, [1.5, -2.0])
+    assert sparse.size == 5
+    assert sparse.indices.dtype == np.uint16 and sparse.values.dtype == np.float32
+    assert sparse.nbytes == 2 * 2 + 2 * 4
+    assert to_sparse(np.zeros(2**17)).indices.dtype == np.uint32
+    # Lists and (1, n) arrays are flattened
+    np.testing.assert_array_equal(to_sparse([state.tolist()]).indices, [1, 4])
+
+
+def test_densify():
+    rng = np.random.default_rng(0)
+    states = rng.normal(size=(6, 50)) * (rng.random((6, 50)) < 0.1)
+    states[2] = 0.0
+    sparse = [to_sparse(state) for state in states]
+    dense = densify(sparse)
+    assert dense.dtype == np.float32
+    np.testing.assert_allclose(dense, states, rtol=1e-6)
+
+    out = np.full((6, 50), 7.0, dtype=np.float32)
+    assert densify(sparse, out=out) is out
+    np.testing.assert_allclose(out, states, rtol=1e-6)
+    assert densify([]).shape == (0, 0)
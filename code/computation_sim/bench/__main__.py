@@ -0,0 +1,229 @@
+import argparse
+import importlib
+import sys
+
+from .common import make_report, merge_runs, run_isolated, write_report
+
+
+def run_scaling(args) -> dict:
+    from .scaling import run_case
+
+    results = []
+    for num_sensors in args.sensors:
+        for fan_in in args.fan_in:
+            for buffer_size in args.buffer_size:
+                for dt in args.dt:
+                    kwargs = dict(
+                        num_sensors=num_sensors,
+                        fan_in=fan_in,
+                        buffer_size=buffer_size,
+                        dt=dt,
+                        min_steps=args.min_steps,
+                        min_time=args.min_time,
+                        seed=args.seed,
+                    )
+                    result = run_isolated(run_case, **kwargs) if args.isolate else run_case(**kwargs)
+                    print(
+                        f"sensors={num_sensors} fan_in={fan_in} buffer_size={buffer_size} dt={dt}: "
+                        f"{result['steps_per_sec']:.1f} steps/s",
+                        file=sys.stderr,
+                    )
+                    results.append(result)
+    return make_report("scaling", results, min_steps=args.min_steps, min_time=args.min_time, seed=args.seed)
+
+
+def load_alternative(spec: str):
+    """Parses SCENARIO=module:attribute into the scenario name, a label and the imported implementation."""
+    scenario, _, target = spec.partition("=")
+    module, _, attribute = target.partition(":")
+    if not scenario or not module or not attribute:
+        raise argparse.ArgumentTypeError(f"Expected SCENARIO=module:attribute, got {spec!r}.")
+    implementation = importlib.import_module(module)
+    for name in attribute.split("."):
+        implementation = getattr(implementation, name)
+    return scenario, target, implementation
+
+
+def run_nodes(args) -> dict:
+    from .nodes import run_scenario
+
+    alternatives = {}
+    for scenario, label, implementation in args.alternative:
+        alternatives.setdefault(scenario, {})[label] = implementation
+    results = []
+    for name in args.scenarios:
+        for result in run_scenario(name, alternatives.get(name), args.min_time, args.repeat, args.alloc_ops):
+            print(
+                f"{name} [{result['implementation']}]: {result['ns_per_op']:.0f} ns/op, "
+                f"{result['alloc_peak_bytes_per_op']:.0f} B/op",
+                file=sys.stderr,
+            )
+            results.append(result)
+    return make_report("nodes", results, min_time=args.min_time, repeat=args.repeat, alloc_ops=args.alloc_ops)
+
+
+def run_learning(args) -> dict:
+    from .learning import run_session
+
+    results = []
+    for batch_size in args.batch_size:
+        for memory_size in args.memory_size:
+            for width in args.width:
+                kwargs = dict(
+                    num_steps=args.steps,
+                    batch_size=batch_size,
+                    memory_size=memory_size,
+                    width=width,
+                    fan_in=args.fan_in,
+                    dt=args.dt,
+                    num_threads=args.threads,
+                    device=args.device,
+                    seed=args.seed,
+                )
+                result = run_isolated(run_session, **kwargs) if args.isolate else run_session(**kwargs)
+                print(
+                    f"batch_size={batch_size} memory_size={memory_size} width={width}: "
+                    f"{result['env_steps_per_sec']:.1f} env steps/s, "
+                    f"{result['gradient_steps_per_sec']:.1f} gradient steps/s",
+                    file=sys.stderr,
+                )
+                results.append(result)
+    return make_report("learning", results, num_steps=args.steps, seed=args.seed)
+
+
+def run_compare(args) -> int:
+    from .store import (
+        ResultStore,
+        compare,
+        current_commit,
+        format_comparison,
+        latest_baseline,
+        machine_fingerprint,
+    )
+
+    store = ResultStore(args.store)
+    fingerprint = args.fingerprint or machine_fingerprint()
+    candidate = args.candidate or current_commit()
+    baseline = args.baseline or latest_baseline(store, args.benchmark, fingerprint, candidate)
+    if baseline is None:
+        print(f"No baseline of {args.benchmark} stored for machine {fingerprint}.", file=sys.stderr)
+        return 2
+    reports = [store.load(args.benchmark, fingerprint, commit) for commit in (baseline, candidate)]
+    for commit, commit_reports in zip((baseline, candidate), reports):
+        if not commit_reports:
+            print(f"No results of {args.benchmark} stored for {commit} on machine {fingerprint}.", file=sys.stderr)
+            return 2
+    rows = compare(args.benchmark, *reports, confidence=args.confidence, threshold=args.threshold)
+    print(f"{args.benchmark}: {baseline} -> {candidate} on machine {fingerprint}")
+    print(format_comparison(rows))
+    if args.output:
+        write_report(dict(benchmark=args.benchmark, baseline=baseline, candidate=candidate, rows=rows), args.output)
+    return 1 if any(row["verdict"] == "regression" for row in rows) else 0
+
+
+def make_parser() -> argparse.ArgumentParser:
+    from .nodes import SCENARIOS
+    from .scaling import DEFAULT_SENSOR_COUNTS
+    from .store import CASE_FIELDS, DEFAULT_STORE, STORE_ENV
+
+    parser = argparse.ArgumentParser(prog="python -m computation_sim.bench", description="Simulator benchmarks.")
+    commands = parser.add_subparsers(dest="command")
+
+    # Options of all benchmarks
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--runs", type=int, default=1, help="Number of repeated runs, for comparisons.")
+    common.add_argument(
+        "--store",
+        nargs="?",
+        const="",
+        help=f"Save the results in a results store (default: ${STORE_ENV} or {DEFAULT_STORE}).",
+    )
+    common.add_argument("--commit", help="Commit to store the results under (default: the checked out commit).")
+
+    scaling = commands.add_parser(
+        "scaling", parents=[common], help="Step throughput, memory and build time versus system size."
+    )
+    scaling.add_argument("--sensors", type=int, nargs="+", default=list(DEFAULT_SENSOR_COUNTS))
+    scaling.add_argument("--fan-in", type=int, nargs="+", default=[8])
+    scaling.add_argument("--buffer-size", type=int, nargs="+", default=[1])
+    scaling.add_argument("--dt", type=int, nargs="+", default=[10])
+    scaling.add_argument("--min-steps", type=int, default=20)
+    scaling.add_argument("--min-time", type=float, default=1.0, help="Minimum stepping time per case in seconds.")
+    scaling.add_argument("--seed", type=int, default=0)
+    scaling.add_argument("--no-isolate", dest="isolate", action="store_false", help="Run all cases in this process.")
+    scaling.add_argument("--output", "-o", help="JSON file for the results (default: stdout).")
+    scaling.set_defaults(run=run_scaling)
+
+    nodes = commands.add_parser(
+        "nodes", parents=[common], help="Time and allocations per operation of the node classes."
+    )
+    nodes.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    nodes.add_argument(
+        "--alternative",
+        type=load_alternative,
+        action="append",
+        default=[],
+        metavar="SCENARIO=MODULE:ATTR",
+        help="Implementation to compare against the reference of a scenario; can be repeated.",
+    )
+    nodes.add_argument(
+        "--min-time", type=float, default=0.2, help="Minimum timing time per implementation in seconds."
+    )
+    nodes.add_argument("--repeat", type=int, default=5)
+    nodes.add_argument("--alloc-ops", type=int, default=1000, help="Number of operations traced for allocations.")
+    nodes.add_argument("--output", "-o", help="JSON file for the results (default: stdout).")
+    nodes.set_defaults(run=run_nodes)
+
+    learning = commands.add_parser(
+        "learning", parents=[common], help="DQN training throughput, split into simulator, inference, replay, learner."
+    )
+    learning.add_argument("--steps", type=int, default=2000, help="Environment steps of the training session.")
+    learning.add_argument("--batch-size", type=int, nargs="+", default=[128])
+    learning.add_argument("--memory-size", type=int, nargs="+", default=[60_000])
+    learning.add_argument("--width", type=int, nargs="+", default=[64], help="Width of the Q-network layers.")
+    learning.add_argument("--fan-in", type=int, default=2)
+    learning.add_argument("--dt", type=int, default=10)
+    learning.add_argument("--threads", type=int, help="Number of torch threads (default: torch's default).")
+    learning.add_argument("--device", default="cpu")
+    learning.add_argument("--seed", type=int, default=0)
+    learning.add_argument("--no-isolate", dest="isolate", action="store_false", help="Run all cases in this process.")
+    learning.add_argument("--output", "-o", help="JSON file for the results (default: stdout).")
+    learning.set_defaults(run=run_learning)
+
+    compare = commands.add_parser(
+        "compare", help="Compare stored results of two commits; exits with 1 if a metric regressed significantly."
+    )
+    compare.add_argument("benchmark", choices=list(CASE_FIELDS))
+    compare.add_argument("--baseline", help="Baseline commit (default: the most recently stored other commit).")
+    compare.add_argument("--candidate", help="Candidate commit (default: the checked out commit).")
+    compare.add_argument("--store", help=f"Results store (default: ${STORE_ENV} or {DEFAULT_STORE}).")
+    compare.add_argument("--fingerprint", help="Machine fingerprint (default: this machine).")
+    compare.add_argument("--confidence", type=float, default=0.95)
+    compare.add_argument(
+        "--threshold", type=float, default=0.02, help="Relative changes within the threshold are not flagged."
+    )
+    compare.add_argument("--output", "-o", help="JSON file for the comparison.")
+    compare.set_defaults(run=run_compare)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = make_parser()
+    argv = sys.argv[1:] if argv is None else argv
+    # Without a command, the scaling benchmark runs with its defaults
+    args = parser.parse_args(argv if argv else ["scaling"])
+    if args.command == "compare":
+        return args.run(args)
+
+    report = merge_runs([args.run(args) for _ in range(args.runs)])
+    write_report(report, args.output)
+    if args.store is not None:
+        from .store import ResultStore
+
+        path = ResultStore(args.store or None).save(report, args.commit)
+        print(f"Saved results to {path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+import json
+import os
+import pathlib
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Callable
+
+
+def machine_info() -> dict:
+    """Describes the machine and interpreter. Results are compared between machines with equal fingerprints, see
+    `store.machine_fingerprint`; the other fields are informational.
+    """
+    import numpy as np
+
+    return dict(
+        hostname=platform.node(),
+        platform=platform.platform(),
+        processor=platform.processor() or platform.machine(),
+        cpu_count=os.cpu_count(),
+        python=platform.python_version(),
+        numpy=np.__version__,
+    )
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of the current process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_isolated(function: Callable, *args, **kwargs):
+    """Runs function(*args, **kwargs) in a fresh process, such that its peak RSS is not inflated by earlier runs."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(function, *args, **kwargs).result()
+
+
+def make_report(benchmark: str, results: list, **config) -> dict:
+    return dict(benchmark=benchmark, timestamp=time.time(), machine=machine_info(), config=config, results=results)
+
+
+def merge_runs(reports: list) -> dict:
+    """Merges repeated runs of a benchmark into one report, whose results are tagged with the run index."""
+    results = [dict(result, run=run) for run, report in enumerate(reports) for result in report["results"]]
+    return dict(reports[0], config=dict(reports[0]["config"], runs=len(reports)), results=results)
+
+
+def write_report(report: dict, path: pathlib.Path = None) -> None:
+    """Writes the report as JSON into a file, or to stdout if no path is given."""
+    text = json.dumps(report, indent=2)
+    if path is None:
+        print(text)
+    else:
+        pathlib.Path(path).write_text(text + "\n")
@@ -0,0 +1,127 @@
+import random
+import time
+
+# Packed actions of HierarchicalSystem support at most 8 action dimensions
+MAX_ACTION_DIMS = 8
+
+
+def make_env(fan_in: int = 2, dt: int = 10, seed: int = 0):
+    """HierarchicalSystem with the layout and distributions of the three stage system's `SystemConfig`: one level of
+    edge computes with `fan_in` sensors each, `fan_in` edge computes and the output compute.
+    """
+    from computation_sim.nodes import ConstantNormalizer
+    from environments.hierarchical import HierarchicalSystem, Reward
+    from environments.hierarchical.generator import TopologyGenerator, fixed, gaussian
+
+    generator = TopologyGenerator(
+        depth=1,
+        fan_in=fan_in,
+        sensor_period=fixed(100),
+        sensor_jitter=gaussian(0.0, 1.0, 1.0, 100.0),
+        filter_threshold=90.0,
+    )
+    builder = generator.generate(seed, ConstantNormalizer(100.0), ConstantNormalizer(1.0), ConstantNormalizer(1.0))
+    num_action_dims = builder.system_collection.system.num_action
+    if num_action_dims > MAX_ACTION_DIMS:
+        raise ValueError(f"A fan-in of {fan_in} gives {num_action_dims} action dimensions; at most 8 are supported.")
+    reward = Reward(1.0, 0.1 / 100.0, 0.01)
+    return HierarchicalSystem(builder.clock, builder.system_collection, reward, dt)
+
+
+def run_session(
+    num_steps: int = 2000,
+    batch_size: int = 128,
+    memory_size: int = 60_000,
+    width: int = 64,
+    fan_in: int = 2,
+    dt: int = 10,
+    num_threads: int = None,
+    device: str = "cpu",
+    seed: int = 0,
+) -> dict:
+    """Runs a DQN training session of `num_steps` environment steps, with one learning update per step once the
+    memory holds a batch.
+
+    The wall time is split into the simulator (`env.step`), policy inference (epsilon-greedy action selection), replay
+    (pushing transitions and sampling batches) and the learner (`optimize_model` on a sampled batch).
+    """
+    import torch
+    from agents.q_agent import DQNActor
+
+    if num_threads is not None:
+        torch.set_num_threads(num_threads)
+    torch.manual_seed(seed)
+    random.seed(seed)
+
+    def synchronize():
+        if device.startswith("cuda"):
+            torch.cuda.synchronize()
+
+    env = make_env(fan_in, dt, seed)
+    agent = DQNActor(
+        env.observation_space.shape[0],
+        int(env.action_space.n),
+        batch_size=batch_size,
+        memory_size=memory_size,
+        width=width,
+        device=device,
+        seed=seed,
+    )
+    state, _ = env.reset(seed=seed)
+    state = torch.tensor(state, dtype=torch.float32, device=device).unsqueeze(0)
+
+    times = dict(sim=0.0, inference=0.0, replay=0.0, learner=0.0)
+    num_updates = 0
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        t0 = time.perf_counter()
+        action = agent.epsilon_greedy(state)
+        t1 = time.perf_counter()
+        next_state, reward, _, _, _ = env.step(action)
+        t2 = time.perf_counter()
+        next_state = torch.tensor(next_state, dtype=torch.float32, device=device).unsqueeze(0)
+        agent.push_memory(
+            state,
+            torch.tensor([[action]], device=device),
+            next_state,
+            torch.tensor([reward], dtype=torch.float32, device=device),
+        )
+        state = next_state
+        t3 = time.perf_counter()
+        times["inference"] += t1 - t0
+        times["sim"] += t2 - t1
+        times["replay"] += t3 - t2
+
+        if len(agent.memory) >= batch_size:
+            t0 = time.perf_counter()
+            batch = agent.memory.sample_batch(batch_size)
+            t1 = time.perf_counter()
+            agent.optimize_model(batch)
+            synchronize()
+            t2 = time.perf_counter()
+            times["replay"] += t1 - t0
+            times["learner"] += t2 - t1
+            num_updates += 1
+    total_time = time.perf_counter() - start
+
+    return dict(
+        num_steps=num_steps,
+        batch_size=batch_size,
+        memory_size=memory_size,
+        width=width,
+        fan_in=fan_in,
+        dt=dt,
+        device=device,
+        num_threads=torch.get_num_threads(),
+        num_states=agent.num_states,
+        num_actions=agent.num_actions,
+        num_updates=num_updates,
+        total_time_s=total_time,
+        **{f"{name}_time_s": value for name, value in times.items()},
+        env_steps_per_sec=num_steps / total_time,
+        gradient_steps_per_sec=num_updates / times["learner"] if num_updates else 0.0,
+        sim_us_per_step=1e6 * times["sim"] / num_steps,
+        inference_us_per_step=1e6 * times["inference"] / num_steps,
+        replay_us_per_step=1e6 * times["replay"] / num_steps,
+        learner_us_per_update=1e6 * times["learner"] / num_updates if num_updates else 0.0,
+    )
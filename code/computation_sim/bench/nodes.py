@@ -0,0 +1,261 @@
+import gc
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from computation_sim.basic_types import Header, Message
+from computation_sim.nodes import (
+    ConstantNormalizer,
+    FilteringMISONode,
+    Node,
+    OutputNode,
+    PeriodicEpochSensor,
+    RingBufferNode,
+    SourceNode,
+    header_to_state,
+)
+from computation_sim.time import Clock, FixedDuration
+
+# One operation of a scenario; returns what the operation produced, to check alternatives against the reference
+Operation = Callable[[], object]
+
+
+class NullNode(Node):
+    """Output that only counts the messages it receives, such that only the node under test is measured."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.num_received = 0
+
+    def receive(self, message: Message) -> None:
+        self.num_received += 1
+
+    def generate_state(self):
+        yield from []
+
+    def update(self):
+        pass
+
+    def trigger(self):
+        pass
+
+    def reset(self):
+        pass
+
+
+def _message(t_oldest: int, t_youngest: int, num_measurements: int = 1) -> Message:
+    return Message(Header(t_oldest, t_youngest, (t_oldest + t_youngest) // 2, num_measurements))
+
+
+def ring_buffer_cycle(implementation=RingBufferNode) -> Operation:
+    """Buffer of two elements with overflow output: two messages are received (one overflows), the state is
+    generated and the buffer is triggered.
+    """
+    clock = Clock(1000)
+    node = implementation(clock.as_readonly(), "buffer", max_num_elements=2)
+    node.set_output(NullNode(clock.as_readonly()))
+    node.set_overflow_output(NullNode(clock.as_readonly()))
+    messages = [_message(900, 950), _message(960, 990)]
+
+    def op():
+        for message in messages:
+            node.receive(message)
+        state = node.state
+        node.trigger()
+        return state
+
+    return op
+
+
+def filtering_miso_cycle(implementation=FilteringMISONode) -> Operation:
+    """Compute node with three inputs, one of which is filtered: the inputs are received, the node is triggered,
+    the clock advances past the compute duration and the node is updated, which sends the result.
+    """
+    clock = Clock(1000)
+    node = implementation(clock.as_readonly(), FixedDuration(5), "compute", filter_threshold=50)
+    node.set_output_pass(NullNode(clock.as_readonly()))
+    node.set_output_fail(NullNode(clock.as_readonly()))
+    messages = [_message(900, 950, 2), _message(960, 990, 3), _message(800, 850)]
+
+    def op():
+        for message in messages:
+            node.receive(message)
+        node.trigger()
+        state = node.state
+        clock.advance(10)
+        node.update()
+        return state
+
+    return op
+
+
+def source_cycle(implementation=SourceNode) -> Operation:
+    """Source with a periodic sensor and two outputs: the clock advances by one sensor period, the source is updated,
+    which sends a measurement to both outputs, and the state is generated.
+    """
+    clock = Clock(0)
+    # Send times between clock ticks; the sensor does not advance past a send time equal to the current time
+    node = implementation(clock.as_readonly(), PeriodicEpochSensor(5, 10, FixedDuration(0)), "source")
+    outputs = [NullNode(clock.as_readonly(), "a"), NullNode(clock.as_readonly(), "b")]
+    for output in outputs:
+        node.add_output(output)
+
+    def op():
+        clock.advance(10)
+        node.update()
+        # The sensor has no state, so the measurements received by the outputs are the result
+        return node.state + [output.num_received for output in outputs]
+
+    return op
+
+
+def output_cycle(implementation=OutputNode) -> Operation:
+    """Output node: a message is received and the state is generated."""
+    clock = Clock(1000)
+    node = implementation(clock.as_readonly(), "output")
+    message = _message(900, 950, 4)
+
+    def op():
+        node.receive(message)
+        return node.state
+
+    return op
+
+
+def header_to_state_cycle(implementation=header_to_state) -> Operation:
+    """Conversion of one header into state variables, with normalizers."""
+    header = _message(900, 950, 4).header
+    now = Clock(1000).get_time()
+    age_normalizer = ConstantNormalizer(100.0)
+    count_normalizer = ConstantNormalizer(10.0)
+
+    def op():
+        return implementation(header, now, age_normalizer, count_normalizer)
+
+    return op
+
+
+# Scenario name -> function that creates an operation for an implementation; the default is the reference
+SCENARIOS: Dict[str, Callable[..., Operation]] = {
+    "RingBufferNode": ring_buffer_cycle,
+    "FilteringMISONode": filtering_miso_cycle,
+    "SourceNode": source_cycle,
+    "OutputNode": output_cycle,
+    "header_to_state": header_to_state_cycle,
+}
+
+
+def time_operation(op: Operation, min_time: float = 0.2, repeat: int = 5) -> List[float]:
+    """Seconds per operation of `repeat` runs, each of at least `min_time / repeat` seconds.
+
+    As with timeit, garbage collection is disabled while timing.
+    """
+    target = min_time / repeat
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        num_ops = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(num_ops):
+                op()
+            elapsed = time.perf_counter() - start
+            if elapsed >= target or num_ops >= 2**24:
+                break
+            num_ops *= 2
+        times = [elapsed / num_ops]
+        for _ in range(repeat - 1):
+            start = time.perf_counter()
+            for _ in range(num_ops):
+                op()
+            times.append((time.perf_counter() - start) / num_ops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return times
+
+
+def trace_allocations(op: Operation, num_ops: int = 1000) -> dict:
+    """Traces `num_ops` operations with tracemalloc.
+
+    tracemalloc cannot count blocks that are freed again, so the transient allocations of an operation are reported as
+    the peak of traced memory above the level before the operation. Memory and blocks that are still allocated after
+    all operations are reported as retained.
+    """
+    op()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        peaks = []
+        for _ in range(num_ops):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            op()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    # Only allocations of the operation, not those of the tracing in this function
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    differences = after.filter_traces(filters).compare_to(before.filter_traces(filters), "filename")
+    return dict(
+        alloc_peak_bytes_per_op=float(np.mean(peaks)),
+        retained_bytes_per_op=sum(d.size_diff for d in differences) / num_ops,
+        retained_blocks_per_op=sum(d.count_diff for d in differences) / num_ops,
+    )
+
+
+def outputs_match(reference: Operation, alternative: Operation, num_ops: int = 100) -> bool:
+    """Whether two fresh operations produce equal outputs over `num_ops` operations."""
+    for _ in range(num_ops):
+        if not np.array_equal(np.asarray(reference(), dtype=float), np.asarray(alternative(), dtype=float)):
+            return False
+    return True
+
+
+def run_scenario(
+    name: str,
+    alternatives: Optional[Dict[str, object]] = None,
+    min_time: float = 0.2,
+    repeat: int = 5,
+    alloc_ops: int = 1000,
+) -> List[dict]:
+    """Measures the reference implementation of a scenario and the given alternatives (label -> implementation).
+
+    Every implementation is measured on a fresh operation. Alternatives report their time relative to the reference
+    and whether their outputs match those of the reference.
+    """
+    setup = SCENARIOS[name]
+    implementations = dict(reference=None, **(alternatives or {}))
+    results = []
+    for label, implementation in implementations.items():
+        make_op = setup if implementation is None else lambda: setup(implementation)
+        times = time_operation(make_op(), min_time, repeat)
+        result = dict(
+            scenario=name,
+            implementation=label,
+            ns_per_op=min(times) * 1e9,
+            ns_per_op_median=float(np.median(times)) * 1e9,
+            **trace_allocations(make_op(), alloc_ops),
+        )
+        if implementation is not None:
+            result["relative_time"] = result["ns_per_op"] / results[0]["ns_per_op"]
+            result["matches_reference"] = outputs_match(setup(), make_op())
+        results.append(result)
+    return results
+
+
+def run_scenarios(
+    names: Iterable[str] = None,
+    alternatives: Optional[Dict[str, Dict[str, object]]] = None,
+    min_time: float = 0.2,
+    repeat: int = 5,
+    alloc_ops: int = 1000,
+) -> List[dict]:
+    """Runs the given scenarios (default: all), with alternatives given per scenario name."""
+    alternatives = alternatives or {}
+    results = []
+    for name in names or SCENARIOS:
+        results.extend(run_scenario(name, alternatives.get(name), min_time, repeat, alloc_ops))
+    return results
@@ -0,0 +1,139 @@
+import gc
+import time
+import tracemalloc
+from typing import Tuple
+
+import numpy as np
+from computation_sim.time import Clock
+
+from .common import peak_rss_bytes
+
+DEFAULT_SENSOR_COUNTS = (4, 16, 64, 256, 1024, 4096, 10000)
+
+
+def build_topology(num_sensors: int, fan_in: int = 8, buffer_size: int = 1, seed: int = 0):
+    """Generates a hierarchy with `num_sensors` sensors, a fixed fan-in and as few edge compute levels as possible.
+    The sensors are spread evenly over the edge computes (see `TopologyGenerator`). Returns the clock and the system
+    collection.
+    """
+    from environments.hierarchical.generator import (
+        TopologyGenerator,
+        gamma,
+        gaussian,
+        uniform,
+    )
+
+    depth = 1
+    while fan_in ** (depth + 1) < num_sensors:
+        depth += 1
+    generator = TopologyGenerator(
+        depth=depth,
+        fan_in=fan_in,
+        sensor_period=uniform(50, 150),
+        sensor_jitter=gaussian(0.0, 1.0),
+        sensor_compute=gamma(5.0, 1.0, 3.0, 30.0),
+        edge_compute=gamma(3.0, 1.0, 1.0, 30.0),
+        output_compute=gamma(9.0, 1.0, 3.0, 30.0),
+        buffer_size=buffer_size,
+        max_sensors=num_sensors,
+    )
+    builder = generator.generate(seed)
+    return builder.clock, builder.system_collection
+
+
+class Simulation(object):
+    """Steps a system in the same way as `HierarchicalSystem.step`.
+
+    The gym environment itself is not used, because its packed action space is limited to 8 actions.
+    """
+
+    def __init__(self, clock: Clock, system_collection, dt: int = 10, seed: int = 0):
+        self.clock = clock
+        self.system_collection = system_collection
+        self.system = system_collection.system
+        self.dt = dt
+        self.rng = np.random.default_rng(seed)
+
+    def step(self, action: np.ndarray) -> Tuple[np.ndarray, dict]:
+        from environments.hierarchical import InformationLossObserver
+
+        for sink in self.system_collection.sinks:
+            sink.reset()
+        observer = InformationLossObserver(self.system_collection)
+        self.system.act(action)
+        self.clock += self.dt
+        self.system.update()
+        info = dict(
+            buffer_overrides=observer.buffer_overrides,
+            missing_inputs=observer.missing_inputs,
+            missing_measurements=observer.missing_measurements,
+        )
+        return np.array(self.system.state).flatten(), info
+
+    def random_actions(self, num_steps: int) -> np.ndarray:
+        return self.rng.integers(0, 2, size=(num_steps, self.system.num_action))
+
+
+def run_case(
+    num_sensors: int,
+    fan_in: int = 8,
+    buffer_size: int = 1,
+    dt: int = 10,
+    min_steps: int = 20,
+    min_time: float = 1.0,
+    alloc_steps: int = 10,
+    seed: int = 0,
+) -> dict:
+    """Measures one topology.
+
+    Reports the build time; the step throughput of at least `min_steps` steps and `min_time` seconds; the transient
+    (`alloc_peak_bytes_per_step`) and retained memory per step, traced with tracemalloc over `alloc_steps` separate
+    steps; the rate of generation 0 garbage collections while stepping, as measure of the object allocation rate;
+    and the peak RSS of the process.
+    """
+    start = time.perf_counter()
+    clock, system_collection = build_topology(num_sensors, fan_in, buffer_size, seed)
+    simulation = Simulation(clock, system_collection, dt, seed)
+    state, _ = simulation.step(np.zeros(simulation.system.num_action, dtype=int))
+    build_time = time.perf_counter() - start
+
+    # Throughput
+    actions = simulation.random_actions(min_steps)
+    gen0_collections = gc.get_stats()[0]["collections"]
+    num_steps = 0
+    start = time.perf_counter()
+    while num_steps < min_steps or time.perf_counter() - start < min_time:
+        simulation.step(actions[num_steps % min_steps])
+        num_steps += 1
+    step_time = time.perf_counter() - start
+    gen0_collections = gc.get_stats()[0]["collections"] - gen0_collections
+
+    # Allocations
+    tracemalloc.start()
+    peaks = []
+    current_start, _ = tracemalloc.get_traced_memory()
+    for action in simulation.random_actions(alloc_steps):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        simulation.step(action)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    current_end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return dict(
+        num_sensors=num_sensors,
+        fan_in=fan_in,
+        buffer_size=buffer_size,
+        dt=dt,
+        num_nodes=simulation.system.num_nodes,
+        num_actions=simulation.system.num_action,
+        state_size=len(state),
+        build_time_s=build_time,
+        num_steps=num_steps,
+        step_time_s=step_time,
+        steps_per_sec=num_steps / step_time,
+        gc_collections_per_sec=gen0_collections / step_time,
+        alloc_peak_bytes_per_step=float(np.mean(peaks)),
+        retained_bytes_per_step=(current_end - current_start) / alloc_steps,
+        peak_rss_bytes=peak_rss_bytes(),
+    )
@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import pathlib
+import subprocess
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .common import machine_info
+
+# Directory of the results store, unless given explicitly
+STORE_ENV = "COMPUTATION_SIM_BENCH_STORE"
+DEFAULT_STORE = ".benchmarks"
+
+HIGHER_IS_BETTER = 1
+LOWER_IS_BETTER = -1
+
+# Benchmark -> fields that identify a case within a report
+CASE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "scaling": ("num_sensors", "fan_in", "buffer_size", "dt"),
+    "nodes": ("scenario", "implementation"),
+    "learning": ("batch_size", "memory_size", "width", "fan_in", "dt", "device", "num_threads"),
+}
+
+# Benchmark -> compared metrics and their direction
+METRICS: Dict[str, Dict[str, int]] = {
+    "scaling": dict(
+        steps_per_sec=HIGHER_IS_BETTER,
+        build_time_s=LOWER_IS_BETTER,
+        alloc_peak_bytes_per_step=LOWER_IS_BETTER,
+    ),
+    "nodes": dict(
+        ns_per_op=LOWER_IS_BETTER,
+        alloc_peak_bytes_per_op=LOWER_IS_BETTER,
+    ),
+    "learning": dict(
+        env_steps_per_sec=HIGHER_IS_BETTER,
+        gradient_steps_per_sec=HIGHER_IS_BETTER,
+        sim_us_per_step=LOWER_IS_BETTER,
+        inference_us_per_step=LOWER_IS_BETTER,
+        replay_us_per_step=LOWER_IS_BETTER,
+        learner_us_per_update=LOWER_IS_BETTER,
+    ),
+}
+
+
+# Fields of the machine description that identify a machine. Host names, kernel versions and package versions are
+# informational only, since they change between CI runs and containers of the same hardware.
+FINGERPRINT_FIELDS = ("processor", "cpu_count", "python")
+
+
+def machine_fingerprint(machine: dict = None, fields: Sequence[str] = FINGERPRINT_FIELDS) -> str:
+    """Short hash of the given fields of the machine description; results are only compared between equal
+    fingerprints. Python versions only count up to the minor version.
+    """
+    machine = machine_info() if machine is None else machine
+    identity = {field: machine.get(field) for field in fields}
+    if identity.get("python"):
+        identity["python"] = ".".join(identity["python"].split(".")[:2])
+    return hashlib.sha1(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def current_commit(path: pathlib.Path = None) -> str:
+    """Short hash of the checked out commit, with a "-dirty" suffix if there are uncommitted changes."""
+    try:
+        result = subprocess.run(
+            ["git", "describe", "--always", "--dirty", "--abbrev=12", "--exclude=*"],
+            cwd=path or pathlib.Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return result.stdout.strip()
+
+
+def default_store_directory() -> pathlib.Path:
+    return pathlib.Path(os.environ.get(STORE_ENV, DEFAULT_STORE))
+
+
+class ResultStore(object):
+    """Benchmark reports as JSON files under `directory`/benchmark/fingerprint/commit.json.
+
+    Every file holds the list of all reports that were saved for the key, such that repeated runs add samples.
+    """
+
+    def __init__(self, directory: pathlib.Path = None):
+        self.directory = pathlib.Path(directory) if directory is not None else default_store_directory()
+
+    def _path(self, benchmark: str, fingerprint: str, commit: str) -> pathlib.Path:
+        return self.directory / benchmark / fingerprint / f"{commit}.json"
+
+    def save(self, report: dict, commit: str = None) -> pathlib.Path:
+        """Adds a report, under the current commit by default. Returns the path of the file."""
+        commit = current_commit() if commit is None else commit
+        path = self._path(report["benchmark"], machine_fingerprint(report["machine"]), commit)
+        reports = self.load(report["benchmark"], machine_fingerprint(report["machine"]), commit)
+        reports.append(dict(report, commit=commit, saved=time.time()))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write and rename, such that an interrupted save does not lose earlier reports
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(reports, indent=2) + "\n")
+        temporary.replace(path)
+        return path
+
+    def load(self, benchmark: str, fingerprint: str, commit: str) -> List[dict]:
+        path = self._path(benchmark, fingerprint, commit)
+        return json.loads(path.read_text()) if path.exists() else []
+
+    def commits(self, benchmark: str, fingerprint: str) -> List[str]:
+        """Stored commits of a benchmark on a machine, from the oldest to the most recently saved."""
+        directory = self.directory / benchmark / fingerprint
+        if not directory.is_dir():
+            return []
+        last_saved = {
+            path.stem: max(r["saved"] for r in json.loads(path.read_text())) for path in directory.glob("*.json")
+        }
+        return sorted(last_saved, key=last_saved.get)
+
+
+def case_samples(reports: Sequence[dict], benchmark: str) -> Dict[tuple, Dict[str, List[float]]]:
+    """Collects the metrics of all runs in `reports`: case -> metric -> samples."""
+    fields = CASE_FIELDS[benchmark]
+    samples = {}
+    for report in reports:
+        for result in report["results"]:
+            case = tuple(result.get(field) for field in fields)
+            metrics = samples.setdefault(case, {})
+            for metric in METRICS[benchmark]:
+                if metric in result:
+                    metrics.setdefault(metric, []).append(float(result[metric]))
+    return samples
+
+
+def relative_change_interval(
+    baseline: Sequence[float], candidate: Sequence[float], confidence: float = 0.95, num_resamples: int = 10000, seed=0
+) -> Tuple[float, float, float]:
+    """Relative change of the mean from baseline to candidate, with a bootstrap confidence interval.
+
+    Returns (estimate, low, high). With a single sample on either side, the interval is unbounded.
+    """
+    baseline, candidate = np.asarray(baseline, dtype=float), np.asarray(candidate, dtype=float)
+    estimate = float(candidate.mean() / baseline.mean() - 1.0)
+    if len(baseline) < 2 or len(candidate) < 2:
+        return estimate, -np.inf, np.inf
+    rng = np.random.default_rng(seed)
+    baseline_means = rng.choice(baseline, size=(num_resamples, len(baseline))).mean(axis=1)
+    candidate_means = rng.choice(candidate, size=(num_resamples, len(candidate))).mean(axis=1)
+    changes = candidate_means / baseline_means - 1.0
+    alpha = 1.0 - confidence
+    low, high = np.quantile(changes, [alpha / 2, 1.0 - alpha / 2])
+    return estimate, float(low), float(high)
+
+
+def compare(
+    benchmark: str,
+    baseline: Sequence[dict],
+    candidate: Sequence[dict],
+    confidence: float = 0.95,
+    threshold: float = 0.02,
+) -> List[dict]:
+    """Compares the metrics of all cases that both sets of reports have.
+
+    A metric is a regression if its whole confidence interval is worse than the baseline by more than `threshold`
+    (relative), and an improvement if it is better by more than `threshold`. Both need at least two runs on each side.
+    """
+    baseline_samples = case_samples(baseline, benchmark)
+    candidate_samples = case_samples(candidate, benchmark)
+    rows = []
+    for case, metrics in baseline_samples.items():
+        for metric, baseline_values in metrics.items():
+            candidate_values = candidate_samples.get(case, {}).get(metric)
+            if not candidate_values:
+                continue
+            estimate, low, high = relative_change_interval(baseline_values, candidate_values, confidence)
+            # Positive changes are improvements
+            direction = METRICS[benchmark][metric]
+            worst, best = sorted((direction * low, direction * high))
+            if best < -threshold:
+                verdict = "regression"
+            elif worst > threshold:
+                verdict = "improvement"
+            else:
+                verdict = "unchanged"
+            rows.append(
+                dict(
+                    case=dict(zip(CASE_FIELDS[benchmark], case)),
+                    metric=metric,
+                    baseline_mean=float(np.mean(baseline_values)),
+                    candidate_mean=float(np.mean(candidate_values)),
+                    num_baseline=len(baseline_values),
+                    num_candidate=len(candidate_values),
+                    change=estimate,
+                    change_low=low,
+                    change_high=high,
+                    verdict=verdict,
+                )
+            )
+    return rows
+
+
+def format_comparison(rows: Sequence[dict]) -> str:
+    lines = []
+    for row in rows:
+        case = " ".join(f"{key}={value}" for key, value in row["case"].items())
+        lines.append(
+            f"{row['verdict']:>11}  {row['metric']:<26} {row['change']:+8.1%} "
+            f"[{row['change_low']:+.1%}, {row['change_high']:+.1%}]  "
+            f"n={row['num_baseline']}/{row['num_candidate']}  {case}"
+        )
+    return "\n".join(lines)
+
+
+def latest_baseline(store: ResultStore, benchmark: str, fingerprint: str, candidate: str) -> Optional[str]:
+    """The most recently saved commit other than the candidate."""
+    commits = [commit for commit in store.commits(benchmark, fingerprint) if commit != candidate]
+    return commits[-1] if commits else None
@@ -59,12 +59,13 @@ class FilteringMISONode(Node):
         yield self._count_normalizer.normalize(float(self._total_measurement_count))
 
     @property
-    def draw_options(self) -> dict:
-        return dict(
-            color="darkred" if self.is_busy else "darkgreen",
-            symbol="square",
-            hovertext=f"is_busy = {self._is_busy}<br>t_start_age = {self.state[1]}<br>input_count = {self.state[2]}<br>total_measurement_count = {self.state[3]}",
-        )
+    def draw_style(self) -> dict:
+        return dict(color="darkred" if self.is_busy else "darkgreen", symbol="square")
+
+    @property
+    def hovertext(self) -> str:
+        state = self.state
+        return f"is_busy = {self._is_busy}<br>t_start_age = {state[1]}<br>input_count = {state[2]}<br>total_measurement_count = {state[3]}"
 
     def update(self):
         if not self.is_busy:
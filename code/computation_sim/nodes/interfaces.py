@@ -45,9 +45,18 @@ class Node(ABC):
         pass
 
     @property
-    def draw_options(self) -> dict:
+    def draw_style(self) -> dict:
+        """Color and symbol of the node. Drawers query this on every update, so it has to be cheap."""
         return {}
 
+    @property
+    def hovertext(self) -> str:
+        return ""
+
+    @property
+    def draw_options(self) -> dict:
+        return dict(self.draw_style, hovertext=self.hovertext)
+
     # def draw(self, draw_context: DrawContext):
     #    pass
 
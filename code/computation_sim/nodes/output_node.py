@@ -50,17 +50,16 @@ class OutputNode(Node):
             yield val
 
     @property
-    def draw_options(self) -> dict:
-        state = self.state
-
+    def draw_style(self) -> dict:
         color = "dimgrey"
         if self._last_received:
             color = "floralwhite" if self._last_receive_time == self.time else "lightgrey"
-        return dict(
-            color=color,
-            symbol="circle",
-            hovertext=f"is_occupied = {state[0]}<br>msg.age_oldest = {state[1]}<br>msg.age_youngest = {state[2]}<br>msg.age_average = {state[3]}<br>msg.num_measurements = {state[4]}<br>",
-        )
+        return dict(color=color, symbol="circle")
+
+    @property
+    def hovertext(self) -> str:
+        state = self.state
+        return f"is_occupied = {state[0]}<br>msg.age_oldest = {state[1]}<br>msg.age_youngest = {state[2]}<br>msg.age_average = {state[3]}<br>msg.num_measurements = {state[4]}<br>"
 
     @property
     def last_received(self) -> Optional[Message]:
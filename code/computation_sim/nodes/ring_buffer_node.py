@@ -27,6 +27,12 @@ class RingBufferNode(Node):
         self._output = None
         self._overflow_output = None
         self._receive_cb = None
+        self._receive_count = 0
+        # Empty elements always have the same state, which only needs to be normalized once
+        self._empty_element_state = [self._occupancy_normalizer.normalize(0.0)] + empty_message_state(
+            age_normalizer=self._age_normalizer,
+            count_normalizer=self._count_normalizer,
+        )
 
     @property
     def outputs(self) -> List[Node]:
@@ -39,6 +45,7 @@ class RingBufferNode(Node):
         if self._overflow_output and (self.num_entries == self._buffer.maxlen):
             self._overflow_output.receive(self._buffer.popleft())
         self._buffer.append(message)
+        self._receive_count += 1
         if self._receive_cb:
             self._receive_cb(self)
 
@@ -55,38 +62,37 @@ class RingBufferNode(Node):
                 yield x
         # Write empty elements
         for _ in range(self.maxlen - len(self._buffer)):
-            yield self._occupancy_normalizer.normalize(0.0)
-            for x in empty_message_state(
-                age_normalizer=self._age_normalizer,
-                count_normalizer=self._count_normalizer,
-            ):
-                yield x
+            yield from self._empty_element_state
 
     @property
-    def draw_options(self) -> dict:
+    def draw_style(self) -> dict:
         if self.num_entries == self.maxlen:
             color = "darkred"
         elif self.num_entries == 0:
             color = "darkgreen"
         else:
             color = "darkorange"
+        return dict(color=color, symbol="square")
+
+    @property
+    def hovertext(self) -> str:
         hovertext = ""
         state = self.state
         for occupied, oldest, youngest, average, num in zip(
             state[0::5], state[1::5], state[2::5], state[3::5], state[4::5]
         ):
             hovertext += f"is_occupied = {occupied}<br>msg.age_oldest = {oldest}<br>msg.age_youngest = {youngest}<br>msg.age_average = {average}<br>msg.num_measurements = {num}<br>"
-
-        return dict(
-            color=color,
-            symbol="square",
-            hovertext=hovertext,
-        )
+        return hovertext
 
     @property
     def num_entries(self) -> int:
         return len(self._buffer)
 
+    @property
+    def receive_count(self) -> int:
+        """Total number of received messages; not affected by reset."""
+        return self._receive_count
+
     @property
     def maxlen(self) -> int:
         return self._buffer.maxlen
@@ -39,13 +39,13 @@ class SinkNode(Node):
         yield self._state_normalizer.normalize(float(len(self._received_messages)))
 
     @property
-    def draw_options(self) -> dict:
+    def draw_style(self) -> dict:
         color = "darkgrey" if len(self._received_messages) == 0 else "dimgrey"
-        return dict(
-            color=color,
-            symbol="triangle-down",
-            hovertext=f"num_messages = {len(self._received_messages)}",
-        )
+        return dict(color=color, symbol="triangle-down")
+
+    @property
+    def hovertext(self) -> str:
+        return f"num_messages = {len(self._received_messages)}"
 
     def update(self):
         pass
@@ -19,7 +19,7 @@ class SourceNode(Node):
         yield from self._sensor.state
 
     @property
-    def draw_options(self) -> dict:
+    def draw_style(self) -> dict:
         return dict(color="floralwhite", symbol="triangle-up")
 
     def update(self):
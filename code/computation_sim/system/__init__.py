@@ -1,4 +1,12 @@
 from .action import Action, max_action_id, num_actions, unpack_action
 from .builder import SystemBuidler
+from .raster_drawer import RasterDrawer
+from .render_pool import RenderPool
 from .system import System
-from .system_drawer import GifCreator, ImageCreator, SystemDrawer
+from .system_drawer import (
+    GifCreator,
+    ImageCreator,
+    StreamingGifCreator,
+    SystemDrawer,
+)
+from .webgl_drawer import WebGLDrawer
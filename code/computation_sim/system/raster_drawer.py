@@ -0,0 +1,181 @@
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import networkx as nx
+import numpy as np
+
+from .system_drawer import SystemDrawer
+
+# Plotly's default color of marker outlines
+MARKER_LINE_COLOR = "#444"
+
+_rgb_cache: Dict[str, np.ndarray] = {}
+
+
+def to_rgb(color: str) -> np.ndarray:
+    """Converts a CSS color (name or hex string) into an RGB array."""
+    if color not in _rgb_cache:
+        from PIL import ImageColor
+
+        _rgb_cache[color] = np.array(ImageColor.getrgb(color)[:3], dtype=np.uint8)
+    return _rgb_cache[color]
+
+
+def symbol_mask(symbol: str, radius: float, size: int) -> np.ndarray:
+    """Boolean (size, size) mask of a marker symbol with the given radius, centered in the mask."""
+    y, x = np.mgrid[0:size, 0:size] - (size - 1) / 2.0
+    if symbol == "square":
+        return (np.abs(x) <= radius) & (np.abs(y) <= radius)
+    elif symbol == "triangle-up":
+        return (np.abs(y) <= radius) & (np.abs(x) <= (y + radius) / 2.0 * 1.15)
+    elif symbol == "triangle-down":
+        return (np.abs(y) <= radius) & (np.abs(x) <= (radius - y) / 2.0 * 1.15)
+    else:
+        return x**2 + y**2 <= radius**2
+
+
+class RasterDrawer(SystemDrawer):
+    """Draws the system graph directly into an RGB array, without plotly.
+
+    Uses the same layout as SystemDrawer. Edges are drawn once into a background image when the drawer is built. On
+    `update`, only the boxes of nodes whose color or symbol changed are repainted, together with the parts of all
+    glyphs that overlap them, in node order, such that incremental frames equal a full redraw. Node labels and
+    hovertexts are not drawn.
+    """
+
+    def __init__(
+        self,
+        width=800,
+        height=800,
+        background_color="white",
+        edge_color="#888",
+        edge_width=1.0,
+        marker_size=20,
+        maker_line_width=2,
+    ):
+        super().__init__(edge_color, edge_width, marker_size, maker_line_width)
+        self._width = width
+        self._height = height
+        self._background_color = background_color
+
+    @property
+    def canvas(self) -> np.ndarray:
+        """The (height, width, 3) image the drawer paints into. It is modified by subsequent updates."""
+        return self._canvas
+
+    @property
+    def image(self) -> np.ndarray:
+        """Copy of the current image."""
+        return self._canvas.copy()
+
+    def to_image(self):
+        from PIL import Image
+
+        return Image.fromarray(self.image)
+
+    def to_array(self) -> np.ndarray:
+        return self.image
+
+    def build(self, graph: nx.DiGraph) -> None:
+        self._node_positions = self._compute_node_positions(graph)
+        self._nodes = list(graph.nodes)
+        self._pixels = self._compute_pixel_positions([self._node_positions[node] for node in self._nodes])
+        self._masks = {}
+
+        self._background = np.empty((self._height, self._width, 3), dtype=np.uint8)
+        self._background[:] = to_rgb(self._background_color)
+        index = {node: i for i, node in enumerate(self._nodes)}
+        for edge in graph.edges():
+            self._draw_line(self._pixels[index[edge[0]]], self._pixels[index[edge[1]]])
+
+        size = self._marker_size + 1
+        corners = [(int(x), int(y)) for x, y in self._pixels - size // 2]
+        # Glyph boxes, clipped to the canvas
+        self._boxes = [
+            (max(x, 0), max(y, 0), min(x + size, self._width), min(y + size, self._height)) for x, y in corners
+        ]
+        self._overlaps = self._compute_overlaps(corners, size)
+
+        self._canvas = self._background.copy()
+        options = self.snapshot(graph)
+        self._drawn: List[Tuple[str, str]] = list(zip(options["color"], options["symbol"]))
+        for i, box in enumerate(self._boxes):
+            self._draw_node(i, box)
+
+    def update(self, graph: nx.DiGraph) -> None:
+        options = self.snapshot(graph)
+        changed = []
+        for i, drawn in enumerate(zip(options["color"], options["symbol"])):
+            if self._drawn[i] != drawn:
+                self._drawn[i] = drawn
+                changed.append(i)
+        for i in changed:
+            x0, y0, x1, y1 = self._boxes[i]
+            self._canvas[y0:y1, x0:x1] = self._background[y0:y1, x0:x1]
+            for j in self._overlaps[i]:
+                self._draw_node(j, self._boxes[i])
+
+    def _compute_overlaps(self, corners: List[Tuple[int, int]], size: int) -> List[List[int]]:
+        """For every node, the nodes whose glyph boxes overlap its box (including itself), in node order."""
+        cells = defaultdict(list)
+        for i, (x, y) in enumerate(corners):
+            cells[(x // size, y // size)].append(i)
+        overlaps = []
+        for x, y in corners:
+            # Overlapping boxes have their corners in the same or a neighboring cell
+            neighbors = [
+                j
+                for dx in (-1, 0, 1)
+                for dy in (-1, 0, 1)
+                for j in cells.get((x // size + dx, y // size + dy), ())
+                if abs(corners[j][0] - x) < size and abs(corners[j][1] - y) < size
+            ]
+            overlaps.append(sorted(neighbors))
+        return overlaps
+
+    def _compute_pixel_positions(self, positions: List[Tuple[float, float]]) -> np.ndarray:
+        positions = np.array(positions, dtype=float).reshape((-1, 2))
+        margin = self._marker_size
+        lower = positions.min(axis=0)
+        extent = np.maximum(positions.max(axis=0) - lower, 1.0e-9)
+        scale = np.array([self._width - 2 * margin, self._height - 2 * margin]) / extent
+        pixels = margin + (positions - lower) * scale
+        # Image rows grow downwards
+        pixels[:, 1] = self._height - 1 - pixels[:, 1]
+        return np.round(pixels).astype(int)
+
+    def _draw_line(self, start: np.ndarray, stop: np.ndarray) -> None:
+        num_points = int(np.abs(stop - start).max()) + 1
+        points = np.round(np.linspace(start, stop, num_points)).astype(int)
+        half_width = int(self._edge_width // 2)
+        color = to_rgb(self._edge_color)
+        for dx in range(-half_width, half_width + 1):
+            for dy in range(-half_width, half_width + 1):
+                x = np.clip(points[:, 0] + dx, 0, self._width - 1)
+                y = np.clip(points[:, 1] + dy, 0, self._height - 1)
+                self._background[y, x] = color
+
+    def _get_masks(self, symbol: str) -> Tuple[np.ndarray, np.ndarray]:
+        if symbol not in self._masks:
+            size = self._marker_size + 1
+            outer = symbol_mask(symbol, self._marker_size / 2.0, size)
+            inner = symbol_mask(symbol, self._marker_size / 2.0 - self._marker_line_width, size)
+            self._masks[symbol] = (inner, outer & ~inner)
+        return self._masks[symbol]
+
+    def _draw_node(self, index: int, region: Tuple[int, int, int, int]) -> None:
+        """Paints the part of the node's glyph within the (x0, y0, x1, y1) region of the canvas."""
+        color, symbol = self._drawn[index]
+        fill, outline = self._get_masks(symbol)
+        size = fill.shape[0]
+        gx, gy = self._pixels[index] - size // 2
+        x0, y0 = max(gx, region[0]), max(gy, region[1])
+        x1, y1 = min(gx + size, region[2]), min(gy + size, region[3])
+        if x1 <= x0 or y1 <= y0:
+            return
+        fill = fill[y0 - gy : y1 - gy, x0 - gx : x1 - gx]
+        outline = outline[y0 - gy : y1 - gy, x0 - gx : x1 - gx]
+
+        patch = self._canvas[y0:y1, x0:x1]
+        patch[fill] = to_rgb(color)
+        patch[outline] = to_rgb(MARKER_LINE_COLOR)
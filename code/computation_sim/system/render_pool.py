@@ -0,0 +1,105 @@
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Deque, Optional
+
+import numpy as np
+
+from .system_drawer import SystemDrawer, figure_to_image
+
+# Figure of the current worker process, created once by the pool initializer
+_worker_figure = None
+
+
+def _init_worker(figure_dict: dict) -> None:
+    import plotly.graph_objects as go
+
+    global _worker_figure
+    _worker_figure = go.Figure(figure_dict)
+
+
+def rasterize_snapshot(options: dict) -> np.ndarray:
+    """Renders a drawer snapshot with the figure of the worker process into an RGB array."""
+    SystemDrawer.apply(_worker_figure, options)
+    return np.asarray(figure_to_image(_worker_figure), np.uint8)
+
+
+class RenderPool(object):
+    """Rasterizes SystemDrawer snapshots in worker processes, such that rendering does not block the simulation.
+
+    Snapshots are rendered concurrently, but frames are delivered in submission order: `latest_frame` returns the most
+    recent frame for which all earlier frames are finished as well, and `on_frame` (e.g. a recorder) is called for
+    every frame in order. When `max_pending` snapshots are in flight, new snapshots are dropped (`drop_frames`) or
+    `submit` waits for the oldest one.
+
+    Args:
+        drawer: A built drawer, whose figure is copied into every worker.
+        num_workers: Number of worker processes.
+        max_pending: Maximum number of snapshots in flight. Defaults to two per worker.
+        drop_frames: Drop snapshots instead of waiting, when max_pending is reached.
+        on_frame: Called with every finished frame, in order.
+        rasterize: Picklable function that converts a snapshot into a frame in a worker process.
+    """
+
+    def __init__(
+        self,
+        drawer: SystemDrawer,
+        num_workers: int = 1,
+        max_pending: int = None,
+        drop_frames: bool = True,
+        on_frame: Callable[[np.ndarray], None] = None,
+        rasterize: Callable[[dict], np.ndarray] = rasterize_snapshot,
+    ):
+        self._executor = ProcessPoolExecutor(
+            num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(drawer.fw.to_dict(),),
+        )
+        self._max_pending = max_pending if max_pending else 2 * num_workers
+        self._drop_frames = drop_frames
+        self._on_frame = on_frame
+        self._rasterize = rasterize
+        self._pending: Deque[Future] = deque()
+        self._latest: Optional[np.ndarray] = None
+        self.num_dropped = 0
+        self.num_rendered = 0
+
+    @property
+    def num_pending(self) -> int:
+        return len(self._pending)
+
+    def submit(self, snapshot: dict) -> None:
+        self._collect_finished()
+        if len(self._pending) >= self._max_pending:
+            if self._drop_frames:
+                self.num_dropped += 1
+                return
+            self._finish_oldest()
+        self._pending.append(self._executor.submit(self._rasterize, snapshot))
+
+    def latest_frame(self) -> Optional[np.ndarray]:
+        """Returns the latest finished frame. Waits for the oldest pending frame, if no frame was finished yet."""
+        self._collect_finished()
+        if self._latest is None and self._pending:
+            self._finish_oldest()
+        return self._latest
+
+    def flush(self) -> None:
+        """Waits until all submitted snapshots are rendered."""
+        while self._pending:
+            self._finish_oldest()
+
+    def close(self) -> None:
+        self.flush()
+        self._executor.shutdown()
+
+    def _collect_finished(self) -> None:
+        while self._pending and self._pending[0].done():
+            self._finish_oldest()
+
+    def _finish_oldest(self) -> None:
+        self._latest = self._pending.popleft().result()
+        self.num_rendered += 1
+        if self._on_frame:
+            self._on_frame(self._latest)
@@ -1,6 +1,7 @@
 from typing import Iterable, List
 
 import networkx as nx
+import numpy as np
 from computation_sim.basic_types import BadActionError, BadNodeGraphError
 from computation_sim.nodes import Node
 
@@ -33,6 +34,11 @@ class System:
             state.extend(node.generate_state())
         return state
 
+    def write_state(self, out: np.ndarray) -> np.ndarray:
+        """Writes the state into a preallocated (state size,) array, converting to its dtype, and returns it."""
+        out[:] = self.state
+        return out
+
     @property
     def node_graph(self) -> nx.DiGraph:
         return self._node_graph.copy(as_view=True)
@@ -1,11 +1,12 @@
 import pathlib
+import queue
 from io import BytesIO
+from threading import Thread
 from typing import Tuple
 
-import imageio
 import networkx as nx
-import plotly.graph_objects as go
-from PIL import Image
+
+# plotly, PIL and imageio are imported on first use, such that headless simulations do not pay for their import.
 
 
 def default_layout() -> dict:
@@ -24,6 +25,8 @@ class SystemDrawer(object):
         self._marker_line_width = maker_line_width
 
     def build(self, graph: nx.DiGraph) -> None:
+        import plotly.graph_objects as go
+
         self._node_positions = self._compute_node_positions(graph)
         edges_x, edges_y = self._compute_edges(graph)
 
@@ -69,12 +72,29 @@ class SystemDrawer(object):
         )
 
     def update(self, graph: nx.DiGraph) -> None:
-        options = self._collect_opts(graph)
-        node_scatter = self.fw.data[1]
+        self.apply(self.fw, self.snapshot(graph))
+
+    def to_image(self):
+        """Rasterizes the figure into a PIL image."""
+        return figure_to_image(self.fw)
+
+    def to_array(self):
+        """Rasterizes the figure into an RGB array."""
+        import numpy as np
+
+        return np.asarray(self.to_image(), np.uint8)
+
+    def snapshot(self, graph: nx.DiGraph) -> dict:
+        """Collects the per-node draw state (colors, symbols, hovertext) of the graph, in node order."""
+        return self._collect_opts(graph)
+
+    @staticmethod
+    def apply(figure, options: dict) -> None:
+        """Applies a snapshot to a figure created by `build` (or a copy of it)."""
+        node_scatter = figure.data[1]
         node_scatter.marker.color = options["color"]
         node_scatter.marker.symbol = options["symbol"]
         node_scatter.hovertext = options["hovertext"]
-        self.fw
 
     def _compute_node_positions(self, graph: nx.DiGraph) -> dict:
         layers = dict()
@@ -105,13 +125,21 @@ class SystemDrawer(object):
         return {k: [dic[k] for dic in opts] for k in common_keys}
 
 
+def figure_to_image(figure):
+    from PIL import Image
+
+    return Image.open(BytesIO(figure.to_image(format="jpg")))
+
+
 class ImageCreator:
     @staticmethod
     def to_image(drawer: SystemDrawer):
-        return Image.open(BytesIO(drawer.fw.to_image(format="jpg")))
+        return drawer.to_image()
 
     @staticmethod
     def save(drawer: SystemDrawer, path: pathlib.Path):
+        import imageio
+
         imageio.imsave(str(path), ImageCreator.to_image(drawer))
 
 
@@ -122,11 +150,128 @@ class GifCreator:
     def update(self, drawer: SystemDrawer):
         self.frames.append(ImageCreator.to_image(drawer))
 
-    def _to_image(self, drawer: SystemDrawer) -> Image.Image:
-        return Image.open(BytesIO(drawer.fw.to_image(format="jpg")))
+    def _to_image(self, drawer: SystemDrawer) -> "Image.Image":
+        return ImageCreator.to_image(drawer)
 
     def save(self, path: pathlib.Path, fps: int = 10):
+        import imageio
+
         imageio.mimsave(str(path), self.frames, fps=fps, loop=0)
 
     def reset(self):
         self.frames = []
+
+
+class StreamingGifWriter:
+    """Appends frames to a GIF file one at a time, such that frames never have to be kept in memory.
+
+    Each frame is quantized to its own palette, which is stored as local color table.
+    """
+
+    def __init__(self, path: pathlib.Path, fps: int = 10, loop: int = 0):
+        self._file = open(path, "wb")
+        self._duration = 1000 / fps
+        self._loop = loop
+        self._has_header = False
+
+    def append(self, frame) -> None:
+        from PIL import GifImagePlugin, Image
+
+        if not isinstance(frame, Image.Image):
+            frame = Image.fromarray(frame)
+        frame = frame.convert("RGB").quantize()
+        if not self._has_header:
+            header, _ = GifImagePlugin.getheader(frame, info=dict(loop=self._loop, duration=self._duration))
+            self._file.write(b"".join(header))
+            self._has_header = True
+        for data in GifImagePlugin.getdata(frame, duration=self._duration, include_color_table=True):
+            self._file.write(data)
+
+    def close(self) -> None:
+        self._file.write(b";")  # GIF trailer
+        self._file.close()
+
+
+class ImageioWriter:
+    """Appends frames to a video (e.g. mp4) through imageio's streaming writers."""
+
+    def __init__(self, path: pathlib.Path, fps: int = 10):
+        import imageio
+
+        self._writer = imageio.get_writer(str(path), fps=fps)
+
+    def append(self, frame) -> None:
+        import numpy as np
+
+        self._writer.append_data(np.asarray(frame))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class StreamingGifCreator:
+    """Records frames of a SystemDrawer directly to disk.
+
+    In contrast to GifCreator, frames are encoded on a background thread as they arrive. At most `queue_size` frames
+    are kept in memory; `update` blocks when the encoder falls behind. Only every `frame_skip`-th update is recorded.
+    GIFs are written natively; any other file type (e.g. mp4) is written through imageio.
+    """
+
+    def __init__(self, path: pathlib.Path, fps: int = 10, frame_skip: int = 1, queue_size: int = 8):
+        path = pathlib.Path(path)
+        self._writer = StreamingGifWriter(path, fps) if path.suffix.lower() == ".gif" else ImageioWriter(path, fps)
+        self._frame_skip = frame_skip
+        self._num_updates = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._thread = Thread(target=self._encode, daemon=True)
+        self._thread.start()
+
+    @property
+    def num_updates(self) -> int:
+        return self._num_updates
+
+    def update(self, drawer: SystemDrawer) -> None:
+        # Skipped frames are not even rendered
+        if self._is_recorded():
+            self.write(ImageCreator.to_image(drawer))
+
+    def update_frame(self, frame) -> None:
+        """Records an already rendered frame (e.g. the rgb_array returned by `env.render()`)."""
+        if self._is_recorded():
+            self.write(frame)
+
+    def write(self, frame) -> None:
+        if self._error:
+            raise self._error
+        self._queue.put(frame)
+
+    def save(self) -> None:
+        """Flushes the remaining frames and closes the file."""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error:
+            raise self._error
+
+    def _is_recorded(self) -> bool:
+        recorded = self._num_updates % self._frame_skip == 0
+        self._num_updates += 1
+        return recorded
+
+    def _encode(self) -> None:
+        try:
+            while (frame := self._queue.get()) is not None:
+                self._writer.append(frame)
+        except Exception as e:
+            self._error = e
+            # Keep draining, such that producers do not block forever
+            while self._queue.get() is not None:
+                pass
+        finally:
+            self._writer.close()
+
+    def __enter__(self) -> "StreamingGifCreator":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.save()
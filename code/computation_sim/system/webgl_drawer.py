@@ -0,0 +1,241 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+
+from .system_drawer import SystemDrawer
+
+# Trace indices of the figure built by WebGLDrawer
+DETAIL_EDGE_TRACE = 0
+DETAIL_NODE_TRACE = 1
+OVERVIEW_EDGE_TRACE = 2
+OVERVIEW_NODE_TRACE = 3
+
+
+def find_chains(graph: nx.DiGraph) -> List[list]:
+    """Finds linear chains that start at a source node, e.g. sensor -> buffer -> compute -> buffer.
+
+    A chain is extended as long as the last node has exactly one successor that is fed by no other node and that
+    itself has outputs. Shared nodes, such as sinks or nodes that merge several chains, end the chain. Only chains of
+    at least two nodes are returned.
+    """
+    chains = []
+    for node in graph.nodes:
+        if graph.in_degree(node) != 0:
+            continue
+        chain = [node]
+        while True:
+            successors = [
+                s for s in graph.successors(chain[-1]) if graph.in_degree(s) == 1 and graph.out_degree(s) > 0
+            ]
+            if len(successors) != 1:
+                break
+            chain.append(successors[0])
+        if len(chain) > 1:
+            chains.append(chain)
+    return chains
+
+
+def edge_buffers(positions: np.ndarray, edges: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Line buffers (x, y) of (num_edges, 2) node index pairs, with NaN separators between the edges."""
+    x = np.full((len(edges), 3), np.nan)
+    y = np.full((len(edges), 3), np.nan)
+    if len(edges) > 0:
+        x[:, :2] = positions[edges, 0]
+        y[:, :2] = positions[edges, 1]
+    return x.ravel(), y.ravel()
+
+
+class WebGLDrawer(SystemDrawer):
+    """SystemDrawer for very large topologies.
+
+    Differences to SystemDrawer:
+    - Nodes and edges are drawn with WebGL (`Scattergl`) traces.
+    - Edge buffers are computed once with numpy when the drawer is built.
+    - `update` only queries the cheap `draw_style` of the nodes. The hovertext of a node is generated when it is
+      hovered, and kept up to date while it is the last hovered node of its trace; all other nodes show their label.
+    - Level of detail: Besides the full graph, the figure holds an overview, in which every sensor chain (see
+      `find_chains`) is collapsed into a single glyph, colored like the last node of the chain. Only the visible level
+      is updated. The overview is shown for graphs with at least `overview_min_nodes` nodes, while more than
+      `overview_zoom` of the graph's extent is visible.
+
+    Args:
+        overview_min_nodes: Smaller graphs are always drawn in full detail.
+        overview_zoom: Fraction of the graph's width or height above which the overview is shown.
+    """
+
+    def __init__(
+        self,
+        edge_color="#888",
+        edge_width=1.0,
+        marker_size=20,
+        maker_line_width=2,
+        overview_min_nodes: int = 200,
+        overview_zoom: float = 0.5,
+    ):
+        super().__init__(edge_color, edge_width, marker_size, maker_line_width)
+        self._overview_min_nodes = overview_min_nodes
+        self._overview_zoom = overview_zoom
+
+    @property
+    def show_overview(self) -> bool:
+        return self._show_overview
+
+    def build(self, graph: nx.DiGraph) -> None:
+        import plotly.graph_objects as go
+
+        self._nodes = list(graph.nodes)
+        self._graph = graph
+        index = {node: i for i, node in enumerate(self._nodes)}
+        self._node_positions = self._compute_node_positions(graph)
+        positions = np.array([self._node_positions[node] for node in self._nodes], dtype=float).reshape((-1, 2))
+        edges = np.array([(index[u], index[v]) for u, v in graph.edges()], dtype=int).reshape((-1, 2))
+        self._lower = positions.min(axis=0)
+        self._extent = np.maximum(positions.max(axis=0) - self._lower, 1.0e-9)
+
+        # Overview: every chain becomes a group, all other nodes stay on their own
+        chains = find_chains(graph)
+        group_of = np.arange(len(self._nodes))
+        members = []
+        for chain in chains:
+            members.append([index[node] for node in chain])
+            group_of[members[-1]] = len(self._nodes) + len(members) - 1
+        chained = group_of >= len(self._nodes)
+        singles = np.flatnonzero(~chained)
+        self._groups: List[List[int]] = [[i] for i in singles] + members
+        # Each group is drawn in the style of its representative: a single node or the last node of a chain
+        self._representatives = np.array([group[-1] for group in self._groups], dtype=int)
+        group_index = np.empty(len(self._nodes) + len(members), dtype=int)
+        group_index[singles] = np.arange(len(singles))
+        group_index[len(self._nodes) :] = len(singles) + np.arange(len(members))
+        overview_edges = group_index[group_of[edges]] if len(edges) > 0 else edges
+        overview_edges = np.unique(overview_edges[overview_edges[:, 0] != overview_edges[:, 1]], axis=0)
+        overview_positions = np.array([positions[group].mean(axis=0) for group in self._groups]).reshape((-1, 2))
+
+        self.fw = go.FigureWidget(
+            layout=go.Layout(
+                showlegend=False,
+                hovermode="closest",
+                margin=dict(b=20, l=5, r=5, t=40),
+                xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            )
+        )
+        line = dict(width=self._edge_width, color=self._edge_color)
+        marker = dict(size=self._marker_size, line_width=self._marker_line_width)
+        levels = (
+            (positions, edges, [[i] for i in range(len(self._nodes))], "markers+text"),
+            (overview_positions, overview_edges, self._groups, "markers"),
+        )
+        self._labels: Dict[int, List[str]] = {}
+        for trace, (node_positions, edge_indices, groups, mode) in zip(
+            (DETAIL_NODE_TRACE, OVERVIEW_NODE_TRACE), levels
+        ):
+            labels = [str(self._nodes[group[0]].id) for group in groups]
+            self._labels[trace] = labels
+            edges_x, edges_y = edge_buffers(node_positions, edge_indices)
+            self.fw.add_trace(go.Scattergl(x=edges_x, y=edges_y, mode="lines", line=line, hoverinfo="none"))
+            self.fw.add_trace(
+                go.Scattergl(
+                    x=node_positions[:, 0],
+                    y=node_positions[:, 1],
+                    mode=mode,
+                    textposition="top center",
+                    text=labels,
+                    hovertext=labels,
+                    marker=marker,
+                    hoverinfo="text",
+                )
+            )
+
+        self._styles: Dict[int, Tuple[list, list]] = {}
+        # Last hovered point of each node trace, and its hovertext
+        self._hovered: Dict[int, Optional[int]] = {DETAIL_NODE_TRACE: None, OVERVIEW_NODE_TRACE: None}
+        self._hovertexts: Dict[int, Optional[str]] = {DETAIL_NODE_TRACE: None, OVERVIEW_NODE_TRACE: None}
+        self.fw.data[DETAIL_NODE_TRACE].on_hover(lambda trace, points, state: self.hover(DETAIL_NODE_TRACE, points))
+        self.fw.data[OVERVIEW_NODE_TRACE].on_hover(
+            lambda trace, points, state: self.hover(OVERVIEW_NODE_TRACE, points)
+        )
+        self.fw.layout.on_change(lambda layout, x, y: self.set_view_range(x, y), "xaxis.range", "yaxis.range")
+
+        self._show_overview = None
+        self._set_level(len(self._nodes) >= self._overview_min_nodes)
+
+    def update(self, graph: nx.DiGraph) -> None:
+        trace = OVERVIEW_NODE_TRACE if self._show_overview else DETAIL_NODE_TRACE
+        styles = [node.draw_style for node in self._visible_nodes()]
+        colors = [style.get("color", "#1f77b4") for style in styles]
+        symbols = [style.get("symbol", "circle") for style in styles]
+        with self.fw.batch_update():
+            # Only send the arrays that changed to the frontend
+            if self._styles.get(trace) != (colors, symbols):
+                self.fw.data[trace].marker.color = colors
+                self.fw.data[trace].marker.symbol = symbols
+                self._styles[trace] = (colors, symbols)
+            if self._hovered[trace] is not None:
+                self._set_hovertext(trace, self._hovered[trace])
+
+    def snapshot(self, graph: nx.DiGraph) -> dict:
+        """Collects the colors and symbols of all nodes, in node order. Hovertexts are not collected."""
+        styles = [node.draw_style for node in graph.nodes]
+        return dict(
+            color=[style.get("color", "#1f77b4") for style in styles],
+            symbol=[style.get("symbol", "circle") for style in styles],
+        )
+
+    @staticmethod
+    def apply(figure, options: dict) -> None:
+        node_scatter = figure.data[DETAIL_NODE_TRACE]
+        node_scatter.marker.color = options["color"]
+        node_scatter.marker.symbol = options["symbol"]
+
+    def hover(self, trace: int, points) -> None:
+        """Generates the hovertext of the hovered point of a node trace."""
+        if not points.point_inds:
+            return
+        self._set_hovertext(trace, points.point_inds[0])
+
+    def _set_hovertext(self, trace: int, point: int) -> None:
+        """Shows the hovertext of `point` and the labels of all other points of a node trace."""
+        text = self.hovertext(trace, point)
+        if (point, text) == (self._hovered[trace], self._hovertexts[trace]):
+            return
+        hovertexts = list(self._labels[trace])
+        hovertexts[point] = text
+        self.fw.data[trace].hovertext = hovertexts
+        self._hovered[trace] = point
+        self._hovertexts[trace] = text
+
+    def hovertext(self, trace: int, point: int) -> str:
+        """Hovertext of a point of the detail or overview node trace."""
+        if trace == DETAIL_NODE_TRACE:
+            return self._nodes[point].hovertext
+        group = [self._nodes[i] for i in self._groups[point]]
+        if len(group) == 1:
+            return group[0].hovertext
+        return "<br>".join(f"<b>{node.id}</b><br>{node.hovertext}" for node in group)
+
+    def set_view_range(self, x_range: Optional[Sequence[float]], y_range: Optional[Sequence[float]]) -> None:
+        """Chooses the level of detail for the visible axis ranges (None means the full graph is visible)."""
+        if len(self._nodes) < self._overview_min_nodes:
+            return
+        visible = [
+            1.0 if r is None else abs(r[1] - r[0]) / extent for r, extent in zip((x_range, y_range), self._extent)
+        ]
+        self._set_level(max(visible) > self._overview_zoom)
+
+    def _set_level(self, show_overview: bool) -> None:
+        if show_overview == self._show_overview:
+            return
+        self._show_overview = show_overview
+        with self.fw.batch_update():
+            for trace in (DETAIL_EDGE_TRACE, DETAIL_NODE_TRACE):
+                self.fw.data[trace].visible = not show_overview
+            for trace in (OVERVIEW_EDGE_TRACE, OVERVIEW_NODE_TRACE):
+                self.fw.data[trace].visible = show_overview
+        self.update(self._graph)
+
+    def _visible_nodes(self) -> list:
+        if self._show_overview:
+            return [self._nodes[i] for i in self._representatives]
+        return self._nodes
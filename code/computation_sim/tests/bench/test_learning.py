@@ -0,0 +1,31 @@
+import json
+
+import pytest
+from computation_sim.bench.__main__ import main
+from computation_sim.bench.learning import make_env, run_session
+
+
+def test_make_env():
+    env = make_env()
+    # Two edge computes and the output compute
+    assert env.system.num_action == 3
+    with pytest.raises(ValueError):
+        make_env(fan_in=8)
+
+
+def test_run_session():
+    result = run_session(num_steps=40, batch_size=16, memory_size=32, width=8)
+    assert result["num_updates"] == 40 - 16 + 1
+    assert result["env_steps_per_sec"] > 0.0
+    assert result["gradient_steps_per_sec"] > 0.0
+    phases = sum(result[f"{name}_time_s"] for name in ("sim", "inference", "replay", "learner"))
+    assert 0.0 < phases <= result["total_time_s"]
+
+
+def test_main(tmp_path):
+    path = tmp_path / "learning.json"
+    args = ["learning", "--steps", "20", "--batch-size", "8", "--width", "8", "16", "--no-isolate", "-o", str(path)]
+    main(args)
+    report = json.loads(path.read_text())
+    assert report["benchmark"] == "learning"
+    assert [result["width"] for result in report["results"]] == [8, 16]
@@ -0,0 +1,74 @@
+import json
+
+from computation_sim.bench.__main__ import main
+from computation_sim.bench.nodes import (
+    SCENARIOS,
+    RingBufferNode,
+    header_to_state,
+    outputs_match,
+    run_scenario,
+    trace_allocations,
+)
+
+
+class LeakingRingBufferNode(RingBufferNode):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.received = []
+
+    def receive(self, message):
+        self.received.append(message)
+        super().receive(message)
+
+
+def rounded_header_to_state(*args):
+    return [round(x, -1) for x in header_to_state(*args)]
+
+
+def test_scenarios():
+    for name, setup in SCENARIOS.items():
+        op = setup()
+        assert len(op()) > 0, name
+        assert outputs_match(setup(), setup()), name
+
+
+def test_trace_allocations():
+    result = trace_allocations(SCENARIOS["RingBufferNode"](LeakingRingBufferNode), num_ops=100)
+    assert result["alloc_peak_bytes_per_op"] > 0.0
+    # Two references to the received messages are kept per operation
+    assert result["retained_bytes_per_op"] >= 2 * 8
+
+
+def test_run_scenario():
+    results = run_scenario("header_to_state", dict(rounded=rounded_header_to_state), min_time=0.01, alloc_ops=10)
+    assert [result["implementation"] for result in results] == ["reference", "rounded"]
+    assert results[0]["ns_per_op"] > 0.0
+    assert "relative_time" not in results[0]
+    assert results[1]["relative_time"] > 0.0
+    assert not results[1]["matches_reference"]
+
+
+def test_main(tmp_path):
+    path = tmp_path / "nodes.json"
+    main(
+        [
+            "nodes",
+            "--scenarios",
+            "OutputNode",
+            "--alternative",
+            "OutputNode=computation_sim.nodes:OutputNode",
+            "--min-time",
+            "0.01",
+            "--alloc-ops",
+            "10",
+            "-o",
+            str(path),
+        ]
+    )
+    report = json.loads(path.read_text())
+    assert report["benchmark"] == "nodes"
+    assert [result["implementation"] for result in report["results"]] == [
+        "reference",
+        "computation_sim.nodes:OutputNode",
+    ]
+    assert report["results"][1]["matches_reference"]
@@ -0,0 +1,43 @@
+import json
+
+import numpy as np
+from computation_sim.bench.__main__ import main
+from computation_sim.bench.common import peak_rss_bytes, run_isolated
+from computation_sim.bench.scaling import Simulation, build_topology, run_case
+
+
+def test_build_topology():
+    clock, system_collection = build_topology(num_sensors=20, fan_in=4)
+    # Two levels: the output compute has 2 edge computes with 10 sensors each, spread over 3 edge computes each
+    assert system_collection.system.num_action == 1 + 2 + 6
+    assert len(system_collection.sources) == 20
+
+    # Equal seeds give equal simulations
+    states = []
+    for _ in range(2):
+        simulation = Simulation(*build_topology(num_sensors=20, fan_in=4, seed=3), seed=3)
+        for action in simulation.random_actions(50):
+            state, _ = simulation.step(action)
+        states.append(state)
+    np.testing.assert_array_equal(states[0], states[1])
+
+
+def test_run_case():
+    result = run_case(num_sensors=4, buffer_size=2, min_steps=5, min_time=0.0, alloc_steps=2)
+    assert result["num_steps"] == 5
+    assert result["steps_per_sec"] > 0.0
+    assert result["alloc_peak_bytes_per_step"] > 0.0
+    assert result["peak_rss_bytes"] > 0
+
+
+def test_main(tmp_path):
+    path = tmp_path / "scaling.json"
+    main(["scaling", "--sensors", "4", "8", "--min-steps", "2", "--min-time", "0", "--no-isolate", "-o", str(path)])
+    report = json.loads(path.read_text())
+    assert report["benchmark"] == "scaling"
+    assert "cpu_count" in report["machine"]
+    assert [result["num_sensors"] for result in report["results"]] == [4, 8]
+
+
+def test_run_isolated():
+    assert run_isolated(peak_rss_bytes) > 0
@@ -0,0 +1,103 @@
+import json
+
+import numpy as np
+import pytest
+from computation_sim.bench.__main__ import main
+from computation_sim.bench.common import make_report
+from computation_sim.bench.store import (
+    ResultStore,
+    compare,
+    current_commit,
+    machine_fingerprint,
+    relative_change_interval,
+)
+
+
+def nodes_report(ns_per_op, seed=0):
+    rng = np.random.default_rng(seed)
+    results = [
+        dict(scenario="OutputNode", implementation="reference", ns_per_op=value, alloc_peak_bytes_per_op=100.0)
+        for value in ns_per_op * (1.0 + 0.01 * rng.normal(size=5))
+    ]
+    return make_report("nodes", results)
+
+
+def test_result_store(tmp_path):
+    store = ResultStore(tmp_path)
+    report = nodes_report(1000.0)
+    fingerprint = machine_fingerprint(report["machine"])
+    assert fingerprint == machine_fingerprint()
+    assert store.commits("nodes", fingerprint) == []
+
+    store.save(report, commit="a")
+    store.save(report, commit="b")
+    store.save(report, commit="a")
+    assert store.commits("nodes", fingerprint) == ["b", "a"]
+    reports = store.load("nodes", fingerprint, "a")
+    assert len(reports) == 2
+    assert reports[0]["commit"] == "a"
+    assert reports[0]["results"] == report["results"]
+    assert store.load("nodes", fingerprint, "c") == []
+
+
+def test_machine_fingerprint():
+    machine = dict(hostname="a", platform="Linux-1", processor="x86_64", cpu_count=8, python="3.11.4", numpy="1.0")
+    fingerprint = machine_fingerprint(machine)
+    # Host, kernel, patch and package versions change between CI runs on the same hardware
+    assert machine_fingerprint(dict(machine, hostname="b", platform="Linux-2", python="3.11.9", numpy="2.0")) == (
+        fingerprint
+    )
+    assert machine_fingerprint(dict(machine, cpu_count=4)) != fingerprint
+    assert machine_fingerprint(dict(machine, python="3.12.0")) != fingerprint
+    assert machine_fingerprint(dict(machine, hostname="b"), fields=("hostname",)) != machine_fingerprint(
+        machine, fields=("hostname",)
+    )
+
+
+def test_current_commit():
+    assert len(current_commit()) > 0
+
+
+def test_relative_change_interval():
+    estimate, low, high = relative_change_interval([10.0, 10.2, 9.8], [12.0, 12.2, 11.8])
+    assert estimate == pytest.approx(0.2)
+    assert 0.1 < low < estimate < high < 0.3
+    # One sample cannot be significant
+    assert relative_change_interval([10.0], [20.0])[1:] == (-np.inf, np.inf)
+
+
+def test_compare():
+    baseline = [nodes_report(1000.0, seed=0)]
+    rows = compare("nodes", baseline, [nodes_report(1200.0, seed=1)])
+    assert {row["metric"]: row["verdict"] for row in rows} == dict(
+        ns_per_op="regression", alloc_peak_bytes_per_op="unchanged"
+    )
+    assert rows[0]["case"] == dict(scenario="OutputNode", implementation="reference")
+    assert rows[0]["num_baseline"] == rows[0]["num_candidate"] == 5
+
+    assert compare("nodes", baseline, [nodes_report(800.0, seed=1)])[0]["verdict"] == "improvement"
+    assert compare("nodes", baseline, [nodes_report(1000.0, seed=1)])[0]["verdict"] == "unchanged"
+
+
+def test_main(tmp_path):
+    store = ResultStore(tmp_path)
+    store.save(nodes_report(1000.0, seed=0), commit="base")
+    store.save(nodes_report(1005.0, seed=1), commit="same")
+    store.save(nodes_report(1500.0, seed=2), commit="slow")
+
+    assert main(["compare", "nodes", "--store", str(tmp_path), "--baseline", "base", "--candidate", "same"]) == 0
+    path = tmp_path / "comparison.json"
+    # The most recently stored other commit is the default baseline
+    assert main(["compare", "nodes", "--store", str(tmp_path), "--candidate", "slow", "-o", str(path)]) == 1
+    comparison = json.loads(path.read_text())
+    assert comparison["baseline"] == "same"
+    assert comparison["rows"][0]["verdict"] == "regression"
+    assert main(["compare", "nodes", "--store", str(tmp_path), "--baseline", "base", "--candidate", "none"]) == 2
+
+
+def test_main_store(tmp_path):
+    args = ["nodes", "--scenarios", "header_to_state", "--min-time", "0.01", "--alloc-ops", "10", "--runs", "2"]
+    main(args + ["--store", str(tmp_path), "--commit", "a", "-o", str(tmp_path / "nodes.json")])
+    (report,) = ResultStore(tmp_path).load("nodes", machine_fingerprint(), "a")
+    assert report["config"]["runs"] == 2
+    assert [result["run"] for result in report["results"]] == [0, 1]
@@ -0,0 +1,87 @@
+import networkx as nx
+import numpy as np
+import pytest
+from computation_sim.system import RasterDrawer
+from computation_sim.system.raster_drawer import to_rgb
+
+
+class FakeNode:
+    def __init__(self, id, color, symbol="circle"):
+        self.id = id
+        self.color = color
+        self.symbol = symbol
+        self.num_draws = 0
+
+    @property
+    def draw_options(self) -> dict:
+        self.num_draws += 1
+        return dict(color=self.color, symbol=self.symbol)
+
+
+@pytest.fixture
+def setup():
+    a = FakeNode("a", "darkred")
+    b = FakeNode("b", "darkgreen", "square")
+    c = FakeNode("c", "#1f77b4", "triangle-up")
+    graph = nx.DiGraph()
+    graph.add_edge(a, b)
+    graph.add_edge(b, c)
+    drawer = RasterDrawer(width=200, height=100)
+    drawer.build(graph)
+    return drawer, graph, (a, b, c)
+
+
+def center_color(drawer, index) -> np.ndarray:
+    x, y = drawer._pixels[index]
+    return drawer.canvas[y, x]
+
+
+def test_build(setup):
+    drawer, _, nodes = setup
+    assert drawer.image.shape == (100, 200, 3)
+    assert drawer.image.dtype == np.uint8
+    for i, node in enumerate(nodes):
+        np.testing.assert_array_equal(center_color(drawer, i), to_rgb(node.color))
+
+
+def test_update_repaints_changed_nodes(setup):
+    drawer, graph, (a, b, c) = setup
+    before = drawer.image
+    a.color = "floralwhite"
+    drawer.update(graph)
+    after = drawer.image
+
+    np.testing.assert_array_equal(center_color(drawer, 0), to_rgb("floralwhite"))
+    np.testing.assert_array_equal(center_color(drawer, 1), to_rgb("darkgreen"))
+    # Only pixels around node a change
+    changed_y, changed_x = np.nonzero(np.any(before != after, axis=2))
+    assert np.all(np.abs(changed_x - drawer._pixels[0][0]) <= drawer._marker_size)
+    assert np.all(np.abs(changed_y - drawer._pixels[0][1]) <= drawer._marker_size)
+
+
+def test_image_is_a_copy(setup):
+    drawer, graph, (a, _, _) = setup
+    image = drawer.image
+    a.color = "floralwhite"
+    drawer.update(graph)
+    np.testing.assert_array_equal(image[drawer._pixels[0][1], drawer._pixels[0][0]], to_rgb("darkred"))
+
+
+def test_update_with_overlapping_glyphs():
+    sources = [FakeNode(str(i), "darkred") for i in range(30)]
+    graph = nx.DiGraph()
+    sink = FakeNode("sink", "darkgreen", "square")
+    for source in sources:
+        graph.add_edge(source, sink)
+    drawer = RasterDrawer(width=200, height=200)
+    drawer.build(graph)
+    index = list(graph.nodes).index(sources[5])
+    assert len(drawer._overlaps[index]) > 1
+
+    # Incremental frames equal a full redraw of the same graph
+    for color in ("floralwhite", "darkred"):
+        sources[5].color = color
+        drawer.update(graph)
+        redrawn = RasterDrawer(width=200, height=200)
+        redrawn.build(graph)
+        np.testing.assert_array_equal(drawer.image, redrawn.image)
@@ -0,0 +1,46 @@
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from computation_sim.system import RenderPool
+
+
+def rasterize_index(options: dict) -> np.ndarray:
+    return np.full((2, 2, 3), options["index"], dtype=np.uint8)
+
+
+@pytest.fixture
+def drawer():
+    drawer = Mock()
+    drawer.fw.to_dict.return_value = {}
+    return drawer
+
+
+def test_frames_in_order(drawer):
+    frames = []
+    pool = RenderPool(drawer, num_workers=2, drop_frames=False, on_frame=frames.append, rasterize=rasterize_index)
+    for i in range(10):
+        pool.submit(dict(index=i))
+    pool.close()
+
+    assert [frame[0, 0, 0] for frame in frames] == list(range(10))
+    assert pool.num_rendered == 10
+    assert pool.num_dropped == 0
+    assert pool.latest_frame()[0, 0, 0] == 9
+
+
+def test_latest_frame_waits_for_first_frame(drawer):
+    pool = RenderPool(drawer, rasterize=rasterize_index)
+    assert pool.latest_frame() is None
+    pool.submit(dict(index=3))
+    assert pool.latest_frame()[0, 0, 0] == 3
+    pool.close()
+
+
+def test_drop_frames(drawer):
+    pool = RenderPool(drawer, num_workers=1, max_pending=1, rasterize=rasterize_index)
+    for i in range(10):
+        pool.submit(dict(index=i))
+    pool.close()
+    assert pool.num_rendered + pool.num_dropped == 10
+    assert pool.num_pending == 0
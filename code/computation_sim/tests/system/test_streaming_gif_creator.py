@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from computation_sim.system import StreamingGifCreator
+from PIL import Image, ImageSequence
+
+
+def make_frames(n):
+    frames = []
+    for i in range(n):
+        frame = np.zeros((20, 30, 3), dtype=np.uint8)
+        frame[:, :, 0] = 10 * i
+        frames.append(frame)
+    return frames
+
+
+def test_gif(tmp_path):
+    path = tmp_path / "out.gif"
+    with StreamingGifCreator(path, fps=20, queue_size=2) as creator:
+        for frame in make_frames(5):
+            creator.update_frame(frame)
+
+    with Image.open(path) as gif:
+        frames = [np.asarray(frame.convert("RGB")) for frame in ImageSequence.Iterator(gif)]
+        assert gif.info["duration"] == 50
+        assert gif.info["loop"] == 0
+    assert len(frames) == 5
+    for i, frame in enumerate(frames):
+        assert frame.shape == (20, 30, 3)
+        assert np.all(frame[:, :, 0] == 10 * i)
+
+
+def test_frame_skip(tmp_path):
+    path = tmp_path / "out.gif"
+    with StreamingGifCreator(path, frame_skip=2) as creator:
+        for frame in make_frames(5):
+            creator.update_frame(frame)
+    assert creator.num_updates == 5
+
+    with Image.open(path) as gif:
+        assert gif.n_frames == 3
+
+
+def test_video(tmp_path):
+    pytest.importorskip("imageio_ffmpeg")
+    path = tmp_path / "out.mp4"
+    with StreamingGifCreator(path) as creator:
+        for _ in range(5):
+            creator.update_frame(np.zeros((32, 32, 3), dtype=np.uint8))
+    assert path.stat().st_size > 0
@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+import networkx as nx
+import numpy as np
+import pytest
+from computation_sim.system import WebGLDrawer
+from computation_sim.system.webgl_drawer import (
+    DETAIL_NODE_TRACE,
+    OVERVIEW_EDGE_TRACE,
+    OVERVIEW_NODE_TRACE,
+    edge_buffers,
+    find_chains,
+)
+
+
+class FakeNode:
+    def __init__(self, id, color="darkgreen"):
+        self.id = id
+        self.color = color
+        self.num_hovertexts = 0
+
+    @property
+    def draw_style(self) -> dict:
+        return dict(color=self.color, symbol="square")
+
+    @property
+    def hovertext(self) -> str:
+        self.num_hovertexts += 1
+        return f"hover {self.id}"
+
+
+@pytest.fixture
+def graph():
+    # Two sensor chains s -> b -> c that merge in m, and a sink shared by both chains
+    nodes = {id: FakeNode(id) for id in ("s0", "b0", "c0", "s1", "b1", "c1", "m", "out", "sink")}
+    graph = nx.DiGraph()
+    for i in "01":
+        graph.add_edge(nodes[f"s{i}"], nodes[f"b{i}"])
+        graph.add_edge(nodes[f"b{i}"], nodes[f"c{i}"])
+        graph.add_edge(nodes[f"b{i}"], nodes["sink"])
+        graph.add_edge(nodes[f"c{i}"], nodes["m"])
+    graph.add_edge(nodes["m"], nodes["out"])
+    return graph
+
+
+def ids(nodes) -> list:
+    return [node.id for node in nodes]
+
+
+def test_find_chains(graph):
+    assert [ids(chain) for chain in find_chains(graph)] == [["s0", "b0", "c0"], ["s1", "b1", "c1"]]
+
+
+def test_edge_buffers():
+    x, y = edge_buffers(np.array([[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]]), np.array([[0, 1], [1, 2]]))
+    np.testing.assert_array_equal(x, [0.0, 2.0, np.nan, 2.0, 4.0, np.nan])
+    np.testing.assert_array_equal(y, [1.0, 3.0, np.nan, 3.0, 5.0, np.nan])
+
+
+def test_webgl_drawer(graph):
+    pytest.importorskip("ipywidgets")
+    drawer = WebGLDrawer(overview_min_nodes=5)
+    drawer.build(graph)
+    nodes = list(graph.nodes)
+
+    assert all(trace.type == "scattergl" for trace in drawer.fw.data)
+    # Zoomed out: The chains are collapsed into one glyph each
+    assert drawer.show_overview
+    overview = drawer.fw.data[OVERVIEW_NODE_TRACE]
+    assert sorted(overview.text) == ["m", "out", "s0", "s1", "sink"]
+    assert len(drawer.fw.data[OVERVIEW_EDGE_TRACE].x) == 3 * 5
+    # Hovertexts are not generated by updates
+    drawer.update(graph)
+    assert all(node.num_hovertexts == 0 for node in nodes)
+
+    # A chain glyph has the color of the last node in the chain
+    nodes[ids(nodes).index("c0")].color = "darkred"
+    drawer.update(graph)
+    assert overview.marker.color[list(overview.text).index("s0")] == "darkred"
+
+    # Zooming in shows all nodes
+    drawer.set_view_range((0.0, 0.1), (0.0, 0.1))
+    assert not drawer.show_overview
+    detail = drawer.fw.data[DETAIL_NODE_TRACE]
+    assert detail.visible and not overview.visible
+    assert list(detail.marker.color) == [node.color for node in nodes]
+
+    # Hovering generates the hovertext of the hovered node only; the other nodes keep their labels
+    drawer.hover(DETAIL_NODE_TRACE, SimpleNamespace(point_inds=[2]))
+    labels = [str(node.id) for node in nodes]
+    assert list(detail.hovertext) == labels[:2] + [f"hover {nodes[2].id}"] + labels[3:]
+    assert [node.num_hovertexts for node in nodes] == [int(i == 2) for i in range(len(nodes))]
+
+    # Hovering another node restores the label of the previous one
+    drawer.hover(DETAIL_NODE_TRACE, SimpleNamespace(point_inds=[4]))
+    assert list(detail.hovertext) == labels[:4] + [f"hover {nodes[4].id}"] + labels[5:]
+
+
+def test_small_graphs_are_drawn_in_detail(graph):
+    pytest.importorskip("ipywidgets")
+    drawer = WebGLDrawer()
+    drawer.build(graph)
+    drawer.set_view_range(None, None)
+    assert not drawer.show_overview
@@ -3,6 +3,7 @@ from computation_sim.time.duration_samplers import (
     FixedDuration,
     GammaDistributionSampler,
     GaussianTimeSampler,
+    UniformTimeSampler,
 )
 
 
@@ -34,3 +35,13 @@ def test_gamma():
     data_1 = [sampler.sample() for _ in range(10)]
 
     assert data_0 == data_1
+
+
+def test_uniform():
+    sampler = UniformTimeSampler(50.0, 150.0, seed=0)
+    data_0 = [sampler.sample() for _ in range(100)]
+    assert all(50 <= x <= 150 for x in data_0)
+
+    sampler.reset(0)
+    data_1 = [sampler.sample() for _ in range(100)]
+    assert data_0 == data_1
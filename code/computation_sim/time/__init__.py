@@ -4,4 +4,5 @@ from .duration_samplers import (
     FixedDuration,
     GammaDistributionSampler,
     GaussianTimeSampler,
+    UniformTimeSampler,
 )
@@ -59,3 +59,14 @@ class GammaDistributionSampler(DurationSampler):
     @round_to_fixed_point
     def sample(self) -> Time:
         return self._rng.gamma(self._k, self._theta) * self._gain + self._offset
+
+
+class UniformTimeSampler(DurationSampler):
+    def __init__(self, low: float, high: float, **kwargs):
+        super().__init__(**kwargs)
+        self._low = low
+        self._high = high
+
+    @round_to_fixed_point
+    def sample(self) -> Time:
+        return self._rng.uniform(self._low, self._high)
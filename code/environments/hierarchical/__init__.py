@@ -1,9 +1,11 @@
 import gymnasium as gym
 
 from .builder import HierarchicalSystemBuilder
+from .generator import TopologyGenerator
 from .hierarchical_system_v0 import HierarchicalSystem, InformationLossObserver
+from .history import FrameStack, ObservationHistory, VectorFrameStack
 from .reward import Reward
-from .types import ActionCollection, SystemCollection
+from .types import ActionCollection, ActionSequenceResult, SystemCollection
 
 gym.register(
     "HierarchicalSystem-v0",
@@ -74,6 +74,7 @@ class HierarchicalSystemBuilder(SystemBuidler):
         sensor_period: Time,
         sensor_disturbance: DurationSampler,
         compute_duration: DurationSampler,
+        buffer_size: int = 1,
     ) -> RingBufferNode:
         # Update samplers
         self._samplers.append(sensor_disturbance)
@@ -89,7 +90,7 @@ class HierarchicalSystemBuilder(SystemBuidler):
         sensor_buffer_node = RingBufferNode(
             self.clock.as_readonly(),
             id=f"SENS_BUF_{id}",
-            max_num_elements=1,
+            max_num_elements=buffer_size,
             age_normalizer=self.age_normalizer,
             occupancy_normalizer=self.occupancy_normalizer,
         )
@@ -111,7 +112,7 @@ class HierarchicalSystemBuilder(SystemBuidler):
         compute_buffer_node = RingBufferNode(
             self.clock.as_readonly(),
             id=f"SENS_CMP_BUF_{id}",
-            max_num_elements=1,
+            max_num_elements=buffer_size,
             age_normalizer=self.age_normalizer,
             occupancy_normalizer=self.occupancy_normalizer,
         )
@@ -132,6 +133,7 @@ class HierarchicalSystemBuilder(SystemBuidler):
         inputs: List[RingBufferNode],
         compute_duration: DurationSampler,
         filter_threshold: float = np.inf,
+        buffer_size: int = 1,
     ) -> RingBufferNode:
         # Update sampler
         self._samplers.append(compute_duration)
@@ -151,7 +153,7 @@ class HierarchicalSystemBuilder(SystemBuidler):
         buffer_node = RingBufferNode(
             self.clock.as_readonly(),
             id=f"EDGE_CMP_BUF_{id}",
-            max_num_elements=1,
+            max_num_elements=buffer_size,
             age_normalizer=self.age_normalizer,
             occupancy_normalizer=self.occupancy_normalizer,
         )
@@ -0,0 +1,166 @@
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from computation_sim.nodes import RingBufferNode, StateVariableNormalizer
+from computation_sim.time import (
+    Clock,
+    DurationSampler,
+    FixedDuration,
+    GammaDistributionSampler,
+    GaussianTimeSampler,
+    UniformTimeSampler,
+)
+
+from .builder import HierarchicalSystemBuilder
+
+# Creates a duration sampler, seeded from the generator's random number generator
+SamplerFamily = Callable[[np.random.Generator], DurationSampler]
+# Fan-in of a level: fixed, or drawn uniformly from an inclusive (low, high) range for every compute node. A tuple is
+# always a range; fan-ins per level are given as a list.
+FanIn = Union[int, Tuple[int, int]]
+
+
+def _seed(rng: np.random.Generator) -> int:
+    return int(rng.integers(2**32))
+
+
+def fixed(value: float) -> SamplerFamily:
+    return lambda rng: FixedDuration(value)
+
+
+def gaussian(mu: float, std: float, gain: float = 1.0, offset: float = 0.0) -> SamplerFamily:
+    return lambda rng: GaussianTimeSampler(mu, std, gain, offset, seed=_seed(rng))
+
+
+def gamma(k: float, theta: float, gain: float = 1.0, offset: float = 0.0) -> SamplerFamily:
+    return lambda rng: GammaDistributionSampler(k, theta, gain, offset, seed=_seed(rng))
+
+
+def uniform(low: float, high: float) -> SamplerFamily:
+    return lambda rng: UniformTimeSampler(low, high, seed=_seed(rng))
+
+
+class TopologyGenerator(object):
+    """Generates hierarchical systems: sensor chains, `depth` levels of edge computes and the output compute.
+
+    The tree is generated top-down: the output compute has `fan_in[0]` inputs, every edge compute of the first level
+    has `fan_in[1]` inputs and so on, until the edge computes of the last level, whose inputs are sensor chains. The
+    tree is balanced if all fan-ins are fixed; fan-ins given as (low, high) ranges are drawn for every node, which
+    gives random trees.
+
+    With `max_sensors`, the sensors are spread evenly: every compute node gets a share of the sensors, has as few
+    inputs as can hold its share, and splits the share among its inputs such that the shares differ by at most one.
+    With ranges, the drawn fan-ins may not hold all shares, and the tree then has fewer sensors.
+
+    Sensor periods are sampled once per sensor from `sensor_period`; sensor epochs are uniform within the period. All
+    other families create one sampler per node. The same seed always generates the same system.
+
+    Args:
+        depth: Number of edge compute levels (at least 1).
+        fan_in: One fan-in for all levels, or a list of depth + 1 fan-ins for the output compute and each edge level.
+            A fan-in is an int, or a (low, high) tuple: an inclusive range that is drawn from for every compute node.
+        sensor_period: Family of the sensor periods.
+        sensor_jitter: Family of the sensor disturbances.
+        sensor_compute: Family of the sensor compute durations.
+        edge_compute: Family of the edge compute durations.
+        output_compute: Family of the output compute durations.
+        buffer_size: Size of all buffers.
+        filter_threshold: Filter threshold of the edge and output computes.
+        max_sensors: Number of sensors to spread over the tree, at most the capacity of the fan-ins.
+    """
+
+    def __init__(
+        self,
+        depth: int = 1,
+        fan_in: Union[FanIn, Sequence[FanIn]] = 2,
+        sensor_period: SamplerFamily = fixed(100),
+        sensor_jitter: SamplerFamily = gaussian(0.0, 1.0),
+        sensor_compute: SamplerFamily = gamma(5.0, 1.0, 3.0, 30.0),
+        edge_compute: SamplerFamily = gamma(3.0, 1.0, 1.0, 30.0),
+        output_compute: SamplerFamily = gamma(9.0, 1.0, 3.0, 30.0),
+        buffer_size: int = 1,
+        filter_threshold: float = np.inf,
+        max_sensors: Optional[int] = None,
+    ):
+        if depth < 1:
+            raise ValueError("At least one level of edge computes is required.")
+        fan_in = [fan_in] * (depth + 1) if isinstance(fan_in, (int, tuple)) else list(fan_in)
+        if len(fan_in) != depth + 1:
+            raise ValueError(f"Expected {depth + 1} fan-ins (output compute and {depth} edge levels).")
+        if any(isinstance(f, tuple) and (len(f) != 2 or f[0] > f[1]) for f in fan_in):
+            raise ValueError("Fan-in ranges must be (low, high) tuples; give fan-ins per level as a list.")
+        if min(f if isinstance(f, int) else f[0] for f in fan_in) < 1:
+            raise ValueError("Fan-ins must be at least 1.")
+        self.depth = depth
+        self.fan_in = fan_in
+        self.sensor_period = sensor_period
+        self.sensor_jitter = sensor_jitter
+        self.sensor_compute = sensor_compute
+        self.edge_compute = edge_compute
+        self.output_compute = output_compute
+        self.buffer_size = buffer_size
+        self.filter_threshold = filter_threshold
+        self.max_sensors = max_sensors
+
+    def generate(
+        self,
+        seed: int = 0,
+        age_normalizer: StateVariableNormalizer = None,
+        count_normalizer: StateVariableNormalizer = None,
+        occupancy_normalizer: StateVariableNormalizer = None,
+    ) -> HierarchicalSystemBuilder:
+        """Generates and builds a system. The clock and system collection are available from the returned builder."""
+        self._rng = np.random.default_rng(seed)
+        self._num_sensors = 0
+        self._num_edges = [0] * (self.depth + 1)
+        self._builder = HierarchicalSystemBuilder(Clock(0), age_normalizer, count_normalizer, occupancy_normalizer)
+        inputs = self._generate_inputs(0, self.max_sensors)
+        self._builder.add_output_compute(inputs, self.output_compute(self._rng), self.filter_threshold)
+        self._builder.build()
+        return self._builder
+
+    def _draw_fan_in(self, level: int) -> int:
+        fan_in = self.fan_in[level]
+        if isinstance(fan_in, tuple):
+            return int(self._rng.integers(fan_in[0], fan_in[1] + 1))
+        return fan_in
+
+    def _input_capacity(self, level: int) -> int:
+        """Maximum number of sensors below each input of a compute node at `level`."""
+        return int(np.prod([f if isinstance(f, int) else f[1] for f in self.fan_in[level + 1 :]], dtype=np.int64))
+
+    def _generate_inputs(self, level: int, num_sensors: Optional[int] = None) -> List[RingBufferNode]:
+        """Generates the inputs of a compute node at `level` (0 is the output compute), with `num_sensors` sensors
+        spread evenly over them if given.
+        """
+        fan_in = self._draw_fan_in(level)
+        if num_sensors is None:
+            shares = [None] * fan_in
+        else:
+            num_inputs = min(fan_in, -(-num_sensors // self._input_capacity(level)))
+            shares = [num_sensors // num_inputs + (i < num_sensors % num_inputs) for i in range(num_inputs)]
+        if level == self.depth:
+            return [self._add_sensor_chain() for _ in shares]
+        return [self._add_edge_compute(level + 1, share) for share in shares]
+
+    def _add_sensor_chain(self) -> RingBufferNode:
+        period = self.sensor_period(self._rng).sample()
+        epoch = int(self._rng.integers(0, max(int(period), 1)))
+        buffer = self._builder.add_sensor_chain(
+            str(self._num_sensors),
+            epoch,
+            period,
+            self.sensor_jitter(self._rng),
+            self.sensor_compute(self._rng),
+            buffer_size=self.buffer_size,
+        )
+        self._num_sensors += 1
+        return buffer
+
+    def _add_edge_compute(self, level: int, num_sensors: Optional[int] = None) -> RingBufferNode:
+        inputs = self._generate_inputs(level, num_sensors)
+        id = f"{level}_{self._num_edges[level]}"
+        self._num_edges[level] += 1
+        return self._builder.add_edge_compute(
+            id, inputs, self.edge_compute(self._rng), self.filter_threshold, buffer_size=self.buffer_size
+        )
@@ -1,6 +1,5 @@
 from collections import defaultdict
-from threading import Thread
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 import computation_sim.system as system
 import gymnasium as gym
@@ -8,12 +7,12 @@ import networkx as nx
 import numpy as np
 from computation_sim.basic_types import Header, Time
 from computation_sim.nodes import Node
-from computation_sim.system import ImageCreator, SystemDrawer
+from computation_sim.system import RasterDrawer, RenderPool, SystemDrawer, WebGLDrawer
 from computation_sim.time import Clock, as_age
-from dash import Dash, Input, Output, dcc, html
 
+from .live_view import LiveView
 from .reward import Reward
-from .types import ActionCollection, SystemCollection
+from .types import ActionCollection, ActionSequenceResult, SystemCollection
 
 
 def count_upstream_sources(system_collection: SystemCollection) -> Dict[Node, int]:
@@ -26,8 +25,20 @@ def count_upstream_sources(system_collection: SystemCollection) -> Dict[Node, in
     return upstream_sensor_count
 
 
-def build_system_drawer(env, width=800, height=800) -> SystemDrawer:
-    drawer = SystemDrawer()
+# Render backend -> supported render modes
+RENDER_BACKENDS = {
+    "plotly": ("human", "rgb_array", "jupyter"),
+    "raster": ("rgb_array",),
+    "webgl": ("jupyter",),
+}
+
+
+def build_system_drawer(env, width=800, height=800, backend="plotly") -> SystemDrawer:
+    if backend == "raster":
+        drawer = RasterDrawer(width, height)
+        drawer.build(env.system.node_graph)
+        return drawer
+    drawer = WebGLDrawer() if backend == "webgl" else SystemDrawer()
     drawer.build(env.system.node_graph)
     drawer.fw.update_layout(width=width, height=height)
     return drawer
@@ -72,6 +83,19 @@ class InformationLossObserver:
 
 
 class HierarchicalSystem(gym.Env):
+    """Gym environment of a hierarchical system; every step applies an action and advances the clock by `dt`.
+
+    Observations are float64 arrays by default. With `observation_dtype` (e.g. np.float32) and `reuse_observation`,
+    the env writes observations into one buffer that it owns, or into the caller's `observation_buffer`, and
+    `observation_tensor` shares that buffer with torch.
+
+    In semi-MDP mode (`decision_epochs`), `step` keeps advancing by `dt` with no-op actions after applying the action,
+    until the next decision epoch: a busy compute node has become ready, or a new input has arrived at the input
+    buffers of a ready compute node. Most steps of the default mode are forced no-ops, which this mode skips. The
+    rewards of all ticks are accumulated, discounted by `epoch_discount` per tick, and the info reports the
+    `elapsed_time` and `num_ticks` of every step. `max_epoch_ticks` limits the number of ticks of a step.
+    """
+
     metadata = {"render_modes": ["human", "rgb_array", "jupyter"], "render_fps": 10}
 
     def __init__(
@@ -82,7 +106,15 @@ class HierarchicalSystem(gym.Env):
         dt: Time = 10,
         render_mode=None,
         window_size=(800, 800),
-        **kwargs
+        render_workers: int = 0,
+        render_backend: str = "plotly",
+        decision_epochs: bool = False,
+        epoch_discount: float = 1.0,
+        max_epoch_ticks: int = None,
+        observation_dtype=float,
+        reuse_observation: bool = False,
+        observation_buffer: np.ndarray = None,
+        **kwargs,
     ):
         super().__init__(**kwargs)
         # Store init params
@@ -90,12 +122,26 @@ class HierarchicalSystem(gym.Env):
         self._system_collection: SystemCollection = system_collection
         self._reward: Reward = reward
         self._dt = dt
+        self._decision_epochs = decision_epochs
+        self._epoch_discount = epoch_discount
+        self._max_epoch_ticks = max_epoch_ticks
 
         # Set dimensionality of action / observation spaces
         self.action_space = gym.spaces.Discrete(system.num_actions(self.system.num_action))
-        lb = -np.inf * np.ones((len(self.system.state),), dtype=float)
-        ub = +np.inf * np.ones((len(self.system.state),), dtype=float)
-        self.observation_space = gym.spaces.Box(lb, ub, dtype=float)
+        state_size = len(self.system.state)
+        if observation_buffer is not None:
+            if observation_buffer.shape != (state_size,):
+                raise ValueError(f"The observation buffer must have shape ({state_size},).")
+            observation_dtype = observation_buffer.dtype
+        elif reuse_observation:
+            observation_buffer = np.zeros((state_size,), dtype=observation_dtype)
+        lb = np.full((state_size,), -np.inf, dtype=observation_dtype)
+        ub = np.full((state_size,), np.inf, dtype=observation_dtype)
+        self.observation_space = gym.spaces.Box(lb, ub, dtype=observation_dtype)
+
+        # Observations are written into this buffer and returned without copying, if set
+        self._observation = observation_buffer
+        self._observation_tensor = None
 
         # Setup rendering
         self.render_mode = render_mode
@@ -103,26 +149,26 @@ class HierarchicalSystem(gym.Env):
 
         # Drawer converts the system graph into a plotly figure
         self.drawer = None
+        # The raster backend draws rgb_array frames with numpy, which is much faster than exporting plotly figures.
+        # The webgl backend draws large systems in jupyter, where it switches the level of detail when zooming.
+        if render_backend not in RENDER_BACKENDS:
+            raise ValueError(f"Unknown render backend {render_backend!r}; expected one of {list(RENDER_BACKENDS)}.")
+        if self.render_mode is not None and self.render_mode not in RENDER_BACKENDS[render_backend]:
+            raise ValueError(f"The {render_backend} backend does not support the {self.render_mode} render mode.")
         if self.render_mode is not None:
-            self.drawer = build_system_drawer(self, *self.window_size)
+            self.drawer = build_system_drawer(self, *self.window_size, backend=render_backend)
 
-        # Human rendering: Setup dash window
-        self.window = None
-        if self.render_mode == "human":
-            self.window = Dash(__name__)
-            self.window.layout = html.Div(
-                [dcc.Graph(id="graph"), dcc.Interval(id="interval", interval=1000 / self.metadata["render_fps"])]
-            )
-
-            @self.window.callback(Output("graph", "figure"), Input("interval", "n_intervals"))
-            def update_graph(n_intervals):
-                return self.drawer.fw
+        # rgb_array rendering: Rasterize frames in background processes, if requested
+        self.renderer = None
+        if self.render_mode == "rgb_array" and render_workers > 0:
+            if render_backend != "plotly":
+                raise ValueError(f"Render workers only rasterize plotly figures, not the {render_backend} backend.")
+            self.renderer = RenderPool(self.drawer, num_workers=render_workers)
 
-            # self.window_port = 8050
-            # self.window.run_server(debug=False, port = self.window_port)
-
-        # Human rendering: Dash runs in a separate thread
-        self.dash_thread = None
+        # Human rendering: Dash app that receives per-node updates; it is served in a separate thread
+        self.live_view = None
+        if self.render_mode == "human":
+            self.live_view = LiveView(self.drawer, fps=self.metadata["render_fps"])
 
     @property
     def system(self) -> system.System:
@@ -134,7 +180,25 @@ class HierarchicalSystem(gym.Env):
 
     @property
     def state(self) -> np.ndarray:
-        return np.array(self.system.state).flatten()
+        """The observation; with a reused observation buffer, this is the buffer, which is overwritten by every
+        observation. Observations that are kept, e.g. in a replay memory, must be copied then.
+        """
+        if self._observation is not None:
+            return self.system.write_state(self._observation)
+        return np.array(self.system.state, dtype=self.observation_space.dtype)
+
+    @property
+    def observation_tensor(self):
+        """(1, state size) torch tensor that shares memory with the observation buffer, such that observations reach
+        a policy network without copying. Only available with a reused observation buffer.
+        """
+        if self._observation is None:
+            raise RuntimeError("Observation tensors require reuse_observation or an observation_buffer.")
+        if self._observation_tensor is None:
+            import torch
+
+            self._observation_tensor = torch.from_numpy(self._observation).unsqueeze(0)
+        return self._observation_tensor
 
     @property
     def output_age(self) -> Header:
@@ -161,6 +225,8 @@ class HierarchicalSystem(gym.Env):
         self.clock.reset()
         self.system.reset()
         self.system.update()
+        if self.renderer is not None:
+            self.renderer.submit(self.drawer.snapshot(self.system.node_graph))
         return self.state, {}
 
     def act(self, action: List[int]):
@@ -171,6 +237,91 @@ class HierarchicalSystem(gym.Env):
         self.system.update()
 
     def step(self, action: int):
+        action = system.unpack_action(self.system.num_action, action)
+        if self._decision_epochs:
+            reward, info = self._step_to_decision_epoch(action)
+        else:
+            reward, info = self._tick(action)
+            info.update(elapsed_time=self._dt, num_ticks=1)
+
+        # Render
+        if self.renderer is not None:
+            # Only snapshot the draw state; the frame is rasterized in the background
+            self.renderer.submit(self.drawer.snapshot(self.system.node_graph))
+        elif self.live_view is not None:
+            # Rate-limited by the live view, the dashboard does not slow down the simulation
+            self.live_view.publish(self.system.node_graph)
+            self.render()
+        else:
+            self._draw()
+            self.render()
+
+        # Build the reward
+        return self.state, reward, False, False, info
+
+    def run_actions(self, actions: np.ndarray) -> ActionSequenceResult:
+        """Executes a sequence of (num_steps,) packed or (num_steps, num_action) unpacked actions, one tick each.
+
+        Rewards, losses and output ages equal those of stepping with the same actions, but no info dicts are built
+        and nothing is rendered while running; the drawer is only updated at the end. Decision epochs do not apply.
+        """
+        actions = np.asarray(actions)
+        if actions.ndim == 1:
+            table = np.array([system.unpack_action(self.system.num_action, a) for a in range(self.action_space.n)])
+            actions = table[actions]
+        num_steps = len(actions)
+        collections = self._system_collection.action_collections
+        sinks = self._system_collection.sinks
+        output = self._system_collection.output
+        # The graph does not change while running, so the upstream sources are only counted once
+        upstream_sources = count_upstream_sources(self._system_collection)
+        num_sources = [upstream_sources[collection.node] for collection in collections]
+        num_inputs = [len(collection.input_buffers) for collection in collections]
+
+        buffer_overrides = np.zeros(num_steps, dtype=np.int64)
+        missing_inputs = np.zeros(num_steps, dtype=np.int64)
+        missing_measurements = np.zeros(num_steps, dtype=np.int64)
+        output_ages = np.zeros((num_steps, 3))
+        for i, action in enumerate(actions):
+            for sink in sinks:
+                sink.reset()
+            idle = [not collection.node.is_busy for collection in collections]
+            self.act(action)
+            self.advance()
+
+            buffer_overrides[i] = sum(sink.count for sink in sinks)
+            for collection, was_idle, sources, inputs in zip(collections, idle, num_sources, num_inputs):
+                node = collection.node
+                if was_idle and node.is_busy:
+                    missing_inputs[i] += inputs - node.filtered_input_count
+                    missing_measurements[i] += sources - node.total_measurement_count
+            now = self.clock.get_time()
+            last_received = output.last_received
+            if last_received:
+                header = last_received.header
+                output_ages[i] = (
+                    as_age(header.t_measure_youngest, now),
+                    as_age(header.t_measure_oldest, now),
+                    as_age(header.t_measure_average, now),
+                )
+            else:
+                output_ages[i] = as_age(self.clock.initial_time, now)
+        self._draw()
+
+        num_activations = np.count_nonzero(actions, axis=1)
+        rewards = self._reward.from_counts(num_activations, buffer_overrides + missing_measurements, output_ages[:, 2])
+        return ActionSequenceResult(
+            rewards,
+            buffer_overrides,
+            missing_inputs,
+            missing_measurements,
+            output_ages[:, 0],
+            output_ages[:, 1],
+            output_ages[:, 2],
+        )
+
+    def _tick(self, action: np.ndarray, on_act=None) -> Tuple[float, dict]:
+        """Applies an unpacked action and advances the system by dt. Returns the reward and info of the tick."""
         # Reset the sinks that count number of lost messages
         # This means, we count the number of lost messages from now on.
         for sink in self._system_collection.sinks:
@@ -180,8 +331,9 @@ class HierarchicalSystem(gym.Env):
         observer = InformationLossObserver(self._system_collection)
 
         # Apply the action and advance the system
-        action = system.unpack_action(self.system.num_action, action)
         self.act(action)
+        if on_act is not None:
+            on_act()
         self.advance()
 
         # Construct info
@@ -189,16 +341,49 @@ class HierarchicalSystem(gym.Env):
             buffer_overrides=observer.buffer_overrides,
             missing_inputs=observer.missing_inputs,
             missing_measurements=observer.missing_measurements,
-            **self.output_age
+            **self.output_age,
         )
         reward = self._reward(action, info["buffer_overrides"], info["missing_measurements"], info["output_age_avg"])
-
-        # Render
-        self._draw()
-        self.render()
-
-        # Build the reward
-        return self.state, reward, False, False, info
+        return reward, info
+
+    def _epoch_snapshot(self) -> List[Tuple[bool, int]]:
+        """Busy flag and number of received inputs of every action node."""
+        return [
+            (collection.node.is_busy, sum(buffer.receive_count for buffer in collection.input_buffers))
+            for collection in self._system_collection.action_collections
+        ]
+
+    def _is_decision_epoch(self, snapshot: List[Tuple[bool, int]]) -> bool:
+        for (was_busy, num_received), (is_busy, now_received) in zip(snapshot, self._epoch_snapshot()):
+            if not is_busy and (was_busy or now_received != num_received):
+                return True
+        return False
+
+    def _step_to_decision_epoch(self, action: np.ndarray) -> Tuple[float, dict]:
+        # The epoch starts after the action was applied, such that nodes that were just activated count as busy
+        snapshot = []
+        reward, info = self._tick(action, on_act=lambda: snapshot.extend(self._epoch_snapshot()))
+        no_op = np.zeros_like(action)
+        num_ticks = 1
+        while not self._is_decision_epoch(snapshot):
+            if self._max_epoch_ticks is not None and num_ticks >= self._max_epoch_ticks:
+                break
+            tick_reward, tick_info = self._tick(no_op)
+            reward += self._epoch_discount**num_ticks * tick_reward
+            # Losses are summed over the ticks, output ages are those of the last tick
+            for key in ("buffer_overrides", "missing_inputs", "missing_measurements"):
+                for id, count in tick_info.pop(key).items():
+                    info[key][id] = info[key].get(id, 0) + count
+            info.update(tick_info)
+            num_ticks += 1
+        info.update(elapsed_time=num_ticks * self._dt, num_ticks=num_ticks)
+        return reward, info
+
+    def close(self):
+        if self.renderer is not None:
+            self.renderer.close()
+            self.renderer = None
+        super().close()
 
     def _draw(self):
         if self.drawer is not None:
@@ -206,13 +391,11 @@ class HierarchicalSystem(gym.Env):
 
     def render(self):
         if self.render_mode == "rgb_array":
-            return np.asarray(ImageCreator().to_image(self.drawer), np.uint8)
+            if self.renderer is not None:
+                return self.renderer.latest_frame()
+            return self.drawer.to_array()
         elif self.render_mode == "human":
-            if self.dash_thread is None:
-                self.dash_thread = Thread(target=lambda: self.window.run_server(debug=False))
-                self.dash_thread.daemon = True
-                self.dash_thread.start()
-            pass
+            self.live_view.start()
         elif self.render_mode == "jupyter":
             return self.drawer.fw
         else:
@@ -0,0 +1,120 @@
+from typing import Tuple
+
+import gymnasium as gym
+import numpy as np
+from gymnasium.vector import AutoresetMode, VectorWrapper
+from gymnasium.vector.utils import batch_space
+
+
+class ObservationHistory(object):
+    """The last `k` observations of one environment, or of `num_envs` environments that are stepped together.
+
+    Every observation is written twice into a (num_envs, 2k, ...) buffer, at slots i and i + k. The last k
+    observations are then always the consecutive rows after the newest slot, such that `stacked` is a view of them,
+    oldest first, without copying; for a single environment, the view is even contiguous. The view is overwritten by
+    later pushes; `copy` returns a contiguous copy.
+    """
+
+    def __init__(self, k: int, observation_shape: Tuple[int, ...], num_envs: int = None, dtype=np.float32):
+        self.k = k
+        self.num_envs = num_envs
+        self._buffer = np.zeros((1 if num_envs is None else num_envs, 2 * k) + tuple(observation_shape), dtype=dtype)
+        self._position = k - 1
+
+    def reset(self, observation: np.ndarray, mask: np.ndarray = None) -> None:
+        """Fills all k frames with the observation, only of the environments in `mask` if given."""
+        observation = self._batched(observation)
+        if mask is None:
+            self._buffer[:] = observation[:, np.newaxis]
+        else:
+            self._buffer[mask] = observation[mask][:, np.newaxis]
+
+    def push(self, observation: np.ndarray) -> None:
+        observation = self._batched(observation)
+        self._position = (self._position + 1) % self.k
+        self._buffer[:, self._position] = observation
+        self._buffer[:, self._position + self.k] = observation
+
+    @property
+    def stacked(self) -> np.ndarray:
+        """(k, ...) view of the last k observations, or (num_envs, k, ...) for multiple environments."""
+        stacked = self._buffer[:, self._position + 1 : self._position + 1 + self.k]
+        return stacked[0] if self.num_envs is None else stacked
+
+    def copy(self) -> np.ndarray:
+        return self.stacked.copy()
+
+    def _batched(self, observation: np.ndarray) -> np.ndarray:
+        return observation[np.newaxis] if self.num_envs is None else observation
+
+
+def _stacked_space(space: gym.spaces.Box, k: int, dtype) -> gym.spaces.Box:
+    low = np.repeat(space.low[np.newaxis], k, axis=0)
+    high = np.repeat(space.high[np.newaxis], k, axis=0)
+    return gym.spaces.Box(low, high, dtype=dtype)
+
+
+class FrameStack(gym.Wrapper):
+    """Observations of the last `k` steps, as (k, obs_dim) arrays, oldest first.
+
+    After a reset, all frames are the reset observation. By default, observations are views of the history, which are
+    overwritten by the next step; with `copy`, they are contiguous copies.
+    """
+
+    def __init__(self, env: gym.Env, k: int, dtype=None, copy: bool = False):
+        super().__init__(env)
+        dtype = env.observation_space.dtype if dtype is None else dtype
+        self.observation_space = _stacked_space(env.observation_space, k, dtype)
+        self.history = ObservationHistory(k, env.observation_space.shape, dtype=dtype)
+        self._copy = copy
+
+    def reset(self, *, seed=None, options=None):
+        observation, info = self.env.reset(seed=seed, options=options)
+        self.history.reset(observation)
+        return self._observation(), info
+
+    def step(self, action):
+        observation, reward, terminated, truncated, info = self.env.step(action)
+        self.history.push(observation)
+        return self._observation(), reward, terminated, truncated, info
+
+    def _observation(self) -> np.ndarray:
+        return self.history.copy() if self._copy else self.history.stacked
+
+
+class VectorFrameStack(VectorWrapper):
+    """`FrameStack` for vector environments, with (num_envs, k, obs_dim) observations.
+
+    The history of a sub-environment is reset whenever it is reset, for all autoreset modes: in the step after it
+    ended (next step), in the step in which it ended (same step), or by `reset` with a `reset_mask` option (disabled).
+    """
+
+    def __init__(self, env: gym.vector.VectorEnv, k: int, dtype=None, copy: bool = False):
+        super().__init__(env)
+        dtype = env.single_observation_space.dtype if dtype is None else dtype
+        self.single_observation_space = _stacked_space(env.single_observation_space, k, dtype)
+        self.observation_space = batch_space(self.single_observation_space, env.num_envs)
+        self.history = ObservationHistory(k, env.single_observation_space.shape, env.num_envs, dtype)
+        self._autoreset_mode = env.metadata.get("autoreset_mode", AutoresetMode.NEXT_STEP)
+        self._needs_reset = np.zeros(env.num_envs, dtype=bool)
+        self._copy = copy
+
+    def reset(self, *, seed=None, options=None):
+        observations, infos = self.env.reset(seed=seed, options=options)
+        self.history.reset(observations, None if options is None else options.get("reset_mask"))
+        self._needs_reset[:] = False
+        return self._observation(), infos
+
+    def step(self, actions):
+        observations, rewards, terminations, truncations, infos = self.env.step(actions)
+        self.history.push(observations)
+        if self._autoreset_mode == AutoresetMode.NEXT_STEP:
+            # The observations of environments that ended in the previous step are reset observations
+            self.history.reset(observations, self._needs_reset)
+            np.logical_or(terminations, truncations, out=self._needs_reset)
+        elif self._autoreset_mode == AutoresetMode.SAME_STEP:
+            self.history.reset(observations, np.logical_or(terminations, truncations))
+        return self._observation(), rewards, terminations, truncations, infos
+
+    def _observation(self) -> np.ndarray:
+        return self.history.copy() if self._copy else self.history.stacked
@@ -0,0 +1,119 @@
+import time
+from collections import OrderedDict
+from threading import Lock, Thread
+from typing import Dict, Tuple
+
+import networkx as nx
+from computation_sim.system import SystemDrawer
+
+# Per-node properties that change while the system runs, and their location in the drawer's node scatter trace
+NODE_PROPERTIES = {
+    "color": ("marker", "color"),
+    "symbol": ("marker", "symbol"),
+    "hovertext": ("hovertext",),
+}
+NODE_TRACE = 1
+
+
+class LiveView(object):
+    """Dash app that shows the system graph and pushes per-node changes to the browser.
+
+    The full figure (edges and nodes) is only sent when the page loads. Afterwards, the browser polls at `fps` and
+    receives a patch with the colors, symbols and hovertexts of the nodes that changed since its last poll.
+
+    The simulation publishes snapshots of the draw state with `publish`, which is rate-limited to `fps`, such that
+    neither stepping faster nor slower than the dashboard affects the other.
+    """
+
+    def __init__(self, drawer: SystemDrawer, fps: float = 10, history_size: int = 32):
+        from dash import Dash, Input, Output, State, dcc, html
+
+        self._drawer = drawer
+        self._period = 1.0 / fps
+        self._history_size = history_size
+        self._lock = Lock()
+        self._last_publish = -float("inf")
+        self._version = 0
+        # Snapshots of the last versions; version 0 is the state of the initial figure
+        self._initial = self._figure_options()
+        self._history: Dict[int, dict] = OrderedDict({0: self._initial})
+        self._thread = None
+
+        self.app = Dash(__name__)
+        self.app.layout = html.Div(
+            [
+                dcc.Graph(id="graph", figure=drawer.fw),
+                dcc.Store(id="version", data=0),
+                dcc.Interval(id="interval", interval=1000 * self._period),
+            ]
+        )
+
+        @self.app.callback(
+            Output("graph", "figure"),
+            Output("version", "data"),
+            Input("interval", "n_intervals"),
+            State("version", "data"),
+        )
+        def update_graph(n_intervals, client_version):
+            changes, version = self.changes_since(client_version)
+            return self._to_patch(changes), version
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def publish(self, graph: nx.DiGraph, force: bool = False) -> bool:
+        """Snapshots the draw state of the graph, unless the last snapshot is younger than the frame period."""
+        now = time.monotonic()
+        if not force and now - self._last_publish < self._period:
+            return False
+        self._last_publish = now
+        snapshot = self._drawer.snapshot(graph)
+        with self._lock:
+            self._version += 1
+            self._history[self._version] = snapshot
+            while len(self._history) > self._history_size:
+                self._history.popitem(last=False)
+        return True
+
+    def changes_since(self, client_version: int) -> Tuple[Dict[str, Dict[int, object]], int]:
+        """Returns {property: {node index: value}} of all nodes that changed since the client's version."""
+        with self._lock:
+            version = self._version
+            latest = self._history[version]
+            base = self._history.get(client_version, self._initial if client_version == 0 else None)
+
+        changes = {}
+        for key in NODE_PROPERTIES:
+            if base is None:
+                # The client's version is no longer known: send all nodes
+                changes[key] = dict(enumerate(latest[key]))
+            else:
+                changes[key] = {i: new for i, (old, new) in enumerate(zip(base[key], latest[key])) if old != new}
+        return changes, version
+
+    def start(self, **kwargs) -> None:
+        """Runs the dash server in a daemon thread."""
+        if self._thread is None:
+            self._thread = Thread(target=lambda: self.app.run(debug=False, **kwargs), daemon=True)
+            self._thread.start()
+
+    def _figure_options(self) -> dict:
+        node_scatter = self._drawer.fw.data[NODE_TRACE]
+        return dict(
+            color=list(node_scatter.marker.color),
+            symbol=list(node_scatter.marker.symbol),
+            hovertext=list(node_scatter.hovertext),
+        )
+
+    def _to_patch(self, changes: Dict[str, Dict[int, object]]):
+        from dash import Patch
+
+        patch = Patch()
+        for key, location in NODE_PROPERTIES.items():
+            for i, value in changes[key].items():
+                target = patch["data"][NODE_TRACE]
+                for part in location:
+                    target = target[part]
+                target[i] = value
+        return patch
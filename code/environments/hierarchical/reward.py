@@ -19,8 +19,13 @@ class Reward:
         self, action: List[int], buffer_overrides: Dict[str, int], missing_inputs: Dict[str, int], output_age: Time
     ) -> float:
         num_overrides_and_missing = sum(buffer_overrides.values()) + sum(missing_inputs.values())
-        num_activations = np.count_nonzero(action)
-        reward = -self._cost_message_loss * float(num_overrides_and_missing)
-        reward -= self._cost_output_age * float(output_age)
-        reward -= self._cost_activations * float(num_activations)
+        return float(self.from_counts(np.count_nonzero(action), num_overrides_and_missing, float(output_age)))
+
+    def from_counts(self, num_activations, num_lost, output_age):
+        """Reward from the number of activations, the number of lost messages and the output age; these can also be
+        arrays of many steps.
+        """
+        reward = -self._cost_message_loss * np.asarray(num_lost, dtype=float)
+        reward -= self._cost_output_age * np.asarray(output_age, dtype=float)
+        reward -= self._cost_activations * np.asarray(num_activations, dtype=float)
         return reward
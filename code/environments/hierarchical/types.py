@@ -1,5 +1,6 @@
 from typing import List, NamedTuple
 
+import numpy as np
 from computation_sim.nodes import (
     FilteringMISONode,
     OutputNode,
@@ -24,3 +25,15 @@ class SystemCollection(NamedTuple):
     action_collections: List[ActionCollection]
     output: OutputNode
     samplers: List[DurationSampler]
+
+
+class ActionSequenceResult(NamedTuple):
+    """Per-step results of `HierarchicalSystem.run_actions`; all fields are (num_steps,) arrays."""
+
+    rewards: np.ndarray
+    buffer_overrides: np.ndarray
+    missing_inputs: np.ndarray
+    missing_measurements: np.ndarray
+    output_age_min: np.ndarray
+    output_age_max: np.ndarray
+    output_age_avg: np.ndarray
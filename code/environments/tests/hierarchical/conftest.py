@@ -0,0 +1,45 @@
+import pytest
+from computation_sim.time import Clock, FixedDuration
+from environments.hierarchical import (
+    HierarchicalSystem,
+    HierarchicalSystemBuilder,
+    Reward,
+    TopologyGenerator,
+)
+from environments.hierarchical.generator import fixed
+
+
+def build_env(**kwargs) -> HierarchicalSystem:
+    """Two sensor chains, one edge compute and the output compute, with fixed durations. Keyword arguments are passed
+    to the environment.
+    """
+    clock = Clock(0)
+    builder = HierarchicalSystemBuilder(clock)
+    s = [
+        builder.add_sensor_chain("0", 0, 100, FixedDuration(0), FixedDuration(10)),
+        builder.add_sensor_chain("1", 0, 100, FixedDuration(0), FixedDuration(10)),
+    ]
+    builder.add_output_compute([builder.add_edge_compute("0", s, FixedDuration(10))], FixedDuration(10))
+    builder.build()
+    return HierarchicalSystem(clock, builder.system_collection, Reward(), **kwargs)
+
+
+def generate_env(**kwargs) -> HierarchicalSystem:
+    """Generated system with two edge computes of two sensors each, whose computes take several ticks, such that
+    inputs are lost and filtered. Keyword arguments are passed to the environment.
+    """
+    generator = TopologyGenerator(depth=1, fan_in=2, edge_compute=fixed(40), output_compute=fixed(60))
+    builder = generator.generate(seed=1)
+    return HierarchicalSystem(builder.clock, builder.system_collection, Reward(1.0, 0.01, 0.1), **kwargs)
+
+
+@pytest.fixture
+def make_env():
+    """Factory of `build_env` environments."""
+    return build_env
+
+
+@pytest.fixture
+def make_generated_env():
+    """Factory of `generate_env` environments."""
+    return generate_env
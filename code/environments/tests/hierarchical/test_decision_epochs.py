@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+
+def test_decision_epochs_match_ticks(make_generated_env):
+    """A semi-MDP step equals the action followed by no-ops in the default mode."""
+    smdp, env = make_generated_env(decision_epochs=True, epoch_discount=0.9), make_generated_env()
+    smdp.reset(seed=0)
+    env.reset(seed=0)
+    rng = np.random.default_rng(0)
+    num_steps = 0
+    while smdp.time < 3000:
+        action = int(rng.integers(smdp.action_space.n))
+        state, reward, _, _, info = smdp.step(action)
+        assert info["elapsed_time"] == info["num_ticks"] * 10
+
+        expected_reward = 0.0
+        for tick in range(info["num_ticks"]):
+            expected_state, tick_reward, _, _, tick_info = env.step(action if tick == 0 else 0)
+            expected_reward += 0.9**tick * tick_reward
+        np.testing.assert_array_equal(state, expected_state)
+        assert reward == pytest.approx(expected_reward)
+        assert info["output_age_avg"] == tick_info["output_age_avg"]
+        num_steps += 1
+    # Most ticks are skipped
+    assert num_steps < 3000 / 10 / 2
+
+
+def test_decision_epochs_limit(make_generated_env):
+    env = make_generated_env(decision_epochs=True, max_epoch_ticks=2)
+    env.reset(seed=0)
+    for _ in range(20):
+        _, _, _, _, info = env.step(env.action_space.n - 1)
+        assert 1 <= info["num_ticks"] <= 2
+    assert make_generated_env().step(0)[4]["num_ticks"] == 1
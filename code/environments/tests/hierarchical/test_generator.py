@@ -0,0 +1,76 @@
+import networkx as nx
+import numpy as np
+import pytest
+from computation_sim.nodes import SourceNode
+from environments.hierarchical import HierarchicalSystem, Reward, TopologyGenerator
+from environments.hierarchical.generator import fixed, gamma, uniform
+
+
+def sensor_counts(builder) -> dict:
+    """Number of sensor chains feeding each action node."""
+    graph = builder.system_collection.system.node_graph
+    return {
+        collection.node.id: sum(isinstance(node, SourceNode) for node in nx.ancestors(graph, collection.node))
+        for collection in builder.system_collection.action_collections
+    }
+
+
+def test_balanced_tree():
+    builder = TopologyGenerator(depth=2, fan_in=[2, 3, 4]).generate()
+    collection = builder.system_collection
+    assert len(collection.sources) == 2 * 3 * 4
+    assert len(collection.action_collections) == 2 * 3 + 2 + 1
+    counts = sensor_counts(builder)
+    assert counts["OUTPUT_CMP"] == 24
+    assert counts["EDGE_CMP_1_0"] == 12
+    assert counts["EDGE_CMP_2_0"] == 4
+
+
+def test_random_tree_is_deterministic():
+    generator = TopologyGenerator(depth=3, fan_in=(1, 4), sensor_period=uniform(50, 150))
+    systems = [sensor_counts(generator.generate(seed)) for seed in (0, 0, 1)]
+    assert systems[0] == systems[1]
+    assert systems[0] != systems[2]
+
+
+def test_max_sensors():
+    builder = TopologyGenerator(depth=2, fan_in=10, max_sensors=25).generate()
+    assert len(builder.system_collection.sources) == 25
+    # 3 edge computes on the lowest level, 1 above, and the output compute
+    assert len(builder.system_collection.action_collections) == 3 + 1 + 1
+    # The sensors are spread evenly over the edge computes of the lowest level
+    assert sorted(count for id, count in sensor_counts(builder).items() if id.startswith("EDGE_CMP_2")) == [8, 8, 9]
+
+    builder = TopologyGenerator(depth=2, fan_in=4, max_sensors=20).generate()
+    counts = sensor_counts(builder)
+    assert [counts[f"EDGE_CMP_1_{i}"] for i in range(2)] == [10, 10]
+    assert sorted(count for id, count in counts.items() if id.startswith("EDGE_CMP_2")) == [3, 3, 3, 3, 4, 4]
+
+
+def test_large_system():
+    builder = TopologyGenerator(depth=3, fan_in=[4, 5, 5, 10], edge_compute=fixed(20)).generate()
+    assert builder.system_collection.system.num_nodes > 4000
+
+
+def test_env_from_generated_system():
+    generator = TopologyGenerator(depth=1, fan_in=[2, 3], sensor_compute=gamma(2.0, 1.0, 1.0, 10.0))
+    builder = generator.generate(seed=5)
+    env = HierarchicalSystem(builder.clock, builder.system_collection, Reward())
+    state, _ = env.reset(seed=0)
+    for action in range(env.action_space.n):
+        state, reward, *_ = env.step(action)
+    assert np.all(np.isfinite(state))
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        TopologyGenerator(depth=0)
+    with pytest.raises(ValueError):
+        TopologyGenerator(depth=2, fan_in=[2, 2])
+    with pytest.raises(ValueError):
+        TopologyGenerator(depth=1, fan_in=(0, 2))
+    # Tuples are ranges, not per-level fan-ins
+    with pytest.raises(ValueError):
+        TopologyGenerator(depth=2, fan_in=(2, 3, 4))
+    with pytest.raises(ValueError):
+        TopologyGenerator(depth=1, fan_in=(4, 2))
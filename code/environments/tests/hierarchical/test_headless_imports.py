@@ -0,0 +1,39 @@
+import json
+import pathlib
+import subprocess
+import sys
+
+# Modules used by headless workers (simulation and experience collection only)
+HEADLESS_MODULES = ["computation_sim", "computation_sim.system", "environments.hierarchical", "agents.buffer"]
+
+# Rendering and learning dependencies, which must only be imported on first use
+LAZY_MODULES = ["torch", "plotly", "dash", "imageio", "PIL", "matplotlib"]
+
+# Generous upper bound for the import time; without the lazy modules, imports take a fraction of it
+IMPORT_TIME_BUDGET = 2.0
+
+
+def measure_imports(modules, watched=LAZY_MODULES):
+    script = f"""
+import importlib, json, sys, time
+start = time.perf_counter()
+for module in {modules!r}:
+    importlib.import_module(module)
+duration = time.perf_counter() - start
+print(json.dumps(dict(duration=duration, loaded=[m for m in {watched!r} if m in sys.modules])))
+"""
+    code_dir = pathlib.Path(__file__).parents[3]
+    result = subprocess.run([sys.executable, "-c", script], cwd=code_dir, check=True, capture_output=True, text=True)
+    return json.loads(result.stdout)
+
+
+def test_headless_imports():
+    result = measure_imports(HEADLESS_MODULES)
+    assert result["loaded"] == []
+    assert result["duration"] < IMPORT_TIME_BUDGET
+
+
+def test_replay_memory_imports():
+    # The replay memories are generic; collectors of other environments must not import the simulator
+    result = measure_imports(["agents.buffer"], watched=LAZY_MODULES + ["computation_sim", "networkx"])
+    assert result["loaded"] == []
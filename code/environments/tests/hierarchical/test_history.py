@@ -0,0 +1,84 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+from environments.hierarchical import (
+    FrameStack,
+    ObservationHistory,
+    VectorFrameStack,
+)
+from gymnasium.vector import AutoresetMode, SyncVectorEnv
+
+
+def time_limited(env: gym.Env, max_episode_steps: int) -> gym.Env:
+    return gym.wrappers.TimeLimit(env, max_episode_steps)
+
+
+def test_observation_history():
+    history = ObservationHistory(3, (2,), dtype=np.float64)
+    history.reset(np.array([0.0, 0.0]))
+    buffer = history._buffer
+    for i in range(1, 8):
+        history.push(np.array([i, -i]))
+        expected = [[max(j, 0), -max(j, 0)] for j in range(i - 2, i + 1)]
+        np.testing.assert_array_equal(history.stacked, expected)
+        assert np.shares_memory(history.stacked, buffer)
+    copy = history.copy()
+    assert copy.flags.c_contiguous and not np.shares_memory(copy, buffer)
+    # Resets do not reallocate
+    history.reset(np.array([9.0, 9.0]))
+    assert history._buffer is buffer
+    np.testing.assert_array_equal(history.stacked, np.full((3, 2), 9.0))
+
+
+def test_batched_observation_history():
+    history = ObservationHistory(2, (1,), num_envs=3)
+    history.reset(np.zeros((3, 1)))
+    history.push(np.array([[1.0], [2.0], [3.0]]))
+    history.reset(np.array([[7.0], [8.0], [9.0]]), mask=np.array([False, True, False]))
+    np.testing.assert_array_equal(history.stacked[..., 0], [[0.0, 1.0], [8.0, 8.0], [0.0, 3.0]])
+
+
+@pytest.mark.parametrize("copy", [False, True])
+def test_frame_stack(copy, make_generated_env):
+    env = FrameStack(make_generated_env(), k=4, copy=copy)
+    reference = make_generated_env()
+    observation, _ = env.reset(seed=0)
+    observations = [reference.reset(seed=0)[0]] * 4
+    assert env.observation_space.shape == (4, reference.observation_space.shape[0])
+    for action in np.arange(10) % env.action_space.n:
+        observation, *_ = env.step(action)
+        observations.append(reference.step(action)[0])
+        np.testing.assert_array_equal(observation, observations[-4:])
+        assert env.observation_space.contains(observation)
+    assert np.shares_memory(observation, env.history._buffer) != copy
+
+
+@pytest.mark.parametrize("mode", [AutoresetMode.NEXT_STEP, AutoresetMode.SAME_STEP])
+def test_vector_frame_stack(mode, make_generated_env):
+    envs = VectorFrameStack(
+        SyncVectorEnv(
+            [lambda: time_limited(make_generated_env(), 3), lambda: time_limited(make_generated_env(), 5)],
+            autoreset_mode=mode,
+        ),
+        k=2,
+    )
+    assert envs.observation_space.shape == (2, 2, envs.env.single_observation_space.shape[0])
+    observations, _ = envs.reset(seed=0)
+    references = [make_generated_env(), make_generated_env()]
+    expected = [[reference.reset(seed=seed)[0]] * 2 for seed, reference in enumerate(references)]
+
+    needs_reset = [False, False]
+    for _ in range(8):
+        observations, _, terminations, truncations, _ = envs.step(np.array([1, 1]))
+        for i, reference in enumerate(references):
+            if needs_reset[i]:
+                expected[i] = [reference.reset()[0]] * 2
+                needs_reset[i] = False
+            else:
+                expected[i].append(reference.step(1)[0])
+                if truncations[i]:
+                    if mode == AutoresetMode.SAME_STEP:
+                        expected[i] = [reference.reset()[0]] * 2
+                    else:
+                        needs_reset[i] = True
+            np.testing.assert_array_equal(observations[i], expected[i][-2:])
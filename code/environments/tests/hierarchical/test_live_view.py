@@ -0,0 +1,48 @@
+import pytest
+from environments.hierarchical import HierarchicalSystem
+
+
+@pytest.fixture
+def env(make_env) -> HierarchicalSystem:
+    pytest.importorskip("dash")
+    pytest.importorskip("ipywidgets")
+    return make_env(render_mode="human")
+
+
+def test_publish_rate_limit(env):
+    view = env.live_view
+    assert view.publish(env.system.node_graph)
+    assert not view.publish(env.system.node_graph)
+    assert view.publish(env.system.node_graph, force=True)
+    assert view.version == 2
+
+
+def test_changes_since(env):
+    view = env.live_view
+    view.publish(env.system.node_graph, force=True)
+    changes, version = view.changes_since(0)
+    assert version == 1
+    assert all(len(nodes) == 0 for nodes in changes.values())
+
+    # Activate all actions, which changes a few of the nodes
+    env.act([1, 1])
+    env.advance()
+    view.publish(env.system.node_graph, force=True)
+    changes, version = view.changes_since(1)
+    assert version == 2
+    num_nodes = env.system.num_nodes
+    assert 0 < len(changes["color"]) < num_nodes
+    assert 0 < len(changes["hovertext"]) <= num_nodes
+
+    patch = view._to_patch(changes).to_plotly_json()
+    assert len(patch["operations"]) == sum(len(nodes) for nodes in changes.values())
+    assert patch["operations"][0]["location"][:3] == ["data", 1, "marker"]
+
+
+def test_changes_since_unknown_version(env):
+    view = env.live_view
+    for _ in range(40):
+        view.publish(env.system.node_graph, force=True)
+    changes, version = view.changes_since(1)
+    assert version == 40
+    assert len(changes["color"]) == env.system.num_nodes
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+
+def run(env, num_steps=50):
+    observations = [env.reset(seed=0)[0]]
+    for action in np.arange(num_steps) % env.action_space.n:
+        observations.append(env.step(action)[0])
+    return observations
+
+
+def test_default_observations(make_generated_env):
+    env = make_generated_env()
+    observations = run(env)
+    assert env.observation_space.dtype == np.float64
+    assert observations[0].dtype == np.float64
+    assert observations[0] is not observations[1]
+    assert env.observation_space.contains(observations[-1])
+
+
+def test_reused_observations(make_generated_env):
+    expected = run(make_generated_env(), 50)[-1]
+    env = make_generated_env(observation_dtype=np.float32, reuse_observation=True)
+    observations = run(env, 50)
+    assert env.observation_space.dtype == np.float32
+    assert all(observation is observations[0] for observation in observations)
+    assert observations[0].dtype == np.float32
+    np.testing.assert_allclose(observations[-1], expected, rtol=1e-6)
+    assert env.observation_space.contains(observations[-1])
+
+
+def test_caller_observation_buffer(make_generated_env):
+    size = make_generated_env().observation_space.shape[0]
+    buffer = np.zeros(size, dtype=np.float32)
+    env = make_generated_env(observation_buffer=buffer)
+    assert env.observation_space.dtype == np.float32
+    assert env.reset(seed=0)[0] is buffer
+    assert env.step(0)[0] is buffer
+    with pytest.raises(ValueError):
+        make_generated_env(observation_buffer=np.zeros(size + 1))
+
+
+def test_observation_tensor(make_generated_env):
+    torch = pytest.importorskip("torch")
+    env = make_generated_env(observation_dtype=np.float32, reuse_observation=True)
+    tensor = env.observation_tensor
+    assert tensor.shape == (1, env.observation_space.shape[0])
+    assert tensor.dtype == torch.float32
+    for action in range(5):
+        state, *_ = env.step(action)
+        # The tensor follows the buffer without copies
+        assert env.observation_tensor is tensor
+        np.testing.assert_array_equal(tensor.numpy()[0], state)
+    assert tensor.data_ptr() == state.ctypes.data
+    with pytest.raises(RuntimeError):
+        make_generated_env().observation_tensor
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+
+def test_render_workers(make_env):
+    pytest.importorskip("kaleido")
+    pytest.importorskip("ipywidgets")
+    env = make_env(render_mode="rgb_array", window_size=(200, 100), render_workers=1)
+    env.reset(seed=0)
+    for _ in range(5):
+        env.step(1)
+    frame = env.render()
+    assert frame.shape == (100, 200, 3)
+    env.close()
+
+
+def test_raster_backend(make_env):
+    env = make_env(render_mode="rgb_array", render_backend="raster", window_size=(200, 100))
+    env.reset(seed=0)
+    frames = []
+    for _ in range(5):
+        env.step(1)
+        frames.append(env.render())
+    assert all(frame.shape == (100, 200, 3) and frame.dtype == np.uint8 for frame in frames)
+    assert frames[0].any()
+    env.close()
+
+
+def test_raster_backend_render_workers(make_env):
+    with pytest.raises(ValueError):
+        make_env(render_mode="rgb_array", render_backend="raster", render_workers=1)
+
+
+def test_invalid_render_backend(make_env):
+    with pytest.raises(ValueError):
+        make_env(render_mode="rgb_array", render_backend="rastr")
+    with pytest.raises(ValueError):
+        make_env(render_mode="human", render_backend="raster")
+    with pytest.raises(ValueError):
+        make_env(render_mode="rgb_array", render_backend="webgl")
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from computation_sim.system import unpack_action
+
+
+@pytest.mark.parametrize("packed", [True, False])
+def test_run_actions(packed, make_generated_env):
+    env, expected_env = make_generated_env(), make_generated_env()
+    env.reset(seed=0)
+    expected_env.reset(seed=0)
+    actions = np.random.default_rng(0).integers(env.action_space.n, size=300)
+
+    result = env.run_actions(
+        actions if packed else np.array([unpack_action(env.system.num_action, a) for a in actions])
+    )
+
+    expected = dict(rewards=[], buffer_overrides=[], missing_inputs=[], missing_measurements=[], output_age_avg=[])
+    for action in actions:
+        _, reward, _, _, info = expected_env.step(action)
+        expected["rewards"].append(reward)
+        for key in ("buffer_overrides", "missing_inputs", "missing_measurements"):
+            expected[key].append(sum(info[key].values()))
+        expected["output_age_avg"].append(info["output_age_avg"])
+    for key, values in expected.items():
+        np.testing.assert_allclose(getattr(result, key), values, err_msg=key)
+    assert result.buffer_overrides.sum() > 0 and result.missing_inputs.sum() > 0
+    assert np.all(result.output_age_min <= result.output_age_max)
+    np.testing.assert_array_equal(env.state, expected_env.state)
@@ -1,6 +1,9 @@
+import pathlib
 from collections import namedtuple
 
 import numpy as np
+from agents.metric_log import MetricLog
+from agents.metric_sink import MetricSink, TensorBoardBackend
 from agents.metrics import MovingAverage, MovingTotal
 from matplotlib import pyplot as plt
 from torch.utils.tensorboard import SummaryWriter
@@ -9,17 +12,39 @@ from torch.utils.tensorboard import SummaryWriter
 SystemMetrics = namedtuple("Metrics", ["lost_messages", "output_age_min", "output_age_max", "output_age_avg"])
 LearningMetrics = namedtuple("Metrics", ["loss", "epsilon", "reward"])
 
+SYSTEM_COLUMNS = ("sys_time", "lost_messages", "output_age_min", "output_age_max", "output_age_avg")
+TRAIN_COLUMNS = ("learn_time", "avg_reward", "loss", "epsilon")
+
 
 class DataLogger(object):
+    """Logs filtered system and training metrics.
+
+    The metrics are stored in columnar MetricLogs, which spill to `.npy` files in `directory` (a temporary directory,
+    if not given), such that long runs do not grow the memory. The logged series (e.g. `output_age_max`) are
+    memory-mapped views on these files.
+
+    Metrics for TensorBoard are queued in a MetricSink, which writes them from a background thread. Pass a sink with
+    other backends (e.g. CSV) as `metric_sink`, instead of a `tensorboard_writer`.
+    """
+
     def __init__(
         self,
         window_size: int = 100,
         tensorboard_writer: SummaryWriter = None,
         tensorboard_period: int = 10,
+        directory: pathlib.Path = None,
+        chunk_size: int = 4096,
+        metric_sink: MetricSink = None,
     ):
         self.window_size = window_size
         self.tensorboard_writer = tensorboard_writer
         self.tensorboard_period = tensorboard_period
+        if metric_sink is None and tensorboard_writer is not None:
+            metric_sink = MetricSink([TensorBoardBackend(tensorboard_writer)])
+        self.metric_sink = metric_sink
+        directory = pathlib.Path(directory) if directory is not None else None
+        self.system_log = MetricLog(SYSTEM_COLUMNS, directory / "system" if directory else None, chunk_size=chunk_size)
+        self.train_log = MetricLog(TRAIN_COLUMNS, directory / "train" if directory else None, chunk_size=chunk_size)
         self.reset()
 
     def reset(self):
@@ -31,24 +56,52 @@ class DataLogger(object):
         self.ma_reward = MovingAverage(self.window_size)
 
         # Logging for filtered metrics
-        self.sys_time = list()
-        self.lost_messages = list()
-        self.output_age_min = list()
-        self.output_age_max = list()
-        self.output_age_avg = list()
-
-        self.learn_time = list()
-        self.avg_reward = list()
-        self.loss = list()
-        self.epsilon = list()
+        self.system_log.clear()
+        self.train_log.clear()
 
         self.iteration = 0
 
+    @property
+    def sys_time(self) -> np.ndarray:
+        return self.system_log.column("sys_time")
+
+    @property
+    def lost_messages(self) -> np.ndarray:
+        return self.system_log.column("lost_messages")
+
+    @property
+    def output_age_min(self) -> np.ndarray:
+        return self.system_log.column("output_age_min")
+
+    @property
+    def output_age_max(self) -> np.ndarray:
+        return self.system_log.column("output_age_max")
+
+    @property
+    def output_age_avg(self) -> np.ndarray:
+        return self.system_log.column("output_age_avg")
+
+    @property
+    def learn_time(self) -> np.ndarray:
+        return self.train_log.column("learn_time")
+
+    @property
+    def avg_reward(self) -> np.ndarray:
+        return self.train_log.column("avg_reward")
+
+    @property
+    def loss(self) -> np.ndarray:
+        return self.train_log.column("loss")
+
+    @property
+    def epsilon(self) -> np.ndarray:
+        return self.train_log.column("epsilon")
+
     def check_write_tensorboard(self) -> bool:
         return (
-            (self.tensorboard_writer is not None)
-            and (len(self.sys_time) % self.tensorboard_period == 0)
-            and (len(self.sys_time) > 0)
+            (self.metric_sink is not None)
+            and (len(self.system_log) % self.tensorboard_period == 0)
+            and (len(self.system_log) > 0)
         )
 
     def log_system_metrics(self, time: int, metrics: SystemMetrics):
@@ -59,59 +112,78 @@ class DataLogger(object):
         self.ma_output_age_avg.push(metrics.output_age_avg)
 
         # Store the filtered metrics
-        self.sys_time.append(time)
-        self.lost_messages.append(self.mt_lost_messages.value)
-        self.output_age_min.append(self.ma_output_age_min.value)
-        self.output_age_max.append(self.ma_output_age_max.value)
-        self.output_age_avg.append(self.ma_output_age_avg.value)
+        self.system_log.append(
+            time,
+            self.mt_lost_messages.value,
+            self.ma_output_age_min.value,
+            self.ma_output_age_max.value,
+            self.ma_output_age_avg.value,
+        )
 
     def log_train_metrics(self, time: int, metrics: LearningMetrics):
         # Update the filters
         self.ma_reward.push(metrics.reward)
 
         # Store the filtered metrics
-        self.learn_time.append(time)
-        self.avg_reward.append(self.ma_reward.value)
-        self.loss.append(metrics.loss)
-        self.epsilon.append(metrics.epsilon)
+        self.train_log.append(time, self.ma_reward.value, metrics.loss, metrics.epsilon)
 
     def write_to_tensorboard(self):
         self.iteration += 1
-        if self.tensorboard_writer is None:
+        if self.metric_sink is None:
             return
-        if len(self.sys_time) == 0:
+        if len(self.system_log) == 0:
             return
-        if len(self.learn_time) == 0:
+        if len(self.train_log) == 0:
             return
         if (self.iteration % self.tensorboard_period) != 0:
             return
-        self.tensorboard_writer.add_scalar("system/lost_messages", self.mt_lost_messages.value, self.sys_time[-1])
-        self.tensorboard_writer.add_scalar("system/output_age_min", self.ma_output_age_min.value, self.sys_time[-1])
-        self.tensorboard_writer.add_scalar("system/output_age_max", self.ma_output_age_max.value, self.sys_time[-1])
-        self.tensorboard_writer.add_scalar("system/output_age_avg", self.ma_output_age_avg.value, self.sys_time[-1])
-        self.tensorboard_writer.add_scalar("train/loss", self.loss[-1], self.learn_time[-1])
-        self.tensorboard_writer.add_scalar("train/epsilon", self.epsilon[-1], self.learn_time[-1])
-        self.tensorboard_writer.add_scalar("train/reward", self.avg_reward[-1], self.learn_time[-1])
+        sys_time = int(self.system_log.last("sys_time"))
+        learn_time = int(self.train_log.last("learn_time"))
+        self.metric_sink.add_scalars(
+            {
+                "system/lost_messages": self.mt_lost_messages.value,
+                "system/output_age_min": self.ma_output_age_min.value,
+                "system/output_age_max": self.ma_output_age_max.value,
+                "system/output_age_avg": self.ma_output_age_avg.value,
+            },
+            sys_time,
+        )
+        self.metric_sink.add_scalars(
+            {
+                "train/loss": self.train_log.last("loss"),
+                "train/epsilon": self.train_log.last("epsilon"),
+                "train/reward": self.train_log.last("avg_reward"),
+            },
+            learn_time,
+        )
+
+    def close(self):
+        """Writes the queued metrics and closes the metric sink."""
+        if self.metric_sink is not None:
+            self.metric_sink.close()
 
 
 def plot_system_metrics(logger: DataLogger):
-    # Convert time from ms to minutes
-    sys_time_minutes = np.array(logger.sys_time) / (1000 * 60)
+    # Downsampled series keep their minima and maxima; the plots take constant time, however long the run was
+    def series(name: str):
+        sys_time, values = logger.system_log.downsampled(name, x="sys_time")
+        # Convert time from ms to minutes
+        return sys_time / (1000 * 60), values
 
     # Plot two axes in once figure, one for the output* times, and the second for the lost messages
     fig, axs = plt.subplots(2, figsize=(10, 10))
     fig.suptitle("System Metrics")
-    axs[0].plot(sys_time_minutes, logger.output_age_min, label="Output Age Min")
-    axs[0].plot(sys_time_minutes, logger.output_age_avg, label="Output Age Avg")
-    axs[0].plot(sys_time_minutes, logger.output_age_max, label="Output Age Max")
+    axs[0].plot(*series("output_age_min"), label="Output Age Min")
+    axs[0].plot(*series("output_age_avg"), label="Output Age Avg")
+    axs[0].plot(*series("output_age_max"), label="Output Age Max")
     axs[0].set_ylabel("Average Output Age over Last Minute (ms)")
     axs[0].legend()
     axs[0].grid(True)
-    # Calculate the lower and upper bounds for y-axis scaling
-    upper_bound = np.percentile(logger.output_age_max, 99.9)
+    # Calculate the upper bound for y-axis scaling from the decimated maxima
+    upper_bound = np.percentile(series("output_age_max")[1], 99.9) if len(logger.system_log) > 0 else 1.0
     # Set the y-axis limits
     axs[0].set_ylim(0.0, upper_bound)
-    axs[1].plot(sys_time_minutes, logger.lost_messages, label="Lost Messages")
+    axs[1].plot(*series("lost_messages"), label="Lost Messages")
     axs[1].set_xlabel("Time (minutes)")
     axs[1].set_ylabel("Number of Lost Messages during Last Minute (counts)")
     axs[1].set_ylim(0.0, 10.0)
@@ -121,21 +193,24 @@ def plot_system_metrics(logger: DataLogger):
 
 
 def plot_train_metrics(logger: DataLogger):
+    def series(name: str):
+        learn_time, values = logger.train_log.downsampled(name, x="learn_time")
+        return learn_time / (1000 * 60), values
+
     fig, axs = plt.subplots(3, figsize=(10, 10))
-    train_time_minutes = np.array(logger.learn_time) / (1000 * 60)
 
     fig.suptitle("Train Metrics")
-    axs[0].plot(train_time_minutes, logger.loss, label="Loss")
+    axs[0].plot(*series("loss"), label="Loss")
     axs[0].set_ylabel("Loss")
     axs[0].legend()
     axs[0].grid(True)
 
-    axs[1].plot(train_time_minutes, logger.epsilon, label="Epsilon")
+    axs[1].plot(*series("epsilon"), label="Epsilon")
     axs[1].set_ylabel("Epsilon")
     axs[1].legend()
     axs[1].grid(True)
 
-    axs[2].plot(train_time_minutes, logger.avg_reward, label="Reward")
+    axs[2].plot(*series("avg_reward"), label="Reward")
     axs[2].set_xlabel("Time (minutes)")
     axs[2].set_ylabel("Reward")
     axs[2].legend()